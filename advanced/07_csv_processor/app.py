@@ -4,15 +4,184 @@ CSV Processor Script
 Process and transform CSV data files.
 """
 
+import argparse
 import csv
-from typing import List, Dict, Optional
+import heapq
+import itertools
+import math
+import mmap
+import os
+import random
+import re
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 from io import StringIO
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+# Number of rows sampled to infer column types
+INFER_ROWS = 1000
+
+# Aggregates computed by aggregate_rows()
+AGGREGATES = ('sum', 'count', 'mean', 'min', 'max')
+
+# Values int()/float() accept but that are identifiers rather than
+# numbers: leading zeros (02134, but not 0 or 0.5), underscores (1_000),
+# surrounding whitespace, and nan/inf spellings
+_NOT_A_NUMBER = re.compile(r'^[-+]?0\d|_|^\s|\s$|nan|inf', re.IGNORECASE)
+
+
+def _to_int(value: str) -> Any:
+    """Convert to int, falling back to float or the raw string."""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return _to_float(value)
+
+
+def _to_float(value: str) -> Any:
+    """Convert to float, falling back to the raw string."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def _to_str(value: str) -> Any:
+    """Keep strings, but map empty fields to None."""
+    return value if value else None
+
+
+_CONVERTERS = {int: _to_int, float: _to_float, str: _to_str}
+
+
+def _converter(column_type: Any) -> Callable[[str], Any]:
+    """Return the converter for a column type, rejecting unsupported types."""
+    try:
+        return _CONVERTERS[column_type]
+    except (KeyError, TypeError):
+        valid = ', '.join(t.__name__ for t in _CONVERTERS)
+        raise ValueError(f"Unsupported column type: {column_type!r} (use {valid})") from None
+
+
+def infer_types(sample: List[List[str]], width: int) -> List[type]:
+    """
+    Infer column types from sample rows.
+    
+    A column is int if every non-empty value parses as int, float if
+    every value parses as float, and str otherwise. Values that int() or
+    float() would accept but that look like identifiers make the column
+    str, so they are kept verbatim: a leading zero (02134; 0 and 0.5 are
+    fine), an underscore (1_000), leading or trailing whitespace, or
+    nan/inf.
+    
+    Args:
+        sample: Rows as lists of strings
+        width: Number of columns
+    
+    Returns:
+        List[type]: int, float or str per column
+    """
+    types = []
+    for index in range(width):
+        column_type = int
+        for row in sample:
+            value = row[index] if index < len(row) else ''
+            if not value:
+                continue
+            if _NOT_A_NUMBER.search(value):
+                column_type = str
+                break
+            if column_type is int:
+                try:
+                    int(value)
+                    continue
+                except ValueError:
+                    column_type = float
+            try:
+                float(value)
+            except ValueError:
+                column_type = str
+                break
+        types.append(column_type)
+    return types
+
+
+def iter_csv(filename: str, has_header: bool = True,
+             types: Union[bool, Dict[str, type]] = True,
+             columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows of a CSV file as dictionaries.
+    
+    Only one row (plus the inference sample) is held in memory. Column
+    types are inferred once from the first INFER_ROWS rows and a
+    converter per column is chosen up front, so each value is converted
+    with a single call; empty fields become None.
+    
+    Args:
+        filename (str): Path to CSV file
+        has_header (bool): Whether CSV has header row
+        types: True to infer types, False to keep strings, or a dict of
+            column name -> int/float/str (other columns are inferred)
+        columns (List[str]): Only return these columns (default: all)
+    
+    Yields:
+        Dict[str, Any]: One row
+    
+    Raises:
+        ValueError: If `types` maps a column to a type other than int, float or str
+    """
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        if has_header:
+            header = next(reader, None)
+            if header is None:
+                return
+        else:
+            first = next(reader, None)
+            if first is None:
+                return
+            header = ['col' + str(i) for i in range(len(first))]
+            reader = itertools.chain([first], reader)
+        
+        indices = [header.index(name) for name in columns] if columns else list(range(len(header)))
+        names = [header[i] for i in indices]
+        
+        if types is False:
+            for row in reader:
+                yield {name: row[i] if i < len(row) else '' for name, i in zip(names, indices)}
+            return
+        
+        sample = list(itertools.islice(reader, INFER_ROWS))
+        column_types = infer_types([[row[i] if i < len(row) else '' for i in indices]
+                                    for row in sample], len(indices))
+        if isinstance(types, dict):
+            column_types = [types.get(name, inferred) for name, inferred in zip(names, column_types)]
+        converters = [(name, i, _converter(t)) for name, i, t in zip(names, indices, column_types)]
+        
+        for row in itertools.chain(sample, reader):
+            if len(row) < len(header):
+                row = row + [''] * (len(header) - len(row))
+            yield {name: convert(row[i]) for name, i, convert in converters}
+
 
 def read_csv(filename: str, has_header: bool = True) -> List[Dict]:
     """
     Read CSV file and return as list of dictionaries.
     
+    Loads the whole file; use iter_csv() for large files.
+    
     Args:
         filename (str): Path to CSV file
         has_header (bool): Whether CSV has header row
@@ -21,100 +190,1009 @@ def read_csv(filename: str, has_header: bool = True) -> List[Dict]:
         List[Dict]: List of rows as dictionaries
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            if has_header:
-                reader = csv.DictReader(f)
-                return list(reader)
-            else:
-                reader = csv.reader(f)
-                return [{'col' + str(i): val for i, val in enumerate(row)} 
-                        for row in reader]
+        return list(iter_csv(filename, has_header, types=False))
     except FileNotFoundError:
         return []
 
 
-def write_csv(filename: str, data: List[Dict], fieldnames: Optional[List[str]] = None):
+def write_csv(filename: str, data: Iterable[Dict], fieldnames: Optional[List[str]] = None) -> int:
     """
     Write data to CSV file.
     
+    Rows are written as they are produced, so `data` may be a generator.
+    
     Args:
         filename (str): Output file path
-        data (List[Dict]): Data to write
+        data (Iterable[Dict]): Data to write
         fieldnames (List[str]): Column names (auto-detected if None)
+    
+    Returns:
+        int: Number of rows written
     """
-    if not data:
-        return
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return 0
     
     if fieldnames is None:
-        fieldnames = list(data[0].keys())
+        fieldnames = list(first.keys())
     
     with open(filename, 'w', encoding='utf-8', newline='') as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(data)
+        writer.writerow(first)
+        count = 1
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def filter_rows(rows: Iterable[Dict], column: str,
+                value: Any = None, predicate: Optional[Callable[[Any], bool]] = None) -> Iterator[Dict]:
+    """
+    Lazily keep rows whose column equals value (or satisfies predicate).
+    
+    Args:
+        rows (Iterable[Dict]): Input rows
+        column (str): Column name to filter on
+        value: Value to match
+        predicate: Test applied to the column value instead of equality
+    
+    Yields:
+        Dict: Matching rows (not copied)
+    """
+    if predicate is None:
+        return (row for row in rows if row.get(column) == value)
+    return (row for row in rows if predicate(row.get(column)))
+
+
+def transform_rows(rows: Iterable[Dict], column: str, func: Callable[[Any], Any]) -> Iterator[Dict]:
+    """
+    Lazily apply func to a column.
+    
+    Rows are updated in place, which is safe for rows streamed from
+    iter_csv() (each is a fresh dict); use transform_column() to keep
+    the input unchanged.
+    
+    Args:
+        rows (Iterable[Dict]): Input rows
+        column (str): Column to transform
+        func: Transformation function
+    
+    Yields:
+        Dict: Transformed rows
+    """
+    for row in rows:
+        if column in row:
+            row[column] = func(row[column])
+        yield row
+
+
+def _add_exact(partials: List[float], x: float):
+    """
+    Add x to a list of non-overlapping partial sums without rounding.
+    
+    This is Shewchuk's algorithm (as used by math.fsum): the partials
+    represent the exact sum, so math.fsum(partials) gives the correctly
+    rounded total no matter in which order values were added.
+    """
+    i = 0
+    for y in partials:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hi = x + y
+        lo = y - (hi - x)
+        if lo:
+            partials[i] = lo
+            i += 1
+        x = hi
+    partials[i:] = [x]
+
+
+class HashAggregator:
+    """
+    Single-pass, hash-based group-by with sum/count/mean/min/max.
+    
+    Each group keeps [count, int_sum, float_partials, min, max]. Integer
+    values are summed exactly as ints and floats as exact partials, so
+    results do not depend on the order rows are added in, and two
+    aggregators can be merged (e.g. partial results of file chunks).
+    """
+    
+    def __init__(self):
+        """Initialize empty aggregator."""
+        self.groups: Dict[Any, list] = {}
+        self.skipped = 0
+    
+    def add(self, key: Any, value: Any):
+        """
+        Add a value to a group.
+        
+        Strings are converted with float(); None and unparsable values
+        are counted in `skipped` and otherwise ignored.
+        
+        Args:
+            key: Group key
+            value: Numeric value (or numeric string)
+        """
+        value_type = type(value)
+        if value_type is not int and value_type is not float:
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                self.skipped += 1
+                return
+            value_type = float
+        
+        state = self.groups.get(key)
+        if state is None:
+            state = self.groups[key] = [0, 0, [], value, value]
+        state[0] += 1
+        if value_type is int:
+            state[1] += value
+        else:
+            _add_exact(state[2], value)
+        if value < state[3]:
+            state[3] = value
+        elif value > state[4]:
+            state[4] = value
+    
+    def merge(self, other: 'HashAggregator'):
+        """
+        Merge another aggregator's groups into this one.
+        
+        Args:
+            other: Aggregator over different rows
+        """
+        self.skipped += other.skipped
+        for key, (count, int_sum, partials, low, high) in other.groups.items():
+            state = self.groups.get(key)
+            if state is None:
+                self.groups[key] = [count, int_sum, list(partials), low, high]
+                continue
+            state[0] += count
+            state[1] += int_sum
+            for partial in partials:
+                _add_exact(state[2], partial)
+            state[3] = min(state[3], low)
+            state[4] = max(state[4], high)
+    
+    def results(self, aggregates=AGGREGATES) -> Dict[Any, Dict[str, Any]]:
+        """
+        Compute the final aggregates per group.
+        
+        Args:
+            aggregates: Names from AGGREGATES to include
+        
+        Returns:
+            Dict[Any, Dict[str, Any]]: Group key -> aggregate name -> value
+        """
+        results = {}
+        for key, (count, int_sum, partials, low, high) in self.groups.items():
+            total = math.fsum(partials + [int_sum]) if partials else int_sum
+            values = {'sum': total, 'count': count, 'mean': total / count,
+                      'min': low, 'max': high}
+            results[key] = {name: values[name] for name in aggregates}
+        return results
+
+
+def aggregate_rows(rows: Iterable[Dict], group_by: str, agg_column: str,
+                   aggregates=AGGREGATES) -> Dict[Any, Dict[str, Any]]:
+    """
+    Group rows in one streaming pass and aggregate a numeric column.
+    
+    Memory grows with the number of groups, not the number of rows.
+    A row without the aggregate column counts as 0, so its group still
+    appears; empty (None) and non-numeric values are skipped.
+    
+    Args:
+        rows (Iterable[Dict]): Input rows
+        group_by (str): Column to group by (missing -> 'Unknown')
+        agg_column (str): Column to aggregate (missing -> 0)
+        aggregates: Names from AGGREGATES to compute
+    
+    Returns:
+        Dict[Any, Dict[str, Any]]: Group key -> aggregate name -> value
+    """
+    aggregator = HashAggregator()
+    add = aggregator.add
+    for row in rows:
+        add(row.get(group_by, 'Unknown'), row.get(agg_column, 0))
+    return aggregator.results(aggregates)
 
 
-def filter_csv(data: List[Dict], column: str, value: str) -> List[Dict]:
+def filter_csv(data: Iterable[Dict], column: str, value: str) -> List[Dict]:
     """
     Filter CSV data by column value.
     
     Args:
-        data (List[Dict]): Input data
+        data (Iterable[Dict]): Input data
         column (str): Column name to filter on
         value (str): Value to match
     
     Returns:
         List[Dict]: Filtered data
     """
-    return [row for row in data if row.get(column) == value]
+    return list(filter_rows(data, column, value))
 
 
-def aggregate_csv(data: List[Dict], group_by: str, agg_column: str) -> Dict[str, float]:
+def aggregate_csv(data: Iterable[Dict], group_by: str, agg_column: str) -> Dict[str, float]:
     """
     Aggregate CSV data by grouping.
     
     Args:
-        data (List[Dict]): Input data
+        data (Iterable[Dict]): Input data
         group_by (str): Column to group by
         agg_column (str): Column to sum
     
     Returns:
         Dict[str, float]: Aggregated results
     """
-    results = {}
-    for row in data:
-        key = row.get(group_by, 'Unknown')
-        try:
-            value = float(row.get(agg_column, 0))
-            results[key] = results.get(key, 0) + value
-        except ValueError:
-            continue
-    return results
+    return {key: float(values['sum'])
+            for key, values in aggregate_rows(data, group_by, agg_column, ('sum',)).items()}
 
 
-def transform_column(data: List[Dict], column: str, func) -> List[Dict]:
+def transform_column(data: Iterable[Dict], column: str, func) -> List[Dict]:
     """
     Transform a column using a function.
     
     Args:
-        data (List[Dict]): Input data
+        data (Iterable[Dict]): Input data
         column (str): Column to transform
         func: Transformation function
     
     Returns:
-        List[Dict]: Transformed data
+        List[Dict]: Transformed data (input rows are not modified)
+    """
+    return list(transform_rows((dict(row) for row in data), column, func))
+
+
+# Complete CSV tokens as csv.reader sees them: unquoted text, a quoted
+# field (doubled "" escapes a quote), or a literal quote inside an
+# unquoted field such as 5'10". Only a quote at the start of a field
+# (after a delimiter, a newline or at offset 0) opens a quoted field. A
+# quoted field must be followed by another byte, so one cut off by endpos
+# is never taken as closed and matching stops at its opening quote.
+_CSV_TOKENS = re.compile(rb'(?:[^"]++|(?<![^,\n])"(?:[^"]++|"")*+"(?=[^"])|(?<=[^,\n])")*+')
+_QUOTED_FIELD = re.compile(rb'"(?:[^"]++|"")*+(?:"|\Z)')
+
+
+def find_row_boundaries(filename: str, targets: List[int]) -> List[int]:
+    """
+    Move byte offsets forward to the start of the next CSV record.
+    
+    A newline only ends a record outside quoted fields. The file is
+    memory-mapped and scanned once from the start by a regular
+    expression that follows csv.reader's quoting rules, so the scan runs
+    at C speed while a stray quote in an unquoted field (5'10") does not
+    flip the quote state the way counting quotes would.
+    
+    Args:
+        filename (str): Path to CSV file
+        targets (List[int]): Ascending byte offsets
+    
+    Returns:
+        List[int]: Offset of the first record starting at or after each
+        target (the file size if there is none)
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return [0] * len(targets)
+    boundaries = []
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = 0  # scanned up to here; always outside a quoted field
+        for target in targets:
+            if target <= 0:
+                boundaries.append(0)
+                continue
+            if boundaries and boundaries[-1] >= target:
+                boundaries.append(boundaries[-1])
+                continue
+            
+            # A record starts at b if byte b - 1 is a newline outside quotes
+            while True:
+                limit = max(position, target - 1)
+                end = _CSV_TOKENS.match(data, position, limit).end()
+                if end < limit:
+                    # A quoted field opens at `end` and reaches past limit
+                    position = _QUOTED_FIELD.match(data, end).end()
+                    continue
+                newline = data.find(b'\n', limit)
+                if newline == -1:
+                    boundary = position = size
+                    break
+                end = _CSV_TOKENS.match(data, limit, newline).end()
+                if end == newline:
+                    boundary = position = newline + 1
+                    break
+                # A quoted field opens at `end` (it may span the newline); skip it
+                position = _QUOTED_FIELD.match(data, end).end()
+            boundaries.append(boundary)
+    return boundaries
+
+
+def _read_lines(filename: str, start: int, end: int) -> Iterator[str]:
+    """Yield the lines of a byte range that starts and ends on record boundaries."""
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            line = f.readline()
+            if not line:
+                break
+            remaining -= len(line)
+            yield line.decode('utf-8')
+
+
+def csv_schema(filename: str) -> tuple:
+    """
+    Read the header and infer column types the same way iter_csv() does.
+    
+    Args:
+        filename (str): Path to CSV file (with header row)
+    
+    Returns:
+        tuple: (header, {column: type})
+    """
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        sample = [row + [''] * (len(header) - len(row))
+                  for row in itertools.islice(reader, INFER_ROWS)]
+    return header, dict(zip(header, infer_types(sample, len(header))))
+
+
+def _aggregate_chunk(filename: str, start: int, end: int, header: List[str],
+                     column_types: Dict[str, type], group_by: str, agg_column: str,
+                     where: Optional[Dict[str, Any]]) -> HashAggregator:
+    """
+    Parse and partially aggregate one chunk (runs in a worker process).
+    
+    Only the group, value and filter columns are converted, with the same
+    converters iter_csv() would use, so values match the serial path.
+    """
+    width = len(header)
+    converters = {name: _CONVERTERS[column_types[name]] for name in header}
+    group_index = header.index(group_by)
+    value_index = header.index(agg_column)
+    convert_group = converters[group_by]
+    convert_value = converters[agg_column]
+    conditions = [(header.index(column), converters[column], value)
+                  for column, value in (where or {}).items()]
+    
+    aggregator = HashAggregator()
+    add = aggregator.add
+    for row in csv.reader(_read_lines(filename, start, end)):
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        if conditions and not all(convert(row[i]) == value for i, convert, value in conditions):
+            continue
+        add(convert_group(row[group_index]), convert_value(row[value_index]))
+    return aggregator
+
+
+def split_csv(filename: str, chunks: int) -> List[tuple]:
+    """
+    Split the data rows of a CSV file into byte ranges on record boundaries.
+    
+    Args:
+        filename (str): Path to CSV file (with header row)
+        chunks (int): Desired number of ranges
+    
+    Returns:
+        List[tuple]: Non-empty (start, end) byte ranges covering all data rows
+    """
+    data_start = find_row_boundaries(filename, [1])[0]
+    size = os.path.getsize(filename)
+    step = max(1, (size - data_start) // max(1, chunks))
+    targets = list(range(data_start + step, size, step))
+    offsets = [data_start] + find_row_boundaries(filename, targets) + [size]
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if end > start]
+
+
+def aggregate_csv_parallel(filename: str, group_by: str, agg_column: str,
+                           where: Optional[Dict[str, Any]] = None,
+                           workers: Optional[int] = None, chunks_per_worker: int = 4,
+                           aggregates=AGGREGATES) -> Dict[Any, Dict[str, Any]]:
+    """
+    Aggregate a large CSV file on several cores.
+    
+    The file is split at record boundaries (quoted newlines included),
+    each chunk is parsed and aggregated in a worker process, and the
+    partial HashAggregators are merged in file order. Types are inferred
+    once from the start of the file, and sums are exact, so the result
+    equals the serial one:
+    
+        aggregate_rows(filter_rows(iter_csv(filename), ...), group_by, agg_column)
+    
+    Args:
+        filename (str): Path to CSV file (with header row)
+        group_by (str): Column to group by
+        agg_column (str): Column to aggregate
+        where (Dict[str, Any]): Keep only rows whose columns equal these values
+        workers (int): Worker processes (default: CPU count)
+        chunks_per_worker (int): Chunks per worker, for load balancing
+        aggregates: Names from AGGREGATES to compute
+    
+    Returns:
+        Dict[Any, Dict[str, Any]]: Group key -> aggregate name -> value
+    """
+    workers = workers or os.cpu_count() or 1
+    header, column_types = csv_schema(filename)
+    ranges = split_csv(filename, workers * chunks_per_worker)
+    
+    result = HashAggregator()
+    if workers == 1:
+        for start, end in ranges:
+            result.merge(_aggregate_chunk(filename, start, end, header, column_types,
+                                          group_by, agg_column, where))
+        return result.results(aggregates)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_aggregate_chunk, filename, start, end, header,
+                                   column_types, group_by, agg_column, where)
+                   for start, end in ranges]
+        for future in futures:
+            result.merge(future.result())
+    return result.results(aggregates)
+
+
+def aggregate_csv_columnar(filename: str, group_by: str, agg_column: str,
+                           where: Optional[Dict[str, Any]] = None,
+                           chunksize: int = 1_000_000) -> Dict[Any, Dict[str, Any]]:
+    """
+    Aggregate with pandas' C parser and vectorized group-by (optional).
+    
+    Reads only the needed columns in chunks, so memory stays bounded.
+    Counts, minima and maxima equal the other paths; float sums use
+    NumPy's pairwise summation and may differ in the last digit.
+    
+    Args:
+        filename (str): Path to CSV file (with header row)
+        group_by (str): Column to group by
+        agg_column (str): Column to aggregate
+        where (Dict[str, Any]): Keep only rows whose columns equal these values
+        chunksize (int): Rows per chunk
+    
+    Returns:
+        Dict[Any, Dict[str, Any]]: Group key -> aggregate name -> value
+    
+    Raises:
+        ImportError: If pandas is not installed
+    """
+    if pd is None:
+        raise ImportError("aggregate_csv_columnar() requires pandas")
+    
+    columns = list(dict.fromkeys([group_by, agg_column, *(where or {})]))
+    partials = []
+    for chunk in pd.read_csv(filename, usecols=columns, chunksize=chunksize):
+        for column, value in (where or {}).items():
+            chunk = chunk[chunk[column] == value]
+        values = pd.to_numeric(chunk[agg_column], errors='coerce')
+        grouped = values.groupby(chunk[group_by], sort=False)
+        partials.append(grouped.agg(['sum', 'count', 'min', 'max']))
+    if not partials:
+        return {}
+    
+    combined = pd.concat(partials).groupby(level=0, sort=False).agg(
+        {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'})
+    results = {}
+    for key, row in combined.iterrows():
+        count = int(row['count'])
+        if count:
+            total = row['sum'].item()
+            results[key] = {'sum': total, 'count': count, 'mean': total / count,
+                            'min': row['min'].item(), 'max': row['max'].item()}
+    return results
+
+
+def _row_size(row: List[str]) -> int:
+    """Approximate memory used by a parsed row (list plus str objects), in bytes."""
+    return 64 + sum(len(field) + 57 for field in row)
+
+
+def _iter_records(filename: str) -> Iterator[List[str]]:
+    """Stream the data rows of a CSV file as lists of strings (header skipped)."""
+    with open(filename, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+def _write_records(filename: str, header: List[str], rows: Iterable[List[str]]) -> int:
+    """Write a header and rows; returns the number of rows."""
+    count = 0
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _make_sort_key(header: List[str], keys: List[str],
+                   column_types: Optional[Dict[str, type]]) -> Callable[[List[str]], tuple]:
+    """
+    Build a key function for raw rows.
+    
+    With column types, numeric columns sort numerically; values that do
+    not parse sort after the numbers and empty fields sort last. A
+    reversed sort inverts this too: empty fields first, then unparsable
+    values. Without types, the raw strings are compared.
+    """
+    specs = []
+    for name in keys:
+        column_type = column_types[name] if column_types else str
+        specs.append((header.index(name), _CONVERTERS[column_type] if column_types else None,
+                      column_type is not str))
+    
+    if not column_types:
+        if len(specs) == 1:
+            index = specs[0][0]
+            return lambda row: (row[index] if index < len(row) else '',)
+        return lambda row: tuple(row[i] if i < len(row) else '' for i, _, _ in specs)
+    
+    def sort_key(row: List[str]) -> tuple:
+        key = []
+        for index, convert, numeric in specs:
+            value = convert(row[index] if index < len(row) else '')
+            if value is None:
+                key.append((2, ''))
+            elif numeric and type(value) is str:
+                key.append((1, value))
+            else:
+                key.append((0, value))
+        return tuple(key)
+    return sort_key
+
+
+def _merge_files(paths: List[str], header: List[str], output: str,
+                 sort_key: Callable, reverse: bool) -> int:
+    """k-way merge of sorted files into output; returns the number of rows."""
+    streams = [_iter_records(path) for path in paths]
+    try:
+        return _write_records(output, header, heapq.merge(*streams, key=sort_key, reverse=reverse))
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def sort_csv(filename: str, keys: Union[str, List[str]], output: Optional[str] = None,
+             memory_limit: int = 64 * 1024 * 1024, reverse: bool = False,
+             typed: bool = True, max_open_files: int = 64,
+             tmp_dir: Optional[str] = None) -> str:
+    """
+    Sort a CSV file of any size by one or more columns (external merge sort).
+    
+    Rows are collected until their estimated size reaches memory_limit,
+    sorted and spilled to a temporary run file. The runs are then merged
+    with a k-way heap merge (in several passes if there are more than
+    max_open_files runs). Memory use is bounded by memory_limit, not by
+    the file size. The sort is stable.
+    
+    Args:
+        filename (str): Path to CSV file (with header row)
+        keys: Column name or list of column names to sort by
+        output (str): Output path (default: <name>.sorted.csv)
+        memory_limit (int): Bytes of rows held in memory per run
+        reverse (bool): Sort descending; this reverses the whole order, so
+            empty fields and unparsable values come first
+        typed (bool): Compare values with inferred types (numbers numerically)
+        max_open_files (int): Maximum runs merged at once
+        tmp_dir (str): Directory for run files (default: system temp dir)
+    
+    Returns:
+        str: Output path
+    """
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    if output is None:
+        output = os.path.splitext(filename)[0] + '.sorted.csv'
+    header, column_types = csv_schema(filename)
+    sort_key = _make_sort_key(header, keys, column_types if typed else None)
+    
+    with tempfile.TemporaryDirectory(prefix='sort_csv_', dir=tmp_dir) as work_dir:
+        runs = []
+        buffer = []
+        used = 0
+        for row in _iter_records(filename):
+            buffer.append(row)
+            used += _row_size(row)
+            if used >= memory_limit:
+                buffer.sort(key=sort_key, reverse=reverse)
+                runs.append(os.path.join(work_dir, f"run{len(runs)}.csv"))
+                _write_records(runs[-1], header, buffer)
+                buffer = []
+                used = 0
+        
+        if not runs:
+            # Everything fit in memory
+            buffer.sort(key=sort_key, reverse=reverse)
+            _write_records(output, header, buffer)
+            return output
+        if buffer:
+            buffer.sort(key=sort_key, reverse=reverse)
+            runs.append(os.path.join(work_dir, f"run{len(runs)}.csv"))
+            _write_records(runs[-1], header, buffer)
+            buffer = []
+        
+        # Merge passes until the remaining runs can be opened at once
+        generation = 0
+        while len(runs) > max_open_files:
+            generation += 1
+            merged = []
+            for i in range(0, len(runs), max_open_files):
+                group = runs[i:i + max_open_files]
+                merged.append(os.path.join(work_dir, f"merge{generation}_{len(merged)}.csv"))
+                _merge_files(group, header, merged[-1], sort_key, reverse)
+                for path in group:
+                    os.remove(path)
+            runs = merged
+        _merge_files(runs, header, output, sort_key, reverse)
+    return output
+
+
+def _join_header(left_header: List[str], right_header: List[str], on: List[str]) -> tuple:
+    """Output header and the right-side columns to append (collisions get a 'right_' prefix)."""
+    right_indices = [i for i, name in enumerate(right_header) if name not in on]
+    header = list(left_header) + [
+        f"right_{right_header[i]}" if right_header[i] in left_header else right_header[i]
+        for i in right_indices
+    ]
+    return header, right_indices
+
+
+def _hash_join(left: str, right: str, on: List[str], output: str, how: str,
+               build_left: bool) -> int:
+    """Join by loading the build side into a dict and streaming the other side."""
+    left_header, _ = csv_schema(left)
+    right_header, _ = csv_schema(right)
+    header, right_indices = _join_header(left_header, right_header, on)
+    left_key = _make_sort_key(left_header, on, None)
+    right_key = _make_sort_key(right_header, on, None)
+    left_width = len(left_header)
+    empty_right = [''] * len(right_indices)
+    
+    def pad(row: List[str]) -> List[str]:
+        return row + [''] * (left_width - len(row)) if len(row) < left_width else row
+    
+    def right_part(row: List[str]) -> List[str]:
+        return [row[i] if i < len(row) else '' for i in right_indices]
+    
+    def joined() -> Iterator[List[str]]:
+        if not build_left:
+            table: Dict[tuple, List[List[str]]] = {}
+            for row in _iter_records(right):
+                table.setdefault(right_key(row), []).append(right_part(row))
+            for row in _iter_records(left):
+                matches = table.get(left_key(row))
+                if matches:
+                    row = pad(row)
+                    for match in matches:
+                        yield row + match
+                elif how == 'left':
+                    yield pad(row) + empty_right
+        else:
+            table = {}
+            for row in _iter_records(left):
+                table.setdefault(left_key(row), []).append([pad(row), False])
+            for row in _iter_records(right):
+                entries = table.get(right_key(row))
+                if entries:
+                    part = right_part(row)
+                    for entry in entries:
+                        entry[1] = True
+                        yield entry[0] + part
+            if how == 'left':
+                for entries in table.values():
+                    for row, matched in entries:
+                        if not matched:
+                            yield row + empty_right
+    
+    return _write_records(output, header, joined())
+
+
+def _merge_join(left: str, right: str, on: List[str], output: str, how: str,
+                memory_limit: int, tmp_dir: Optional[str]) -> int:
+    """Sort both sides by the join key on disk, then merge them in one pass."""
+    left_header, _ = csv_schema(left)
+    right_header, _ = csv_schema(right)
+    header, right_indices = _join_header(left_header, right_header, on)
+    left_key = _make_sort_key(left_header, on, None)
+    right_key = _make_sort_key(right_header, on, None)
+    left_width = len(left_header)
+    empty_right = [''] * len(right_indices)
+    
+    with tempfile.TemporaryDirectory(prefix='join_csv_', dir=tmp_dir) as work_dir:
+        left_sorted = sort_csv(left, on, os.path.join(work_dir, 'left.csv'),
+                               memory_limit // 2, typed=False, tmp_dir=work_dir)
+        right_sorted = sort_csv(right, on, os.path.join(work_dir, 'right.csv'),
+                                memory_limit // 2, typed=False, tmp_dir=work_dir)
+        
+        def joined() -> Iterator[List[str]]:
+            # Rows of one right-side key are held in memory at a time
+            right_groups = itertools.groupby(_iter_records(right_sorted), key=right_key)
+            right_group_key, right_group = next(right_groups, (None, None))
+            right_rows = None
+            for key, left_rows in itertools.groupby(_iter_records(left_sorted), key=left_key):
+                while right_group_key is not None and right_group_key < key:
+                    right_group_key, right_group = next(right_groups, (None, None))
+                    right_rows = None
+                if right_group_key == key:
+                    if right_rows is None:
+                        right_rows = [[row[i] if i < len(row) else '' for i in right_indices]
+                                      for row in right_group]
+                    for row in left_rows:
+                        row = row + [''] * (left_width - len(row))
+                        for match in right_rows:
+                            yield row + match
+                elif how == 'left':
+                    for row in left_rows:
+                        yield row + [''] * (left_width - len(row)) + empty_right
+        
+        return _write_records(output, header, joined())
+
+
+def join_csv(left: str, right: str, on: Union[str, List[str]], output: Optional[str] = None,
+             how: str = 'inner', memory_limit: int = 64 * 1024 * 1024,
+             tmp_dir: Optional[str] = None) -> str:
+    """
+    Join two CSV files of any size on one or more key columns.
+    
+    If the smaller file fits into memory_limit (estimated from its size
+    on disk), it is loaded into a hash table and the other file is
+    streamed (hash join). Otherwise both files are sorted on disk with
+    sort_csv() and merged (sort-merge join); only the rows of one key
+    from the right file are held in memory. Keys are compared as strings.
+    
+    Output columns are the left columns followed by the right columns
+    without the key columns; right columns whose names collide get a
+    'right_' prefix. Row order is not guaranteed.
+    
+    Args:
+        left (str): Left CSV file
+        right (str): Right CSV file
+        on: Key column name or list of names (present in both files)
+        output (str): Output path (default: <left>.joined.csv)
+        how (str): 'inner' or 'left'
+        memory_limit (int): Bytes available for the hash table or sort runs
+        tmp_dir (str): Directory for temporary files
+    
+    Returns:
+        str: Output path
+    """
+    if how not in ('inner', 'left'):
+        raise ValueError(f"Unsupported join type: {how!r}")
+    on = [on] if isinstance(on, str) else list(on)
+    if output is None:
+        output = os.path.splitext(left)[0] + '.joined.csv'
+    
+    # Parsed rows take roughly 3-4x their size on disk
+    left_size = os.path.getsize(left) * 4
+    right_size = os.path.getsize(right) * 4
+    if min(left_size, right_size) <= memory_limit:
+        _hash_join(left, right, on, output, how, build_left=left_size < right_size)
+    else:
+        _merge_join(left, right, on, output, how, memory_limit, tmp_dir)
+    return output
+
+
+def generate_csv(filename: str, rows: int, seed: int = 0):
+    """
+    Write a synthetic sales file for benchmarks.
+    
+    Columns: id, region, category, quantity, price, comment. Some comments
+    contain commas, quotes and newlines, so they are quoted; one is left
+    unquoted with a literal quote inside (5'10"), which csv.reader reads
+    as-is but which must not confuse find_row_boundaries().
+    
+    Args:
+        filename (str): Output path
+        rows (int): Number of data rows
+        seed (int): Random seed
+    """
+    rng = random.Random(seed)
+    regions = ['north', 'south', 'east', 'west', 'central']
+    categories = [f"cat{i:02d}" for i in range(20)]
+    # Written pre-encoded: csv.writer would quote the stray-quote comment
+    comments = ['', 'ok', '"late, but complete"', '"said ""thanks"""', '"two\nlines"', '5\'10"']
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        f.write('id,region,category,quantity,price,comment\r\n')
+        batch = []
+        for i in range(rows):
+            batch.append(f"{i},{rng.choice(regions)},{rng.choice(categories)},"
+                         f"{rng.randint(1, 50)},{rng.uniform(1, 500):.2f},"
+                         f"{rng.choice(comments)}\r\n")
+            if len(batch) == 10000:
+                f.writelines(batch)
+                batch.clear()
+        f.writelines(batch)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _benchmark_list(filename: str) -> tuple:
+    """Load everything, then aggregate (previous approach)."""
+    start = time.perf_counter()
+    data = read_csv(filename)
+    totals = aggregate_csv(filter_csv(data, 'region', 'north'), 'category', 'price')
+    return len(data), time.perf_counter() - start, peak_rss_mb(), len(totals)
+
+
+def _benchmark_stream(filename: str) -> tuple:
+    """Filter, transform and aggregate in one streaming pass."""
+    start = time.perf_counter()
+    counted = 0
+    
+    def count(rows):
+        nonlocal counted
+        for row in rows:
+            counted += 1
+            yield row
+    
+    rows = iter_csv(filename, columns=['region', 'category', 'quantity', 'price'])
+    rows = filter_rows(count(rows), 'region', 'north')
+    rows = transform_rows(rows, 'category', str.upper)
+    totals = aggregate_rows(rows, 'category', 'price')
+    return counted, time.perf_counter() - start, peak_rss_mb(), len(totals)
+
+
+def _ensure_benchmark_file(rows: int, filename: str) -> float:
+    """Generate the benchmark file unless it already has `rows` rows; returns its size in MB."""
+    marker = f"{filename}.rows"
+    if not (os.path.exists(filename) and os.path.exists(marker)
+            and open(marker).read() == str(rows)):
+        print(f"Generating {rows:,} rows into {filename} ...")
+        generate_csv(filename, rows)
+        with open(marker, 'w') as f:
+            f.write(str(rows))
+    size_mb = os.path.getsize(filename) / 1e6
+    print(f"File: {filename} ({size_mb:,.0f} MB, {rows:,} rows)")
+    return size_mb
+
+
+def benchmark(rows: int = 10_000_000, filename: str = "/tmp/csv_benchmark.csv",
+              compare: bool = True):
+    """
+    Measure rows/sec and peak RSS of the list-based and streaming APIs.
+    
+    Each variant runs in a fresh process so peak RSS is its own.
+    
+    Args:
+        rows (int): Rows in the generated file
+        filename (str): Benchmark file (generated if missing or different size)
+        compare (bool): Also run the list-based approach
+    """
+    size_mb = _ensure_benchmark_file(rows, filename)
+    
+    variants = [("streaming (one pass)", _benchmark_stream)]
+    if compare:
+        variants.insert(0, ("read_csv + lists", _benchmark_list))
+    for label, func in variants:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            counted, seconds, rss, groups = executor.submit(func, filename).result()
+        print(f"  {label:22} {seconds:7.2f}s  {counted / seconds:10,.0f} rows/s  "
+              f"{size_mb / seconds:6.1f} MB/s  peak RSS {rss:8,.1f} MB  ({groups} groups)")
+
+
+def benchmark_parallel(rows: int = 10_000_000, filename: str = "/tmp/csv_benchmark.csv",
+                       max_workers: Optional[int] = None):
+    """
+    Compare serial and parallel aggregation and check the results match.
+    
+    Args:
+        rows (int): Rows in the generated file
+        filename (str): Benchmark file
+        max_workers (int): Largest worker count to try (default: CPU count)
+    """
+    size_mb = _ensure_benchmark_file(rows, filename)
+    max_workers = max_workers or os.cpu_count() or 1
+    where = {'region': 'north'}
+    
+    start = time.perf_counter()
+    serial = aggregate_rows(filter_rows(iter_csv(filename), 'region', 'north'),
+                            'category', 'price')
+    serial_time = time.perf_counter() - start
+    print(f"  {'serial (iter_csv)':22} {serial_time:7.2f}s  {rows / serial_time:10,.0f} rows/s")
+    
+    workers = 1
+    while True:
+        start = time.perf_counter()
+        result = aggregate_csv_parallel(filename, 'category', 'price', where, workers)
+        seconds = time.perf_counter() - start
+        label = f"parallel, {workers} worker(s)"
+        print(f"  {label:22} {seconds:7.2f}s  {rows / seconds:10,.0f} rows/s  "
+              f"{size_mb / seconds:6.1f} MB/s  speedup {serial_time / seconds:4.1f}x  "
+              f"{'identical' if result == serial else 'MISMATCH'}")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+    
+    if pd is None:
+        print("  columnar (pandas)      skipped, pandas not installed")
+        return
+    start = time.perf_counter()
+    result = aggregate_csv_columnar(filename, 'category', 'price', where)
+    seconds = time.perf_counter() - start
+    same = all(result[key]['count'] == serial[key]['count']
+               and math.isclose(result[key]['sum'], serial[key]['sum'])
+               for key in serial) and result.keys() == serial.keys()
+    print(f"  {'columnar (pandas)':22} {seconds:7.2f}s  {rows / seconds:10,.0f} rows/s  "
+          f"{size_mb / seconds:6.1f} MB/s  speedup {serial_time / seconds:4.1f}x  "
+          f"{'matches (sums to rounding)' if same else 'MISMATCH'}")
+
+
+def _benchmark_external(filename: str, operation: str, memory_limit: int) -> tuple:
+    """Run one sort or join on the benchmark file (in a fresh process)."""
+    start = time.perf_counter()
+    if operation == 'sort':
+        sort_csv(filename, ['category', 'price'], f"{filename}.sorted", memory_limit)
+    elif operation == 'hash join':
+        lookup = f"{filename}.categories"
+        _write_records(lookup, ['category', 'manager'],
+                       ([f"cat{i:02d}", f"manager{i % 7}"] for i in range(20)))
+        join_csv(filename, lookup, 'category', f"{filename}.joined", memory_limit=memory_limit)
+    else:
+        join_csv(filename, filename, 'id', f"{filename}.joined", memory_limit=memory_limit)
+    return time.perf_counter() - start, peak_rss_mb()
+
+
+def benchmark_external(rows: int = 10_000_000, filename: str = "/tmp/csv_benchmark.csv",
+                       memory_limit: int = 64 * 1024 * 1024):
+    """
+    Measure external sort and join time and peak RSS.
+    
+    Args:
+        rows (int): Rows in the generated file
+        filename (str): Benchmark file
+        memory_limit (int): Memory budget passed to sort_csv/join_csv
     """
-    result = []
-    for row in data.copy():
-        new_row = row.copy()
-        if column in new_row:
-            new_row[column] = func(new_row[column])
-        result.append(new_row)
-    return result
+    size_mb = _ensure_benchmark_file(rows, filename)
+    print(f"  memory_limit {memory_limit / 1e6:.0f} MB")
+    for operation in ('sort', 'hash join', 'sort-merge join'):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            seconds, rss = executor.submit(_benchmark_external, filename, operation,
+                                           memory_limit).result()
+        print(f"  {operation:22} {seconds:7.2f}s  {rows / seconds:10,.0f} rows/s  "
+              f"{size_mb / seconds:6.1f} MB/s  peak RSS {rss:8,.1f} MB")
+    for suffix in ('.sorted', '.joined', '.categories'):
+        if os.path.exists(filename + suffix):
+            os.remove(filename + suffix)
 
 
 def main():
     """Main function to demonstrate CSV processing."""
+    parser = argparse.ArgumentParser(description="CSV processor demo")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="benchmark on a generated file")
+    parser.add_argument('--rows', type=int, default=10_000_000,
+                        help="rows in the generated benchmark file")
+    parser.add_argument('--no-compare', action='store_true',
+                        help="skip the list-based baseline (it needs RAM for the whole file)")
+    parser.add_argument('--parallel', action='store_true',
+                        help="with --benchmark: compare serial and multi-process aggregation")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="largest number of worker processes to try (default: CPU count)")
+    parser.add_argument('--external', action='store_true',
+                        help="with --benchmark: external sort and join")
+    parser.add_argument('--memory-limit', type=int, default=64,
+                        help="memory budget in MB for --external")
+    args = parser.parse_args()
+    
+    if args.benchmark and args.external:
+        benchmark_external(args.rows, memory_limit=args.memory_limit * 1024 * 1024)
+        return
+    if args.benchmark and args.parallel:
+        benchmark_parallel(args.rows, max_workers=args.workers)
+        return
+    if args.benchmark:
+        benchmark(args.rows, compare=not args.no_compare)
+        return
+    
     print("CSV Processor Demo")
     
     # Create sample CSV data
@@ -151,6 +1229,30 @@ def main():
     print("\nTransformed names:")
     for row in transformed:
         print(f"  {row['name']}")
+    
+    # Streaming pipeline with typed columns
+    print("\nStreaming statistics (salary > 52000):")
+    rows = iter_csv(temp_file)
+    rows = filter_rows(rows, 'salary', predicate=lambda salary: salary > 52000)
+    rows = transform_rows(rows, 'department', str.lower)
+    for dept, stats in aggregate_rows(rows, 'department', 'salary').items():
+        print(f"  {dept}: count={stats['count']}, sum={stats['sum']}, "
+              f"mean={stats['mean']:.1f}, min={stats['min']}, max={stats['max']}")
+    
+    # External sort and join
+    sorted_file = sort_csv(temp_file, 'salary', "/tmp/sample_sorted.csv", reverse=True)
+    print("\nSorted by salary (descending):")
+    for row in iter_csv(sorted_file):
+        print(f"  {row['name']}: {row['salary']}")
+    
+    heads_file = "/tmp/department_heads.csv"
+    write_csv(heads_file, [{'department': 'IT', 'head': 'Grace'},
+                           {'department': 'HR', 'head': 'Ada'}])
+    joined_file = join_csv(temp_file, heads_file, 'department', "/tmp/sample_joined.csv",
+                           how='left')
+    print("\nJoined with department heads:")
+    for row in iter_csv(joined_file):
+        print(f"  {row['name']} ({row['department']}): head {row['head'] or '-'}")
 
 
 if __name__ == "__main__":
@@ -4,21 +4,61 @@ JSON Parser Script
 Parse, manipulate, and transform JSON data.
 """
 
+import argparse
 import json
-from typing import Any, Dict, List, Optional
+import os
+import random
+import re
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def read_json(filename: str) -> Optional[Dict]:
+
+# Characters read per step by the streaming parser
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+
+def _resolve_backend(backend: str) -> str:
+    """
+    Pick the JSON library: 'json', 'orjson' or 'auto' (orjson if installed).
+    
+    Note that orjson is stricter than json: it rejects NaN and Infinity.
+    """
+    if backend == 'auto':
+        return 'orjson' if orjson is not None else 'json'
+    if backend == 'orjson' and orjson is None:
+        raise ImportError("orjson backend requested but orjson is not installed")
+    if backend not in ('json', 'orjson'):
+        raise ValueError(f"Unknown JSON backend: {backend!r}")
+    return backend
+
+
+def read_json(filename: str, backend: str = 'auto') -> Optional[Dict]:
     """
     Read and parse JSON file.
     
+    Loads the whole document; use iter_json() or iter_jsonl() for large files.
+    
     Args:
         filename (str): Path to JSON file
+        backend (str): 'json', 'orjson' or 'auto'
     
     Returns:
         dict or list: Parsed JSON data, or None on error
     """
     try:
+        if _resolve_backend(backend) == 'orjson':
+            with open(filename, 'rb') as f:
+                return orjson.loads(f.read())
         with open(filename, 'r', encoding='utf-8') as f:
             return json.load(f)
     except (FileNotFoundError, json.JSONDecodeError) as e:
@@ -26,6 +66,187 @@ def read_json(filename: str) -> Optional[Dict]:
         return None
 
 
+class _JSONStream:
+    """
+    Incremental reader over a text file for the standard library decoder.
+    
+    Values are decoded with JSONDecoder.raw_decode() from a buffer that is
+    refilled in chunks. A value that reaches the end of the buffer may be
+    cut off (e.g. the number 12 of 123, or 1 of 1.5 when the chunk ends
+    after the dot), so it is decoded again after more data was read; the
+    read size doubles on every retry to keep huge values linear.
+    """
+    
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize stream.
+        
+        Args:
+            f: File opened in text mode
+            chunk_size (int): Characters read per step
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self._decode = json.JSONDecoder().raw_decode
+    
+    def _read(self, size: int) -> bool:
+        """Append up to size characters, dropping consumed ones; False at end of file."""
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+    
+    def peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character (None at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read(self.chunk_size):
+                return None
+    
+    def expect(self, char: str):
+        """Consume char or raise JSONDecodeError."""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        if self.peek() is None:
+            raise json.JSONDecodeError("Expecting value", self.buffer, self.pos)
+        is_number = self.buffer[self.pos] in _NUMBER_CHARS
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self._decode(self.buffer, self.pos)
+                if self.eof or (end < len(self.buffer) and not
+                                (is_number and self.buffer[end] in _NUMBER_CHARS)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if self._read(size):
+                size *= 2
+
+
+def iter_json(filename: str, path: Optional[str] = None,
+              chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Stream the top-level records of a JSON file.
+    
+    If the document (or the value at `path`) is an array, its elements
+    are yielded one at a time, so a multi-GB array needs memory for one
+    element only. Otherwise each top-level value is yielded, which also
+    covers concatenated documents and JSON Lines.
+    
+    Args:
+        filename (str): Path to JSON file
+        path (str): Dot-separated object keys leading to the array, e.g.
+            'data.items'; values before it are decoded and skipped
+        chunk_size (int): Characters read per step
+    
+    Yields:
+        Any: One record
+    
+    Raises:
+        json.JSONDecodeError: On invalid JSON
+        KeyError: If `path` does not exist
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        
+        for key in path.split('.') if path else []:
+            stream.expect('{')
+            while True:
+                if stream.peek() == '}':
+                    raise KeyError(path)
+                name = stream.value()
+                stream.expect(':')
+                if name == key:
+                    break
+                stream.value()
+                if stream.peek() == ',':
+                    stream.pos += 1
+        
+        if stream.peek() == '[':
+            stream.pos += 1
+            if stream.peek() == ']':
+                return
+            while True:
+                yield stream.value()
+                char = stream.peek()
+                if char == ']':
+                    return
+                stream.expect(',')
+        
+        if path:
+            yield stream.value()
+            return
+        while stream.peek() is not None:
+            yield stream.value()
+
+
+def iter_jsonl(filename: str, backend: str = 'auto') -> Iterator[Any]:
+    """
+    Stream the records of a JSON Lines file (one JSON value per line).
+    
+    Args:
+        filename (str): Path to JSONL file
+        backend (str): 'json', 'orjson' or 'auto'
+    
+    Yields:
+        Any: One record per non-empty line
+    
+    Raises:
+        ValueError: With the line number, if a line is not valid JSON
+    """
+    loads = orjson.loads if _resolve_backend(backend) == 'orjson' else json.loads
+    with open(filename, 'rb') as f:
+        for number, line in enumerate(f, 1):
+            if line.isspace():
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                raise ValueError(f"{filename}:{number}: {e}") from e
+
+
+def write_jsonl(filename: str, records: Iterable[Any], backend: str = 'auto') -> int:
+    """
+    Write records as JSON Lines, one at a time.
+    
+    Args:
+        filename (str): Output file path
+        records (Iterable): Records to write (may be a generator)
+        backend (str): 'json', 'orjson' or 'auto'
+    
+    Returns:
+        int: Number of records written
+    """
+    count = 0
+    with open(filename, 'wb') as f:
+        if _resolve_backend(backend) == 'orjson':
+            dumps = orjson.dumps
+            newline = orjson.OPT_APPEND_NEWLINE
+            for record in records:
+                f.write(dumps(record, option=newline))
+                count += 1
+        else:
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+            for record in records:
+                f.write((encode(record) + '\n').encode('utf-8'))
+                count += 1
+    return count
+
+
 def write_json(filename: str, data: Any, pretty: bool = True):
     """
     Write data to JSON file.
@@ -91,6 +312,42 @@ def set_nested_value(data: Dict, path: str, value: Any, separator: str = '.') ->
     return data
 
 
+def iter_flatten(data: Dict, parent_key: str = '', separator: str = '.') -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the (key, value) pairs of a flattened JSON structure.
+    
+    Uses an explicit stack of iterators instead of recursion, so depth is
+    not limited by the recursion limit and no intermediate lists are built.
+    
+    Args:
+        data (dict): Nested JSON data
+        parent_key (str): Parent key prefix
+        separator (str): Key separator
+    
+    Yields:
+        Tuple[str, Any]: Flattened key and leaf value, in document order
+    """
+    # (key prefix, iterator over entries, entries are list items)
+    stack = [(parent_key, iter(data.items()), False)]
+    while stack:
+        prefix, entries, in_list = stack[-1]
+        for key, value in entries:
+            if in_list:
+                new_key = f"{prefix}[{key}]"
+            else:
+                new_key = f"{prefix}{separator}{key}" if prefix else key
+            
+            if isinstance(value, dict):
+                stack.append((new_key, iter(value.items()), False))
+                break
+            if isinstance(value, list) and not in_list:
+                stack.append((new_key, enumerate(value), True))
+                break
+            yield new_key, value
+        else:
+            stack.pop()
+
+
 def flatten_json(data: Dict, parent_key: str = '', separator: str = '.') -> Dict:
     """
     Flatten nested JSON structure.
@@ -103,23 +360,7 @@ def flatten_json(data: Dict, parent_key: str = '', separator: str = '.') -> Dict
     Returns:
         dict: Flattened JSON
     """
-    items = []
-    
-    for key, value in data.items():
-        new_key = f"{parent_key}{separator}{key}" if parent_key else key
-        
-        if isinstance(value, dict):
-            items.extend(flatten_json(value, new_key, separator).items())
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                if isinstance(item, dict):
-                    items.extend(flatten_json(item, f"{new_key}[{i}]", separator).items())
-                else:
-                    items.append((f"{new_key}[{i}]", item))
-        else:
-            items.append((new_key, value))
-    
-    return dict(items)
+    return dict(iter_flatten(data, parent_key, separator))
 
 
 def merge_json(base: Dict, update: Dict) -> Dict:
@@ -144,8 +385,112 @@ def merge_json(base: Dict, update: Dict) -> Dict:
     return result
 
 
+def generate_records(count: int, seed: int = 0) -> Iterator[Dict]:
+    """
+    Generate nested sample records for benchmarks.
+    
+    Args:
+        count (int): Number of records
+        seed (int): Random seed
+    
+    Yields:
+        dict: One order record
+    """
+    rng = random.Random(seed)
+    cities = ['Berlin', 'New York', 'Tokyo', 'Paris', 'S\u00e3o Paulo']
+    for i in range(count):
+        yield {
+            "id": i,
+            "user": {"name": f"user{rng.randint(1, 10000)}",
+                     "address": {"city": rng.choice(cities), "zip": f"{rng.randint(0, 99999):05d}"}},
+            "items": [{"sku": f"SKU-{rng.randint(1, 500)}", "qty": rng.randint(1, 5),
+                       "price": round(rng.uniform(1, 200), 2)}
+                      for _ in range(rng.randint(1, 4))],
+            "paid": rng.random() < 0.9,
+            "note": None if rng.random() < 0.7 else "deliver \"after 6pm\", please"
+        }
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _benchmark_case(case: str, array_file: str, jsonl_file: str) -> Tuple[float, int, float]:
+    """Run one benchmark case in a fresh process; returns (seconds, records, peak RSS)."""
+    start = time.perf_counter()
+    if case == 'json.load (whole array)':
+        with open(array_file, 'r', encoding='utf-8') as f:
+            count = len(json.load(f))
+    elif case == 'iter_json (array)':
+        count = sum(1 for _ in iter_json(array_file))
+    elif case.startswith('iter_jsonl'):
+        count = sum(1 for _ in iter_jsonl(jsonl_file, backend=case.split()[-1]))
+    elif case.startswith('copy'):
+        backend = case.split()[-1]
+        count = write_jsonl(jsonl_file + '.out', iter_jsonl(jsonl_file, backend), backend)
+        os.remove(jsonl_file + '.out')
+    else:  # flatten
+        count = 0
+        for record in iter_jsonl(jsonl_file):
+            for _ in iter_flatten(record):
+                pass
+            count += 1
+    return time.perf_counter() - start, count, _peak_rss_mb()
+
+
+def benchmark(records: int = 500_000, directory: str = "/tmp"):
+    """
+    Measure parse and write throughput in MB/s and peak memory.
+    
+    Each case runs in a fresh process, so peak RSS is its own.
+    
+    Args:
+        records (int): Records in the generated files
+        directory (str): Where the benchmark files are written
+    """
+    array_file = os.path.join(directory, "json_benchmark.json")
+    jsonl_file = os.path.join(directory, "json_benchmark.jsonl")
+    write_jsonl(jsonl_file, generate_records(records), backend='json')
+    with open(array_file, 'w', encoding='utf-8') as out:
+        out.write('[\n')
+        for i, record in enumerate(iter_jsonl(jsonl_file, backend='json')):
+            out.write((',\n' if i else '') + json.dumps(record, ensure_ascii=False))
+        out.write('\n]\n')
+    array_mb = os.path.getsize(array_file) / 1e6
+    jsonl_mb = os.path.getsize(jsonl_file) / 1e6
+    print(f"{records:,} records, array {array_mb:,.0f} MB, JSONL {jsonl_mb:,.0f} MB "
+          f"(orjson {'installed' if orjson is not None else 'not installed'}):")
+    
+    cases = ['json.load (whole array)', 'iter_json (array)', 'iter_jsonl json',
+             'copy (read+write) json', 'iter_flatten (from JSONL)']
+    if orjson is not None:
+        cases[3:3] = ['iter_jsonl orjson']
+        cases[5:5] = ['copy (read+write) orjson']
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            seconds, count, rss = executor.submit(_benchmark_case, case, array_file,
+                                                  jsonl_file).result()
+        size_mb = array_mb if 'array' in case else jsonl_mb
+        print(f"  {case:26} {seconds:6.2f}s  {size_mb / seconds:7.1f} MB/s  "
+              f"{count / seconds:9,.0f} records/s  peak RSS {rss:7,.1f} MB")
+    os.remove(array_file)
+    os.remove(jsonl_file)
+
+
 def main():
     """Main function to demonstrate JSON parsing."""
+    parser = argparse.ArgumentParser(description="JSON parser demo")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="measure parser throughput in MB/s")
+    parser.add_argument('--records', type=int, default=500_000,
+                        help="records in the benchmark files")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        benchmark(args.records)
+        return
+    
     print("JSON Parser Demo")
     
     # Sample JSON data
@@ -197,6 +542,16 @@ def main():
     print(f"\nAfter merge - User age: {merged['user']['age']}")
     print(f"After merge - City (preserved): {merged['user']['address']['city']}")
     print(f"After merge - Zip (added): {merged['user']['address']['zip']}")
+    
+    # Streaming
+    jsonl_file = "/tmp/sample.jsonl"
+    count = write_jsonl(jsonl_file, generate_records(3))
+    print(f"\nWrote {count} records to {jsonl_file}")
+    for record in iter_jsonl(jsonl_file):
+        print(f"  order {record['id']}: {len(record['items'])} item(s), "
+              f"city {get_nested_value(record, 'user.address.city')}")
+    orders = list(iter_json(temp_file, path='orders'))
+    print(f"Streamed {len(orders)} orders from {temp_file}: {orders}")
 
 
 if __name__ == "__main__":
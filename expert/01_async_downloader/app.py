@@ -6,41 +6,64 @@ Asynchronous file downloader using asyncio and aiohttp.
 
 import asyncio
 import aiohttp
+from aiohttp import web
 from pathlib import Path
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import resource
+import socket
+import sys
+import tempfile
 import time
 
 
-async def download_file(session: aiohttp.ClientSession, url: str, destination: str) -> Dict:
+CHUNK_SIZE = 64 * 1024
+MAX_CONCURRENCY = 100
+LIMIT_PER_HOST = 10
+
+
+async def download_file(session: aiohttp.ClientSession, url: str, destination: str,
+                        chunk_size: int = CHUNK_SIZE) -> Dict:
     """
     Download a single file asynchronously.
     
+    The body is streamed in chunks and each chunk is written in a thread
+    executor, so memory stays at one chunk per download and the event loop
+    never blocks on disk I/O.
+    
     Args:
         session: aiohttp session
         url: URL to download
         destination: Local file path
+        chunk_size: Bytes read from the response per iteration
     
     Returns:
         dict: Download result with status and info
     """
     start_time = time.time()
+    loop = asyncio.get_running_loop()
     
     try:
         async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
             if response.status == 200:
-                content = await response.read()
-                
-                # Write to file
                 Path(destination).parent.mkdir(parents=True, exist_ok=True)
-                with open(destination, 'wb') as f:
-                    f.write(content)
+                f = await loop.run_in_executor(None, open, destination, 'wb')
+                size = 0
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        await loop.run_in_executor(None, f.write, chunk)
+                        size += len(chunk)
+                finally:
+                    await loop.run_in_executor(None, f.close)
                 
                 elapsed = time.time() - start_time
                 return {
                     'url': url,
                     'destination': destination,
                     'status': 'success',
-                    'size': len(content),
+                    'size': size,
                     'time': elapsed
                 }
             else:
@@ -57,55 +80,410 @@ async def download_file(session: aiohttp.ClientSession, url: str, destination: s
         }
 
 
-async def download_multiple(urls: List[str], output_dir: str = '/tmp/downloads') -> List[Dict]:
+def make_connector(max_concurrency: int = MAX_CONCURRENCY,
+                   limit_per_host: int = LIMIT_PER_HOST) -> aiohttp.TCPConnector:
+    """
+    Create a connector that caps total and per-host connections.
+    
+    Args:
+        max_concurrency: Maximum open connections overall
+        limit_per_host: Maximum open connections to a single host
+    
+    Returns:
+        aiohttp.TCPConnector: Configured connector
+    """
+    return aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=limit_per_host)
+
+
+async def _run_workers(session: aiohttp.ClientSession, urls: Iterable[str], output_dir: str,
+                       max_concurrency: int,
+                       on_result: Optional[Callable[[int, Dict], None]] = None) -> None:
+    """
+    Download URLs with a fixed number of worker coroutines.
+    
+    Workers pull from one shared iterator, so only `max_concurrency`
+    downloads are in flight and no task is created per URL.
+    
+    Args:
+        session: aiohttp session
+        urls: URLs to download (consumed lazily)
+        output_dir: Directory to save files
+        max_concurrency: Number of worker coroutines
+        on_result: Called with (index, result) after each download
+    """
+    jobs = enumerate(urls)
+    
+    async def worker():
+        for i, url in jobs:
+            filename = f"file_{i}_{Path(url).name}"
+            destination = f"{output_dir}/{filename}"
+            result = await download_file(session, url, destination)
+            if on_result is not None:
+                on_result(i, result)
+    
+    await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+
+
+async def download_multiple(urls: List[str], output_dir: str = '/tmp/downloads',
+                            max_concurrency: int = MAX_CONCURRENCY,
+                            limit_per_host: int = LIMIT_PER_HOST) -> List[Dict]:
     """
     Download multiple files concurrently.
     
     Args:
         urls: List of URLs to download
         output_dir: Directory to save files
+        max_concurrency: Maximum downloads in flight at once
+        limit_per_host: Maximum connections to a single host
     
     Returns:
-        List[Dict]: Results for each download
+        List[Dict]: Results for each download, in input order
     """
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        
-        for i, url in enumerate(urls):
-            filename = f"file_{i}_{Path(url).name}"
-            destination = f"{output_dir}/{filename}"
-            tasks.append(download_file(session, url, destination))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        return results
+    results: List[Optional[Dict]] = [None] * len(urls)
+    
+    def store(i: int, result: Dict):
+        results[i] = result
+    
+    connector = make_connector(max_concurrency, limit_per_host)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _run_workers(session, urls, output_dir, max_concurrency, store)
+    return results
 
 
-async def download_with_progress(urls: List[str], output_dir: str = '/tmp/downloads'):
+async def download_with_progress(urls: List[str], output_dir: str = '/tmp/downloads',
+                                 max_concurrency: int = MAX_CONCURRENCY,
+                                 limit_per_host: int = LIMIT_PER_HOST):
     """
     Download files with progress updates.
     
     Args:
         urls: List of URLs to download
         output_dir: Directory to save files
+        max_concurrency: Maximum downloads in flight at once
+        limit_per_host: Maximum connections to a single host
     """
     total = len(urls)
     completed = 0
     
     print(f"Starting download of {total} files...")
     
-    async with aiohttp.ClientSession() as session:
-        tasks = []
-        
-        for i, url in enumerate(urls):
-            filename = f"file_{i}_{Path(url).name}"
-            destination = f"{output_dir}/{filename}"
-            tasks.append(download_file(session, url, destination))
-        
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            completed += 1
-            status = "✓" if result['status'] == 'success' else "✗"
-            print(f"{status} [{completed}/{total}] {result.get('url', 'Unknown')[:50]}...")
+    def report(i: int, result: Dict):
+        nonlocal completed
+        completed += 1
+        status = "✓" if result['status'] == 'success' else "✗"
+        print(f"{status} [{completed}/{total}] {result.get('url', 'Unknown')[:50]}...")
+    
+    connector = make_connector(max_concurrency, limit_per_host)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await _run_workers(session, urls, output_dir, max_concurrency, report)
+
+
+async def _fetch_head(session: aiohttp.ClientSession,
+                      url: str) -> Tuple[Optional[int], bool, Optional[str]]:
+    """
+    Ask the server for the size of a resource and whether it supports ranges.
+    
+    Returns:
+        tuple: (Content-Length or None, True if byte ranges are accepted,
+            ETag or Last-Modified identifying this version or None)
+    """
+    async with session.head(url, allow_redirects=True,
+                            timeout=aiohttp.ClientTimeout(total=30)) as response:
+        if response.status != 200:
+            return None, False, None
+        length = response.headers.get('Content-Length')
+        accepts = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+        return (int(length) if length is not None else None), accepts, validator
+
+
+def split_ranges(size: int, segments: int) -> List[List[int]]:
+    """
+    Split `size` bytes into at most `segments` inclusive byte ranges.
+    
+    Args:
+        size: Total number of bytes
+        segments: Number of ranges to create
+    
+    Returns:
+        List[List[int]]: [start, end] pairs covering 0..size-1
+    """
+    segments = max(1, min(segments, size))
+    step = -(-size // segments)
+    return [[start, min(start + step, size) - 1] for start in range(0, size, step)]
+
+
+def _load_manifest(path: str, destination: str, url: str, size: int,
+                   validator: Optional[str], segments: int) -> Dict:
+    """
+    Load a resume manifest, or create a fresh one if it is missing or stale.
+    
+    A manifest is only trusted if it describes the same URL, size and
+    ETag/Last-Modified as the server reports now, and the destination still
+    exists with the preallocated size; otherwise its finished ranges may
+    not be on disk (or belong to another version) and all ranges are
+    fetched again.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if (manifest.get('url') == url and manifest.get('size') == size
+                and manifest.get('validator') == validator
+                and os.path.getsize(destination) == size):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    ranges = split_ranges(size, segments)
+    return {'url': url, 'size': size, 'validator': validator,
+            'ranges': ranges, 'done': [False] * len(ranges)}
+
+
+def _save_manifest(path: str, manifest: Dict):
+    """Write the manifest atomically so a crash never leaves it half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+async def download_segmented(url: str, destination: str, segments: int = 4,
+                             chunk_size: int = CHUNK_SIZE,
+                             session: Optional[aiohttp.ClientSession] = None) -> Dict:
+    """
+    Download a large file as concurrent byte ranges, resuming if interrupted.
+    
+    A HEAD request learns the size and range support, the destination is
+    preallocated and every range is written in place with os.pwrite().
+    Finished ranges are recorded in a `<destination>.parts` manifest, so a
+    later call only fetches what is still missing. The manifest is dropped
+    if the destination is gone or has the wrong size, or if the server's
+    size or ETag/Last-Modified changed; ranges are requested with
+    `If-Range`, so a file replaced mid-download fails instead of mixing
+    versions. Servers without range support fall back to download_file().
+    
+    Args:
+        url: URL to download
+        destination: Local file path
+        segments: Number of byte ranges fetched in parallel
+        chunk_size: Bytes read from the response per iteration
+        session: Existing aiohttp session (a new one is created if None)
+    
+    Returns:
+        dict: Download result with status and info
+    """
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await download_segmented(url, destination, segments, chunk_size, own_session)
+    
+    start_time = time.time()
+    loop = asyncio.get_running_loop()
+    
+    try:
+        size, accepts_ranges, validator = await _fetch_head(session, url)
+    except Exception as e:
+        return {'url': url, 'status': 'error', 'error': str(e)}
+    if not size or not accepts_ranges:
+        return await download_file(session, url, destination, chunk_size)
+    
+    manifest_path = destination + '.parts'
+    manifest = _load_manifest(manifest_path, destination, url, size, validator, segments)
+    manifest_lock = asyncio.Lock()
+    missing = [i for i, done in enumerate(manifest['done']) if not done]
+    
+    Path(destination).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(destination, os.O_RDWR | os.O_CREAT, 0o644)
+    
+    async def fetch_range(index: int):
+        start, end = manifest['ranges'][index]
+        headers = {'Range': f'bytes={start}-{end}'}
+        if validator and not validator.startswith('W/'):
+            headers['If-Range'] = validator
+        async with session.get(url, headers=headers,
+                               timeout=aiohttp.ClientTimeout(total=None, sock_read=30)) as response:
+            if response.status != 206:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history,
+                    status=response.status, message='range request not honoured')
+            offset = start
+            async for chunk in response.content.iter_chunked(chunk_size):
+                await loop.run_in_executor(None, os.pwrite, fd, chunk, offset)
+                offset += len(chunk)
+            if offset != end + 1:
+                raise IOError(f'range {start}-{end} ended early at byte {offset}')
+        async with manifest_lock:
+            manifest['done'][index] = True
+            await loop.run_in_executor(None, _save_manifest, manifest_path, manifest)
+    
+    try:
+        await loop.run_in_executor(None, os.ftruncate, fd, size)
+        await loop.run_in_executor(None, _save_manifest, manifest_path, manifest)
+        results = await asyncio.gather(*(fetch_range(i) for i in missing),
+                                       return_exceptions=True)
+    finally:
+        os.close(fd)
+    
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        return {
+            'url': url,
+            'status': 'error',
+            'error': str(errors[0]),
+            'missing_ranges': len(errors)
+        }
+    
+    os.remove(manifest_path)
+    return {
+        'url': url,
+        'destination': destination,
+        'status': 'success',
+        'size': size,
+        'time': time.time() - start_time,
+        'fetched_ranges': len(missing)
+    }
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+async def start_test_server(payload: bytes,
+                            fail_ranges: int = 0) -> Tuple[web.AppRunner, str]:
+    """
+    Start a local aiohttp server that serves `payload` at /files/<name>.
+    
+    The server answers HEAD, sends an ETag and honours `Range` headers with
+    206 responses, so it can exercise both plain and segmented downloads.
+    
+    Args:
+        payload: Bytes returned for every file
+        fail_ranges: Number of initial range requests answered with HTTP 500
+    
+    Returns:
+        tuple: (runner to clean up, base URL of the server)
+    """
+    failures_left = fail_ranges
+    etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+    
+    async def handler(request):
+        nonlocal failures_left
+        headers = {'Accept-Ranges': 'bytes', 'ETag': etag}
+        if 'Range' not in request.headers:
+            return web.Response(body=payload, headers=headers)
+        if failures_left > 0:
+            failures_left -= 1
+            return web.Response(status=500)
+        byte_range = request.http_range
+        start = byte_range.start or 0
+        stop = len(payload) if byte_range.stop is None else min(byte_range.stop, len(payload))
+        headers['Content-Range'] = f'bytes {start}-{stop - 1}/{len(payload)}'
+        return web.Response(status=206, body=payload[start:stop], headers=headers)
+    
+    app = web.Application()
+    app.router.add_get('/files/{name}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    await web.SockSite(runner, sock).start()
+    return runner, f"http://127.0.0.1:{port}"
+
+
+async def check_segmented_download(size: int = 5 * 1024 * 1024 + 123, segments: int = 8) -> bool:
+    """
+    Check download_segmented() against a local range-capable server.
+    
+    The first run is interrupted by server errors on some ranges; the second
+    run must resume only those ranges and produce a byte-identical file.
+    Finally the interrupted manifest is restored next to a deleted
+    destination, and the third run must ignore it and fetch every range.
+    
+    Returns:
+        bool: True if every check passed
+    """
+    payload = os.urandom(size)
+    failed = 3
+    runner, base_url = await start_test_server(payload, fail_ranges=failed)
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            url = f"{base_url}/files/large.bin"
+            destination = f"{output_dir}/large.bin"
+            
+            first = await download_segmented(url, destination, segments)
+            interrupted = (first['status'] == 'error'
+                           and first['missing_ranges'] == failed
+                           and os.path.exists(destination + '.parts'))
+            with open(destination + '.parts', 'r', encoding='utf-8') as f:
+                stale_manifest = f.read()
+            
+            second = await download_segmented(url, destination, segments)
+            resumed = (second['status'] == 'success'
+                       and second['fetched_ranges'] == failed
+                       and not os.path.exists(destination + '.parts'))
+            
+            with open(destination, 'rb') as f:
+                identical = f.read() == payload
+            
+            os.remove(destination)
+            with open(destination + '.parts', 'w', encoding='utf-8') as f:
+                f.write(stale_manifest)
+            third = await download_segmented(url, destination, segments)
+            with open(destination, 'rb') as f:
+                restarted = (third['status'] == 'success'
+                             and third['fetched_ranges'] == segments
+                             and f.read() == payload)
+    finally:
+        await runner.cleanup()
+    
+    print(f"  {'✓' if interrupted else '✗'} Interrupted download keeps a manifest")
+    print(f"  {'✓' if resumed else '✗'} Resume fetches only the missing ranges")
+    print(f"  {'✓' if identical else '✗'} Downloaded file matches the source")
+    print(f"  {'✓' if restarted else '✗'} Manifest without its file is ignored")
+    return interrupted and resumed and identical and restarted
+
+
+async def benchmark_downloads(num_files: int = 10000, file_size: int = 64 * 1024,
+                              max_concurrency: int = MAX_CONCURRENCY,
+                              limit_per_host: int = LIMIT_PER_HOST) -> Dict:
+    """
+    Benchmark download_multiple() against a local aiohttp test server.
+    
+    Args:
+        num_files: Number of files to download
+        file_size: Size of each served file in bytes
+        max_concurrency: Maximum downloads in flight at once
+        limit_per_host: Maximum connections to the test server
+    
+    Returns:
+        dict: Files, bytes, elapsed time, throughput and peak RSS
+    """
+    runner, base_url = await start_test_server(b'x' * file_size)
+    
+    try:
+        urls = [f"{base_url}/files/{i}.bin" for i in range(num_files)]
+        with tempfile.TemporaryDirectory() as output_dir:
+            start_time = time.time()
+            results = await download_multiple(urls, output_dir,
+                                              max_concurrency, limit_per_host)
+            elapsed = time.time() - start_time
+    finally:
+        await runner.cleanup()
+    
+    total_bytes = sum(r['size'] for r in results if r['status'] == 'success')
+    return {
+        'files': num_files,
+        'successful': sum(1 for r in results if r['status'] == 'success'),
+        'bytes': total_bytes,
+        'time': elapsed,
+        'files_per_sec': num_files / elapsed,
+        'mb_per_sec': total_bytes / (1024 * 1024) / elapsed,
+        'peak_rss_mb': peak_rss_mb()
+    }
 
 
 def main():
@@ -140,6 +518,17 @@ def main():
                 print(f"  ✓ Downloaded {result.get('size', 0)} bytes to {result['destination']}")
             else:
                 print(f"  ✗ Failed: {result.get('error', 'Unknown error')}")
+    
+    if '--segmented' in sys.argv:
+        print("\nChecking segmented, resumable download against a local server...")
+        asyncio.run(check_segmented_download())
+    
+    if '--benchmark' in sys.argv:
+        print("\nBenchmarking 10000 files against a local test server...")
+        stats = asyncio.run(benchmark_downloads())
+        print(f"  {stats['successful']}/{stats['files']} files in {stats['time']:.2f}s")
+        print(f"  {stats['files_per_sec']:.0f} files/s, {stats['mb_per_sec']:.1f} MB/s")
+        print(f"  Peak RSS: {stats['peak_rss_mb']:.1f} MB")
 
 
 if __name__ == "__main__":
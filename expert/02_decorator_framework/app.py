@@ -4,9 +4,18 @@ Decorator Framework Script
 Custom decorator system with various patterns and use cases.
 """
 
+import contextlib
 import functools
+import inspect
+import io
+import sys
 import time
-from typing import Callable, Any
+from collections import OrderedDict
+from typing import Callable, Any, Hashable, Optional, Tuple
+
+
+# Separates positional from keyword arguments in memoize keys
+_KWD_MARK = object()
 
 
 def timer(func: Callable) -> Callable:
@@ -57,32 +66,100 @@ def retry(max_attempts: int = 3, delay: float = 1.0):
     return decorator
 
 
-def memoize(func: Callable) -> Callable:
+def _make_key(args: tuple, kwargs: dict, typed: bool) -> Hashable:
+    """
+    Build a hashable cache key from call arguments.
+    
+    A single int or str argument is used as the key directly. Otherwise
+    the key is a flat tuple of the positional arguments, a marker and
+    the keyword items; with `typed`, the argument types are appended so
+    that e.g. 1 and 1.0 are cached separately.
+    
+    Args:
+        args: Positional arguments
+        kwargs: Keyword arguments
+        typed: Distinguish arguments by type
+    
+    Returns:
+        Hashable: Cache key
+    """
+    if not kwargs and not typed and len(args) == 1 and type(args[0]) in (int, str):
+        return args[0]
+    key = args
+    if kwargs:
+        key += (_KWD_MARK,)
+        for item in kwargs.items():
+            key += item
+    if typed:
+        key += tuple(type(value) for value in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return key
+
+
+def memoize(func: Optional[Callable] = None, *, maxsize: Optional[int] = None,
+            typed: bool = False) -> Callable:
     """
     Decorator to cache function results.
     
+    Can be used as `@memoize` (unbounded) or `@memoize(maxsize=128)`,
+    in which case the least recently used entry is evicted once the
+    cache is full. All arguments must be hashable.
+    
     Args:
         func: Function to decorate
+        maxsize: Maximum number of cached results (None = unbounded)
+        typed: Cache arguments of different types separately (1 vs 1.0)
     
     Returns:
-        Wrapped function with caching
+        Wrapped function with caching (or a decorator if func is None)
     """
-    cache = {}
+    if func is None:
+        return functools.partial(memoize, maxsize=maxsize, typed=typed)
     
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Create cache key from arguments
-        key = str(args) + str(kwargs)
-        
-        if key not in cache:
-            cache[key] = func(*args, **kwargs)
-        else:
-            print(f"Cache hit for {func.__name__}")
-        
-        return cache[key]
+    cache = OrderedDict() if maxsize is not None else {}
+    stats = {'hits': 0, 'misses': 0}
+    missing = object()
+    
+    if maxsize is None:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed)
+            result = cache.get(key, missing)
+            if result is not missing:
+                stats['hits'] += 1
+                return result
+            stats['misses'] += 1
+            result = cache[key] = func(*args, **kwargs)
+            return result
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs, typed)
+            result = cache.get(key, missing)
+            if result is not missing:
+                stats['hits'] += 1
+                cache.move_to_end(key)
+                return result
+            stats['misses'] += 1
+            result = func(*args, **kwargs)
+            cache[key] = result
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+    
+    def cache_info() -> dict:
+        """Hits, misses, maxsize and current size of the cache."""
+        return {**stats, 'maxsize': maxsize, 'currsize': len(cache)}
+    
+    def clear_cache():
+        """Remove all cached results and reset the statistics."""
+        cache.clear()
+        stats['hits'] = stats['misses'] = 0
     
     wrapper.cache = cache
-    wrapper.clear_cache = lambda: cache.clear()
+    wrapper.cache_info = cache_info
+    wrapper.clear_cache = clear_cache
     return wrapper
 
 
@@ -90,6 +167,10 @@ def validate_types(**type_kwargs):
     """
     Decorator to validate function argument types.
     
+    The signature is inspected once at decoration time: each checked
+    argument is looked up by position or keyword, falling back to its
+    default value, so a call costs one isinstance() per checked argument.
+    
     Args:
         **type_kwargs: Argument names and their expected types
     
@@ -97,23 +178,38 @@ def validate_types(**type_kwargs):
         Decorator function
     """
     def decorator(func: Callable) -> Callable:
+        parameters = inspect.signature(func).parameters
+        positional = [name for name, param in parameters.items()
+                      if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)]
+        
+        # (name, position or None, default or _empty, expected type)
+        checks: Tuple[tuple, ...] = tuple(
+            (arg_name,
+             positional.index(arg_name) if arg_name in positional else None,
+             parameters[arg_name].default,
+             expected_type)
+            for arg_name, expected_type in type_kwargs.items()
+            if arg_name in parameters
+        )
+        empty = inspect.Parameter.empty
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Get function signature
-            import inspect
-            sig = inspect.signature(func)
-            bound_args = sig.bind(*args, **kwargs)
-            bound_args.apply_defaults()
-            
             # Validate types
-            for arg_name, expected_type in type_kwargs.items():
-                if arg_name in bound_args.arguments:
-                    value = bound_args.arguments[arg_name]
-                    if not isinstance(value, expected_type):
-                        raise TypeError(
-                            f"Argument '{arg_name}' must be {expected_type.__name__}, "
-                            f"got {type(value).__name__}"
-                        )
+            for arg_name, position, default, expected_type in checks:
+                if position is not None and position < len(args):
+                    value = args[position]
+                elif arg_name in kwargs:
+                    value = kwargs[arg_name]
+                elif default is not empty:
+                    value = default
+                else:
+                    continue
+                if not isinstance(value, expected_type):
+                    raise TypeError(
+                        f"Argument '{arg_name}' must be {expected_type.__name__}, "
+                        f"got {type(value).__name__}"
+                    )
             
             return func(*args, **kwargs)
         return wrapper
@@ -165,6 +261,79 @@ def greet(name: str, greeting: str = "Hello") -> str:
     return f"{greeting}, {name}!"
 
 
+def _legacy_memoize(func: Callable) -> Callable:
+    """Previous memoize (string keys, print per hit) for the benchmark."""
+    cache = {}
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = str(args) + str(kwargs)
+        if key not in cache:
+            cache[key] = func(*args, **kwargs)
+        else:
+            print(f"Cache hit for {func.__name__}")
+        return cache[key]
+    return wrapper
+
+
+def _legacy_validate_types(**type_kwargs):
+    """Previous validate_types (signature bound on every call) for the benchmark."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound_args = inspect.signature(func).bind(*args, **kwargs)
+            bound_args.apply_defaults()
+            for arg_name, expected_type in type_kwargs.items():
+                if arg_name in bound_args.arguments:
+                    value = bound_args.arguments[arg_name]
+                    if not isinstance(value, expected_type):
+                        raise TypeError(f"Argument '{arg_name}' must be {expected_type.__name__}")
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def benchmark_overhead(calls: int = 200_000):
+    """
+    Measure the per-call overhead of the decorators, before and after.
+    
+    Args:
+        calls: Calls per measurement
+    """
+    def plain(x, y=1):
+        return x
+    
+    def per_call_ns(func, *args) -> float:
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter_ns()
+            for _ in range(calls):
+                func(*args)
+            best = min(best, time.perf_counter_ns() - start)
+        return best / calls
+    
+    baseline = per_call_ns(plain, 5)
+    cases = [
+        ("validate_types", _legacy_validate_types(x=int, y=int)(plain),
+         validate_types(x=int, y=int)(plain)),
+        ("memoize (hit)", _legacy_memoize(plain), memoize(plain)),
+        ("memoize maxsize=128 (hit)", None, memoize(maxsize=128)(plain)),
+        ("memoize typed=True (hit)", None, memoize(typed=True)(plain)),
+    ]
+    print(f"Overhead per call over an undecorated call ({baseline:.0f} ns):")
+    print(f"  {'decorator':28} {'before':>10} {'after':>10}")
+    rows = []
+    # The old memoize prints on every hit
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, before, after in cases:
+            before_ns = per_call_ns(before, 5) - baseline if before else None
+            after_ns = per_call_ns(after, 5) - baseline
+            rows.append((label, before_ns, after_ns))
+    for label, before_ns, after_ns in rows:
+        before_text = f"{before_ns:8.0f}ns" if before_ns is not None else f"{'-':>10}"
+        print(f"  {label:28} {before_text} {after_ns:8.0f}ns")
+
+
 def main():
     """Main function to demonstrate decorators."""
     print("Decorator Framework Demo")
@@ -175,6 +344,7 @@ def main():
     print(f"Result: {result}")
     print("Calling again (should be cached):")
     result = fibonacci(10)
+    print(f"Cache info: {fibonacci.__wrapped__.cache_info()}")
     
     # Type validation
     print("\n2. Type Validation Decorator:")
@@ -188,6 +358,10 @@ def main():
     print("\n3. Log Calls Decorator:")
     greet("Alice")
     greet("Bob", greeting="Hi")
+    
+    if '--benchmark' in sys.argv:
+        print("\n4. Decorator Overhead:")
+        benchmark_overhead()
 
 
 if __name__ == "__main__":
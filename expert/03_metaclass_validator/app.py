@@ -4,7 +4,10 @@ Metaclass Validator Script
 Data validation using metaclasses and descriptors.
 """
 
-from typing import Any, Type
+import sys
+import time
+from operator import attrgetter
+from typing import Any, Dict, Type
 
 
 class TypedProperty:
@@ -30,12 +33,32 @@ class TypedProperty:
     
     def __set__(self, instance, value):
         """Set property value with type validation."""
+        self.validate(value)
+        setattr(instance, self.data_name, value)
+    
+    def validate(self, value):
+        """Raise TypeError if value has the wrong type."""
         if not isinstance(value, self.expected_type):
             raise TypeError(
                 f"{self.name} must be {self.expected_type.__name__}, "
                 f"got {type(value).__name__}"
             )
-        setattr(instance, self.data_name, value)
+    
+    def condition(self, var: str, env: Dict[str, Any]) -> str:
+        """
+        Python expression that is true when `var` is valid.
+        
+        Used by ValidatorMeta to inline the check into generated code.
+        
+        Args:
+            var: Variable name holding the value
+            env: Globals of the generated code (names are added here)
+        
+        Returns:
+            str: Expression source
+        """
+        env[f'_type_{self.name}'] = self.expected_type
+        return f"isinstance({var}, _type_{self.name})"
 
 
 class RangeValidator:
@@ -63,6 +86,11 @@ class RangeValidator:
     
     def __set__(self, instance, value):
         """Set property value with range validation."""
+        self.validate(value)
+        setattr(instance, self.data_name, value)
+    
+    def validate(self, value):
+        """Raise TypeError or ValueError if value is not a number in range."""
         if not isinstance(value, (int, float)):
             raise TypeError(f"{self.name} must be a number")
         
@@ -71,12 +99,98 @@ class RangeValidator:
         
         if self.max_value is not None and value > self.max_value:
             raise ValueError(f"{self.name} must be <= {self.max_value}")
+    
+    def condition(self, var: str, env: Dict[str, Any]) -> str:
+        """
+        Python expression that is true when `var` is valid.
         
-        setattr(instance, self.data_name, value)
+        Args:
+            var: Variable name holding the value
+            env: Globals of the generated code (names are added here)
+        
+        Returns:
+            str: Expression source
+        """
+        parts = [f"isinstance({var}, _number)"]
+        env['_number'] = (int, float)
+        if self.min_value is not None:
+            env[f'_min_{self.name}'] = self.min_value
+            parts.append(f"not {var} < _min_{self.name}")
+        if self.max_value is not None:
+            env[f'_max_{self.name}'] = self.max_value
+            parts.append(f"not {var} > _max_{self.name}")
+        return " and ".join(parts)
+
+
+def _make_setter(validator) -> Any:
+    """Build a property setter that validates and stores in the slot."""
+    env = {'_validate': validator.validate}
+    source = (
+        f"def _set(self, value):\n"
+        f"    if not ({validator.condition('value', env)}):\n"
+        f"        _validate(value)\n"
+        f"    self.{validator.data_name} = value\n"
+    )
+    exec(source, env)
+    return env['_set']
+
+
+def _make_init(cls_name: str, validators: Dict[str, Any]) -> Any:
+    """
+    Generate an __init__ that validates all fields in one pass.
+    
+    For a class with fields name and price the generated source is::
+    
+        def __init__(self, name, price, *, validate=True):
+            if validate:
+                if not (isinstance(name, _type_name)):
+                    _validate_name(name)
+                if not (isinstance(price, _number) and not price < _min_price):
+                    _validate_price(price)
+            self._name = name
+            self._price = price
+    
+    The inlined conditions only decide whether a value is valid; the
+    validator's own validate() raises the error, so messages are the same
+    as for attribute assignment.
+    
+    Args:
+        cls_name: Class name (for the function's qualified name)
+        validators: Field name -> validator, in field order
+    
+    Returns:
+        The __init__ function
+    """
+    env: Dict[str, Any] = {}
+    args = ", ".join(validators)
+    lines = [f"def __init__(self, {args}{', ' if args else ''}*, validate=True):"]
+    if validators:
+        lines.append("    if validate:")
+        for field_name, validator in validators.items():
+            env[f'_validate_{field_name}'] = validator.validate
+            lines.append(f"        if not ({validator.condition(field_name, env)}):")
+            lines.append(f"            _validate_{field_name}({field_name})")
+    for field_name, validator in validators.items():
+        lines.append(f"    self.{validator.data_name} = {field_name}")
+    if not validators:
+        lines.append("    pass")
+    exec("\n".join(lines) + "\n", env)
+    init = env['__init__']
+    init.__qualname__ = f"{cls_name}.__init__"
+    return init
 
 
 class ValidatorMeta(type):
-    """Metaclass that automatically creates validators for annotated fields."""
+    """
+    Metaclass that automatically creates validators for annotated fields.
+    
+    Values are stored in `__slots__` (as `_<field>`) and exposed through
+    properties: reads are a C-level slot lookup and assignments run the
+    field's validator. Unless the class defines its own `__init__`, a
+    specialised one is generated that takes the fields in annotation
+    order and validates them all inline; `validate=False` skips the
+    checks for trusted bulk loads.
+    """
     
     def __new__(mcs, name, bases, namespace, **kwargs):
         """
@@ -96,7 +210,13 @@ class ValidatorMeta(type):
         # Get validation rules
         validators = namespace.get('__validators__', {})
         
-        # Create descriptors for annotated fields
+        # Fields of ValidatorMeta base classes come first
+        fields: Dict[str, Any] = {}
+        for base in reversed(bases):
+            fields.update(getattr(base, '_fields', {}))
+        
+        # Create validators for annotated fields
+        own_fields = {}
         for field_name, field_type in annotations.items():
             if field_name.startswith('_'):
                 continue
@@ -106,16 +226,28 @@ class ValidatorMeta(type):
                 validator_config = validators[field_name]
                 
                 if 'min' in validator_config or 'max' in validator_config:
-                    namespace[field_name] = RangeValidator(
+                    validator = RangeValidator(
                         field_name,
                         validator_config.get('min'),
                         validator_config.get('max')
                     )
                 else:
-                    namespace[field_name] = TypedProperty(field_name, field_type)
+                    validator = TypedProperty(field_name, field_type)
             else:
                 # Use type validation by default
-                namespace[field_name] = TypedProperty(field_name, field_type)
+                validator = TypedProperty(field_name, field_type)
+            
+            own_fields[field_name] = validator
+            namespace[field_name] = property(
+                attrgetter(validator.data_name), _make_setter(validator),
+                doc=f"Validated field {field_name!r}"
+            )
+        
+        fields.update(own_fields)
+        namespace['_fields'] = fields
+        namespace.setdefault('__slots__', tuple(v.data_name for v in own_fields.values()))
+        if '__init__' not in namespace:
+            namespace['__init__'] = _make_init(name, fields)
         
         return super().__new__(mcs, name, bases, namespace)
 
@@ -131,19 +263,6 @@ class Person(metaclass=ValidatorMeta):
         'age': {'min': 0, 'max': 150}
     }
     
-    def __init__(self, name: str, age: int, email: str):
-        """
-        Initialize person.
-        
-        Args:
-            name: Person's name
-            age: Person's age
-            email: Person's email
-        """
-        self.name = name
-        self.age = age
-        self.email = email
-    
     def __repr__(self):
         """String representation."""
         return f"Person(name={self.name!r}, age={self.age}, email={self.email!r})"
@@ -161,15 +280,71 @@ class Product(metaclass=ValidatorMeta):
         'quantity': {'min': 0}
     }
     
+    def __repr__(self):
+        """String representation."""
+        return f"Product(name={self.name!r}, price={self.price}, quantity={self.quantity})"
+
+
+class PlainProduct:
+    """Product without validation (benchmark reference)."""
+    
+    __slots__ = ('name', 'price', 'quantity')
+    
     def __init__(self, name: str, price: float, quantity: int):
-        """Initialize product."""
         self.name = name
         self.price = price
         self.quantity = quantity
+
+
+class DescriptorProduct:
+    """Product validated by per-attribute descriptors (benchmark reference)."""
     
-    def __repr__(self):
-        """String representation."""
-        return f"Product(name={self.name!r}, price={self.price}, quantity={self.quantity})"
+    name = TypedProperty('name', str)
+    price = RangeValidator('price', 0.0)
+    quantity = RangeValidator('quantity', 0)
+    
+    def __init__(self, name: str, price: float, quantity: int):
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+
+def benchmark_construction(count: int = 1_000_000, repeat: int = 3):
+    """
+    Compare construction throughput and attribute reads.
+    
+    Args:
+        count: Objects to construct per round
+        repeat: Rounds (the best one is reported)
+    """
+    rows = [(f"item{i % 100}", float(i % 1000), i % 50) for i in range(count)]
+    
+    def best(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+    
+    cases = [
+        ("plain class (__slots__)", lambda: [PlainProduct(*row) for row in rows]),
+        ("descriptors", lambda: [DescriptorProduct(*row) for row in rows]),
+        ("ValidatorMeta", lambda: [Product(*row) for row in rows]),
+        ("ValidatorMeta validate=False",
+         lambda: [Product(*row, validate=False) for row in rows]),
+    ]
+    print(f"Constructing {count:,} products (best of {repeat}):")
+    for label, func in cases:
+        seconds = best(func)
+        print(f"  {label:30} {seconds:7.3f}s  {count / seconds / 1e6:6.2f} M objects/s")
+    
+    print(f"\nReading .price {count:,} times:")
+    for label, obj in (("plain class (__slots__)", PlainProduct(*rows[0])),
+                       ("descriptors", DescriptorProduct(*rows[0])),
+                       ("ValidatorMeta", Product(*rows[0]))):
+        seconds = best(lambda: [obj.price for _ in rows])
+        print(f"  {label:30} {seconds:7.3f}s")
 
 
 def main():
@@ -213,6 +388,20 @@ def main():
     product.quantity = 50
     print(f"  {person}")
     print(f"  {product}")
+    
+    # Constructor validation and trusted bulk loads
+    print("\n7. Constructor validation:")
+    try:
+        Product("Gadget", 5.0, -1)  # Should fail
+    except ValueError as e:
+        print(f"  Error caught: {e}")
+    rows = [("Bolt", 0.1, 500), ("Nut", 0.05, 1000)]
+    products = [Product(*row, validate=False) for row in rows]
+    print(f"  Loaded {len(products)} trusted rows: {products[0]}")
+    
+    if '--benchmark' in sys.argv:
+        print("\n8. Construction Benchmark:")
+        benchmark_construction()
 
 
 if __name__ == "__main__":
@@ -4,12 +4,22 @@ Context Manager Script
 Custom context manager implementations using both class-based and decorator approaches.
 """
 
+import asyncio
+import inspect
+import sys
+import threading
 import time
-from contextlib import contextmanager
-from typing import Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import os
 
 
+# Marker for "use the pool's default timeout"
+_DEFAULT = object()
+
+
 class Timer:
     """Context manager to measure execution time."""
     
@@ -78,38 +88,56 @@ class FileManager:
 class DatabaseConnection:
     """Context manager simulating database connection."""
     
-    def __init__(self, db_name: str):
+    def __init__(self, db_name: str, connect_delay: float = 0.0, verbose: bool = True):
         """
         Initialize connection.
         
         Args:
             db_name: Database name
+            connect_delay: Simulated time to establish the connection (seconds)
+            verbose: Print connection activity
         """
         self.db_name = db_name
+        self.connect_delay = connect_delay
+        self.verbose = verbose
         self.connected = False
     
-    def __enter__(self):
+    def connect(self) -> 'DatabaseConnection':
         """Establish connection."""
-        print(f"Connecting to {self.db_name}...")
+        if self.verbose:
+            print(f"Connecting to {self.db_name}...")
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
         self.connected = True
         return self
     
+    def close(self):
+        """Close connection."""
+        if self.verbose:
+            print(f"Closing connection to {self.db_name}")
+        self.connected = False
+    
+    def __enter__(self):
+        """Establish connection."""
+        return self.connect()
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close connection and handle transactions."""
-        if exc_type is None:
-            print(f"Committing transaction to {self.db_name}")
-        else:
-            print(f"Rolling back transaction to {self.db_name}")
+        if self.verbose:
+            if exc_type is None:
+                print(f"Committing transaction to {self.db_name}")
+            else:
+                print(f"Rolling back transaction to {self.db_name}")
         
-        print(f"Closing connection to {self.db_name}")
-        self.connected = False
+        self.close()
         return False
     
     def execute(self, query: str):
         """Execute a query."""
         if not self.connected:
             raise RuntimeError("Not connected to database")
-        print(f"Executing: {query}")
+        if self.verbose:
+            print(f"Executing: {query}")
         return f"Result for: {query}"
 
 
@@ -150,32 +178,522 @@ def suppress_output():
         sys.stdout = old_stdout
 
 
-class ResourcePool:
-    """Context manager for resource pool with cleanup."""
+class PoolTimeout(TimeoutError):
+    """Raised when no resource becomes available within the timeout."""
+
+
+class PoolStats:
+    """Wait-time and utilisation metrics of a resource pool."""
+    
+    def __init__(self):
+        """Initialize counters."""
+        self.created = 0
+        self.closed = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.evicted = 0
+        self.failed_health_checks = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._busy_time = 0.0
+        self._started = self._last_change = time.monotonic()
+    
+    def change_in_use(self, delta: int):
+        """Adjust the number of checked-out resources, integrating busy time."""
+        now = time.monotonic()
+        self._busy_time += self.in_use * (now - self._last_change)
+        self._last_change = now
+        self.in_use += delta
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+    
+    def record_checkout(self, wait: float, waited: bool):
+        """Record a successful checkout and how long it waited."""
+        self.checkouts += 1
+        self.waits += waited
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.change_in_use(1)
+    
+    def snapshot(self, max_size: int, size: int, idle: int) -> Dict[str, Any]:
+        """
+        Get current metrics.
+        
+        Args:
+            max_size: Pool capacity
+            size: Resources currently open
+            idle: Resources currently idle
+        
+        Returns:
+            Dict[str, Any]: Counters plus average wait and utilisation
+        """
+        self.change_in_use(0)
+        elapsed = self._last_change - self._started
+        return {
+            'size': size,
+            'idle': idle,
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+            'created': self.created,
+            'closed': self.closed,
+            'checkouts': self.checkouts,
+            'waits': self.waits,
+            'timeouts': self.timeouts,
+            'evicted': self.evicted,
+            'failed_health_checks': self.failed_health_checks,
+            'avg_wait_ms': self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+            'max_wait_ms': self.max_wait * 1000,
+            # Time-averaged share of the capacity that was checked out
+            'utilisation': self._busy_time / (elapsed * max_size) if elapsed else 0.0
+        }
+
+
+class _PoolBase:
+    """State and bookkeeping shared by the thread and asyncio pools."""
+    
+    def __init__(self, factory: Callable[[], Any], max_size: int = 10,
+                 timeout: Optional[float] = None, max_idle: Optional[float] = None,
+                 health_check: Optional[Callable[[Any], Any]] = None,
+                 close: Optional[Callable[[Any], Any]] = None):
+        """
+        Initialize pool.
+        
+        Args:
+            factory: Creates a new resource (called lazily, at most max_size open)
+            max_size: Maximum number of open resources
+            timeout: Default seconds to wait in checkout (None = wait forever)
+            max_idle: Close resources idle longer than this (None = keep)
+            health_check: Returns False (or raises) for a resource that must be replaced
+            close: Closes a resource (default: its close() method, if any)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self.close_resource = close or (lambda resource: getattr(resource, 'close', lambda: None)())
+        self._idle: deque = deque()  # (resource, released_at); newest on the right
+        self._size = 0
+        self._closed = False
+        self._stats = PoolStats()
+    
+    def _take_expired(self, now: float) -> List[Any]:
+        """Remove resources idle longer than max_idle (oldest are on the left)."""
+        expired = []
+        if self.max_idle is not None:
+            while self._idle and now - self._idle[0][1] > self.max_idle:
+                expired.append(self._idle.popleft()[0])
+            self._size -= len(expired)
+            self._stats.evicted += len(expired)
+        return expired
+    
+    def _reserve(self, start: float, waited: bool) -> Tuple[Any, bool]:
+        """
+        Take an idle resource or a slot for a new one (lock held).
+        
+        Returns:
+            Tuple[Any, bool]: (resource or None, True if a slot was reserved);
+            (None, False) if the caller has to wait
+        """
+        if self._closed:
+            raise RuntimeError("Pool is closed")
+        if self._idle:
+            resource, _ = self._idle.pop()
+        elif self._size < self.max_size:
+            self._size += 1
+            resource = None
+        else:
+            return None, False
+        self._stats.record_checkout(time.monotonic() - start, waited)
+        return resource, resource is None
+    
+    def _discard(self):
+        """Forget a resource or reserved slot (lock held)."""
+        self._size -= 1
+        self._stats.change_in_use(-1)
+    
+    def _put_back(self, resource: Any):
+        """Return a resource to the idle list (lock held)."""
+        self._stats.change_in_use(-1)
+        self._idle.append((resource, time.monotonic()))
+    
+    def _deadline(self, timeout) -> Optional[float]:
+        """Absolute deadline for a checkout."""
+        timeout = self.timeout if timeout is _DEFAULT else timeout
+        return None if timeout is None else time.monotonic() + timeout
+    
+    def _timed_out(self) -> PoolTimeout:
+        """Count a timeout and build the exception."""
+        self._stats.timeouts += 1
+        return PoolTimeout(f"No resource available within the timeout "
+                           f"({self.max_size} of {self.max_size} in use)")
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool metrics (see PoolStats.snapshot)."""
+        return self._stats.snapshot(self.max_size, self._size, len(self._idle))
+
+
+class ResourcePool(_PoolBase):
+    """
+    Thread-safe pool of reusable resources.
+    
+    Resources are created lazily up to max_size and handed out most
+    recently used first, so surplus resources age and are closed once
+    they have been idle longer than max_idle. A checkout runs the health
+    check and replaces resources that fail it. When all resources are in
+    use, checkout blocks (optionally with a timeout).
+    
+    Example:
+        with ResourcePool(connect, max_size=4) as pool:
+            with pool.acquire() as conn:
+                conn.execute("SELECT 1")
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize pool (see _PoolBase for the arguments)."""
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+    
+    def checkout(self, timeout=_DEFAULT) -> Any:
+        """
+        Take a resource out of the pool.
+        
+        Args:
+            timeout: Seconds to wait (default: the pool's timeout, None = forever)
+        
+        Returns:
+            Any: A healthy resource; hand it back with release()
+        
+        Raises:
+            PoolTimeout: If no resource became available in time
+        """
+        start = time.monotonic()
+        deadline = self._deadline(timeout)
+        waited = False
+        while True:
+            with self._cond:
+                while True:
+                    expired = self._take_expired(time.monotonic())
+                    resource, reserved = self._reserve(start, waited)
+                    if resource is not None or reserved:
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise self._timed_out()
+                    waited = True
+                    self._cond.wait(remaining)
+            self._close_all(expired)
+            
+            if reserved:
+                try:
+                    resource = self.factory()
+                except BaseException:
+                    with self._cond:
+                        self._discard()
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats.created += 1
+                return resource
+            
+            try:
+                healthy = self.health_check is None or self.health_check(resource)
+            except BaseException:
+                self._reject(resource)
+                raise
+            if healthy:
+                return resource
+            self._reject(resource)
+    
+    def _reject(self, resource: Any):
+        """Close a resource that failed its health check."""
+        with self._cond:
+            self._stats.failed_health_checks += 1
+        self.release(resource, discard=True)
+    
+    def release(self, resource: Any, discard: bool = False):
+        """
+        Hand a resource back to the pool.
+        
+        Args:
+            resource: Resource from checkout()
+            discard: Close it instead of reusing it (e.g. after an error)
+        """
+        with self._cond:
+            if discard or self._closed:
+                self._discard()
+            else:
+                self._put_back(resource)
+            self._cond.notify()
+        if discard or self._closed:
+            self._close_all([resource])
     
-    def __init__(self, resources: list):
+    @contextmanager
+    def acquire(self, timeout=_DEFAULT):
         """
-        Initialize resource pool.
+        Check out a resource for the duration of a with block.
         
         Args:
-            resources: List of resources to manage
+            timeout: Seconds to wait (default: the pool's timeout)
+        
+        Yields:
+            A resource, released when the block exits
         """
-        self.resources = resources
-        self.acquired = []
+        resource = self.checkout(timeout)
+        try:
+            yield resource
+        finally:
+            self.release(resource)
+    
+    def evict_idle(self) -> int:
+        """Close resources idle longer than max_idle; returns how many."""
+        with self._cond:
+            expired = self._take_expired(time.monotonic())
+        self._close_all(expired)
+        return len(expired)
+    
+    def close(self):
+        """Close idle resources; resources in use are closed on release."""
+        with self._cond:
+            self._closed = True
+            expired = [resource for resource, _ in self._idle]
+            self._size -= len(expired)
+            self._idle.clear()
+            self._cond.notify_all()
+        self._close_all(expired)
+    
+    def _close_all(self, resources: List[Any]):
+        """Close resources (outside the lock, counting each under it)."""
+        for resource in resources:
+            self.close_resource(resource)
+            with self._cond:
+                self._stats.closed += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get pool metrics, taken consistently under the pool lock."""
+        with self._cond:
+            return super().stats()
     
     def __enter__(self):
-        """Acquire all resources."""
-        print(f"Acquiring {len(self.resources)} resources...")
-        self.acquired = self.resources.copy()
-        return self.acquired
+        """Use the pool in a with block."""
+        return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Release all resources."""
-        print(f"Releasing {len(self.acquired)} resources...")
-        self.acquired.clear()
+        """Close the pool."""
+        self.close()
         return False
 
 
+async def _maybe_await(value):
+    """Await value if it is awaitable (factory, check and close may be sync or async)."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncResourcePool(_PoolBase):
+    """
+    asyncio variant of ResourcePool.
+    
+    factory, health_check and close may be plain functions or coroutine
+    functions. All methods must be used from one event loop.
+    
+    Example:
+        async with AsyncResourcePool(connect, max_size=4) as pool:
+            async with pool.acquire() as conn:
+                await conn.execute("SELECT 1")
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize pool (see _PoolBase for the arguments)."""
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition()
+    
+    async def checkout(self, timeout=_DEFAULT) -> Any:
+        """
+        Take a resource out of the pool.
+        
+        Args:
+            timeout: Seconds to wait (default: the pool's timeout, None = forever)
+        
+        Returns:
+            Any: A healthy resource; hand it back with release()
+        
+        Raises:
+            PoolTimeout: If no resource became available in time
+        """
+        start = time.monotonic()
+        deadline = self._deadline(timeout)
+        waited = False
+        while True:
+            async with self._cond:
+                while True:
+                    expired = self._take_expired(time.monotonic())
+                    resource, reserved = self._reserve(start, waited)
+                    if resource is not None or reserved:
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise self._timed_out()
+                    waited = True
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            await self._close_all(expired)
+            
+            if reserved:
+                try:
+                    resource = await _maybe_await(self.factory())
+                except BaseException:
+                    async with self._cond:
+                        self._discard()
+                        self._cond.notify()
+                    raise
+                self._stats.created += 1
+                return resource
+            
+            try:
+                healthy = (self.health_check is None
+                           or await _maybe_await(self.health_check(resource)))
+            except BaseException:
+                self._stats.failed_health_checks += 1
+                await self.release(resource, discard=True)
+                raise
+            if healthy:
+                return resource
+            self._stats.failed_health_checks += 1
+            await self.release(resource, discard=True)
+    
+    async def release(self, resource: Any, discard: bool = False):
+        """
+        Hand a resource back to the pool.
+        
+        Args:
+            resource: Resource from checkout()
+            discard: Close it instead of reusing it
+        """
+        async with self._cond:
+            if discard or self._closed:
+                self._discard()
+            else:
+                self._put_back(resource)
+            self._cond.notify()
+        if discard or self._closed:
+            await self._close_all([resource])
+    
+    @asynccontextmanager
+    async def acquire(self, timeout=_DEFAULT):
+        """
+        Check out a resource for the duration of an async with block.
+        
+        Args:
+            timeout: Seconds to wait (default: the pool's timeout)
+        
+        Yields:
+            A resource, released when the block exits
+        """
+        resource = await self.checkout(timeout)
+        try:
+            yield resource
+        finally:
+            await self.release(resource)
+    
+    async def evict_idle(self) -> int:
+        """Close resources idle longer than max_idle; returns how many."""
+        async with self._cond:
+            expired = self._take_expired(time.monotonic())
+        await self._close_all(expired)
+        return len(expired)
+    
+    async def close(self):
+        """Close idle resources; resources in use are closed on release."""
+        async with self._cond:
+            self._closed = True
+            expired = [resource for resource, _ in self._idle]
+            self._size -= len(expired)
+            self._idle.clear()
+            self._cond.notify_all()
+        await self._close_all(expired)
+    
+    async def _close_all(self, resources: List[Any]):
+        """Close resources (outside the lock)."""
+        for resource in resources:
+            await _maybe_await(self.close_resource(resource))
+            self._stats.closed += 1
+    
+    async def __aenter__(self):
+        """Use the pool in an async with block."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the pool."""
+        await self.close()
+        return False
+
+
+def benchmark_pool(operations: int = 400, threads: int = 8, pool_size: int = 4,
+                   connect_delay: float = 0.005):
+    """
+    Compare a fresh DatabaseConnection per operation with a pooled one.
+    
+    Args:
+        operations: Queries to run in total
+        threads: Concurrent worker threads
+        pool_size: Pool capacity
+        connect_delay: Simulated connection setup time (seconds)
+    """
+    def connect() -> DatabaseConnection:
+        return DatabaseConnection("bench_db", connect_delay, verbose=False).connect()
+    
+    def fresh(i: int):
+        with DatabaseConnection("bench_db", connect_delay, verbose=False) as db:
+            return db.execute(f"SELECT {i}")
+    
+    def pooled(i: int):
+        with pool.acquire() as db:
+            return db.execute(f"SELECT {i}")
+    
+    def run(label: str, operation: Callable[[int], str]):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(operation, range(operations)))
+        elapsed = time.perf_counter() - start
+        print(f"  {label:22} {elapsed:7.3f}s  {operations / elapsed:8.0f} ops/s")
+    
+    print(f"{operations} queries on {threads} threads, "
+          f"{connect_delay * 1000:.0f} ms connection setup:")
+    run("fresh connection", fresh)
+    with ResourcePool(connect, max_size=pool_size,
+                      health_check=lambda db: db.connected) as pool:
+        run(f"pool (max_size={pool_size})", pooled)
+        stats = pool.stats()
+    print(f"  pool: created {stats['created']}, checkouts {stats['checkouts']}, "
+          f"waits {stats['waits']}, avg wait {stats['avg_wait_ms']:.2f} ms, "
+          f"max wait {stats['max_wait_ms']:.2f} ms, "
+          f"utilisation {stats['utilisation']:.0%}")
+
+
+async def _async_pool_demo():
+    """Share two connections between five concurrent tasks."""
+    async def query(pool: AsyncResourcePool, i: int) -> str:
+        async with pool.acquire() as db:
+            await asyncio.sleep(0.01)
+            return db.execute(f"SELECT {i}")
+    
+    async with AsyncResourcePool(
+            lambda: DatabaseConnection("async_db", verbose=False).connect(),
+            max_size=2) as pool:
+        results = await asyncio.gather(*(query(pool, i) for i in range(5)))
+        stats = pool.stats()
+    print(f"  {len(results)} tasks, {stats['created']} connections, "
+          f"{stats['waits']} waited for a connection")
+
+
 def main():
     """Main function to demonstrate context managers."""
     print("Context Manager Demo")
@@ -207,8 +725,16 @@ def main():
     
     # Resource pool
     print("\n5. Resource Pool Context Manager:")
-    with ResourcePool(["resource1", "resource2", "resource3"]) as resources:
-        print(f"  Using resources: {resources}")
+    with ResourcePool(lambda: DatabaseConnection("pool_db").connect(), max_size=2,
+                      health_check=lambda db: db.connected) as pool:
+        for i in range(3):
+            with pool.acquire() as db:
+                db.execute(f"SELECT {i}")
+        stats = pool.stats()
+        print(f"  {stats['checkouts']} checkouts, {stats['created']} connection(s) created")
+    
+    print("\n   Async Resource Pool:")
+    asyncio.run(_async_pool_demo())
     
     print("\n6. Error Handling:")
     try:
@@ -217,6 +743,10 @@ def main():
             raise ValueError("Simulated error")
     except ValueError:
         print("  Error was caught outside context manager")
+    
+    if '--benchmark' in sys.argv:
+        print("\n7. Connection Pool Benchmark:")
+        benchmark_pool()
 
 
 if __name__ == "__main__":
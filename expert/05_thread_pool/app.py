@@ -4,70 +4,158 @@ Thread Pool Script
 Multi-threaded task executor with thread pool management.
 """
 
+import functools
+import itertools
+import os
+import sys
 import threading
-import queue
 import time
-from typing import Callable, Any, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Any, Dict, Iterable, Iterator, List, Optional
+from concurrent.futures import (FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DEFAULT_CHUNKSIZE = 256
 
 
 class SimpleThreadPool:
-    """Simple thread pool implementation."""
+    """
+    Work-stealing thread pool that returns a future for every task.
+    
+    Each worker owns a deque; submissions are spread round-robin and an
+    idle worker steals from the opposite end of its neighbours' deques.
+    At most `max_queue_size` tasks wait at once, so producers block
+    instead of growing memory without limit.
+    """
     
-    def __init__(self, num_threads: int = 4):
+    def __init__(self, num_threads: int = 4, max_queue_size: int = 1024):
         """
         Initialize thread pool.
         
         Args:
             num_threads: Number of worker threads
+            max_queue_size: Maximum number of queued tasks before submit() blocks
         """
         self.num_threads = num_threads
-        self.task_queue = queue.Queue()
-        self.results = []
         self.threads = []
-        self.stop_event = threading.Event()
+        self._deques = [deque() for _ in range(num_threads)]
+        self._next_deque = itertools.cycle(range(num_threads))
+        self._slots = threading.Semaphore(max_queue_size)
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+        self._pending = 0
+        self._unfinished = 0
+        self._shutdown = False
     
-    def worker(self):
-        """Worker thread function."""
-        while not self.stop_event.is_set():
+    def _take_task(self, index: int):
+        """Pop a task from the worker's own deque or steal one from another."""
+        try:
+            return self._deques[index].popleft()
+        except IndexError:
+            pass
+        for offset in range(1, self.num_threads):
             try:
-                task, args, kwargs = self.task_queue.get(timeout=0.1)
-                result = task(*args, **kwargs)
-                self.results.append(result)
-                self.task_queue.task_done()
-            except queue.Empty:
+                return self._deques[(index + offset) % self.num_threads].pop()
+            except IndexError:
                 continue
-            except Exception as e:
-                print(f"Error in worker: {e}")
-                self.task_queue.task_done()
+        return None
+    
+    def worker(self, index: int):
+        """Worker thread function."""
+        while True:
+            with self._lock:
+                while self._pending == 0 and not self._shutdown:
+                    self._work_available.wait()
+                if self._pending == 0:
+                    return
+            
+            item = self._take_task(index)
+            if item is None:
+                # Another worker took it first; re-check the pending count
+                continue
+            
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+            
+            future, task, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(task(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            
+            with self._lock:
+                self._unfinished -= 1
+                if self._unfinished == 0:
+                    self._all_done.notify_all()
     
     def start(self):
         """Start worker threads."""
-        for _ in range(self.num_threads):
-            thread = threading.Thread(target=self.worker, daemon=True)
+        for index in range(self.num_threads):
+            thread = threading.Thread(target=self.worker, args=(index,), daemon=True)
             thread.start()
             self.threads.append(thread)
     
-    def submit(self, task: Callable, *args, **kwargs):
+    def submit(self, task: Callable, *args, **kwargs) -> Future:
         """
-        Submit a task to the pool.
+        Submit a task to the pool, blocking while the queue is full.
         
         Args:
             task: Function to execute
             *args: Positional arguments
             **kwargs: Keyword arguments
+        
+        Returns:
+            Future: Resolves to the task's return value or exception
         """
-        self.task_queue.put((task, args, kwargs))
+        if self._shutdown:
+            raise RuntimeError('cannot submit after shutdown')
+        self._slots.acquire()
+        future = Future()
+        with self._lock:
+            # Checked again under the lock: once shutdown() has set the flag,
+            # workers may exit as soon as the deques are empty
+            if self._shutdown:
+                self._slots.release()
+                raise RuntimeError('cannot submit after shutdown')
+            self._deques[next(self._next_deque)].append((future, task, args, kwargs))
+            self._pending += 1
+            self._unfinished += 1
+            self._work_available.notify()
+        return future
     
     def wait_completion(self):
         """Wait for all tasks to complete."""
-        self.task_queue.join()
+        with self._lock:
+            while self._unfinished:
+                self._all_done.wait()
     
     def shutdown(self):
-        """Shutdown the thread pool."""
-        self.stop_event.set()
+        """Shutdown the thread pool after queued tasks have run."""
+        with self._lock:
+            self._shutdown = True
+            self._work_available.notify_all()
         for thread in self.threads:
             thread.join()
+    
+    def __enter__(self):
+        """Start the pool when used as a context manager."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Shutdown the pool on exit."""
+        self.shutdown()
+        return False
 
 
 def process_item(item: Any, delay: float = 0.1) -> dict:
@@ -91,50 +179,234 @@ def process_item(item: Any, delay: float = 0.1) -> dict:
     }
 
 
-def parallel_map(func: Callable, items: List, max_workers: int = 4) -> List:
+def auto_chunksize(num_items: int, max_workers: int) -> int:
+    """
+    Pick a chunk size that gives each worker about four chunks.
+    
+    Args:
+        num_items: Number of items to process
+        max_workers: Number of workers
+    
+    Returns:
+        int: Items per chunk (at least 1)
+    """
+    chunksize, extra = divmod(num_items, max_workers * 4)
+    return max(1, chunksize + (1 if extra else 0))
+
+
+def _run_chunk(func: Callable, chunk: List) -> List:
+    """Apply func to every item of a chunk inside a worker."""
+    return [func(item) for item in chunk]
+
+
+def _call_catching(func: Callable, item: Any) -> tuple:
+    """Return (True, func(item)) or (False, exception) so one item cannot fail its chunk."""
+    try:
+        return True, func(item)
+    except Exception as e:
+        return False, e
+
+
+def _run_shared_chunk(func: Callable, shm_name: str, shape: tuple, dtype: str,
+                      start: int, stop: int) -> List:
+    """
+    Apply func to a slice of a NumPy array living in shared memory.
+    
+    The slice is copied out first: results such as rows of a 2-D array are
+    views, and a view still pointing into the segment would make close()
+    fail and could not be pickled back after it.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        chunk = array[start:stop].copy()
+        del array
+    finally:
+        shm.close()
+    return [func(item) for item in chunk]
+
+
+def _make_executor(backend: str, max_workers: int) -> Executor:
+    """Create a thread or process executor."""
+    if backend == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if backend == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown backend: {backend!r} (use 'thread' or 'process')")
+
+
+def _chunk_jobs(func: Callable, items: Iterable, chunksize: int):
+    """Yield (callable, args) jobs for consecutive chunks of an iterable."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield _run_chunk, (func, chunk)
+
+
+def _shared_array_jobs(func: Callable, shm: 'shared_memory.SharedMemory',
+                       array: 'np.ndarray', chunksize: int):
+    """Yield jobs that each read one slice of a shared-memory array."""
+    for start in range(0, len(array), chunksize):
+        stop = min(start + chunksize, len(array))
+        yield _run_shared_chunk, (func, shm.name, array.shape, array.dtype.str, start, stop)
+
+
+def iparallel_map(func: Callable, items: Iterable, max_workers: int = 4,
+                  backend: str = 'thread', chunksize: Optional[int] = None,
+                  ordered: bool = True) -> Iterator:
+    """
+    Lazily apply function to items in parallel, yielding results.
+    
+    Input is consumed chunk by chunk and at most two chunks per worker are
+    in flight, so even a generator of 100M items is never materialised.
+    With backend='process', func must be picklable (a module-level
+    function) and NumPy arrays are passed to workers via shared memory
+    instead of being pickled chunk by chunk.
+    
+    Args:
+        func: Function to apply
+        items: Iterable of items to process
+        max_workers: Maximum number of workers
+        backend: 'thread' for I/O-bound or 'process' for CPU-bound work
+        chunksize: Items per task (auto-sized from len(items) if None)
+        ordered: Yield in input order (True) or completion order (False)
+    
+    Yields:
+        Results of func(item)
+    """
+    if chunksize is None:
+        if hasattr(items, '__len__'):
+            chunksize = auto_chunksize(len(items), max_workers)
+        else:
+            chunksize = DEFAULT_CHUNKSIZE
+    
+    shm = None
+    if backend == 'process' and np is not None and isinstance(items, np.ndarray):
+        items = np.ascontiguousarray(items)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, items.nbytes))
+        shared = np.ndarray(items.shape, dtype=items.dtype, buffer=shm.buf)
+        shared[:] = items
+        del shared
+        jobs = _shared_array_jobs(func, shm, items, chunksize)
+    else:
+        jobs = _chunk_jobs(func, items, chunksize)
+    
+    max_in_flight = max_workers * 2
+    try:
+        with _make_executor(backend, max_workers) as executor:
+            in_flight = deque()
+            for job, args in itertools.islice(jobs, max_in_flight):
+                in_flight.append(executor.submit(job, *args))
+            
+            while in_flight:
+                if ordered:
+                    done = [in_flight.popleft()]
+                else:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    done = [f for f in in_flight if f in finished]
+                    for future in done:
+                        in_flight.remove(future)
+                
+                for future in done:
+                    for job, args in itertools.islice(jobs, 1):
+                        in_flight.append(executor.submit(job, *args))
+                    yield from future.result()
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+
+def parallel_map(func: Callable, items: Iterable, max_workers: int = 4,
+                 backend: str = 'thread', chunksize: Optional[int] = None) -> List:
     """
-    Apply function to items in parallel using thread pool.
+    Apply function to items in parallel.
     
     Args:
         func: Function to apply
-        items: List of items to process
-        max_workers: Maximum number of worker threads
+        items: Iterable of items to process
+        max_workers: Maximum number of workers
+        backend: 'thread' for I/O-bound or 'process' for CPU-bound work
+        chunksize: Items per task (auto-sized if None)
     
     Returns:
         List: Results in order
     """
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(func, item) for item in items]
-        results = [future.result() for future in futures]
-    return results
+    return list(iparallel_map(func, items, max_workers, backend, chunksize, ordered=True))
 
 
-def parallel_map_unordered(func: Callable, items: List, max_workers: int = 4) -> List:
+def parallel_map_unordered(func: Callable, items: Iterable, max_workers: int = 4,
+                           backend: str = 'thread', chunksize: Optional[int] = None) -> List:
     """
     Apply function to items in parallel, returning results as completed.
     
     Args:
         func: Function to apply
-        items: List of items to process
-        max_workers: Maximum number of worker threads
+        items: Iterable of items to process
+        max_workers: Maximum number of workers
+        backend: 'thread' for I/O-bound or 'process' for CPU-bound work
+        chunksize: Items per task (auto-sized if None)
     
     Returns:
         List: Results in completion order
     """
     results = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(func, item): item for item in items}
-        
-        for future in as_completed(futures):
-            try:
-                result = future.result()
-                results.append(result)
-            except Exception as e:
-                print(f"Task raised exception: {e}")
+    for ok, result in iparallel_map(functools.partial(_call_catching, func), items,
+                                    max_workers, backend, chunksize, ordered=False):
+        if ok:
+            results.append(result)
+        else:
+            print(f"Task raised exception: {result}")
     
     return results
 
 
+def cpu_bound_task(n: int) -> int:
+    """
+    CPU-heavy pure-Python work used for scaling benchmarks.
+    
+    Args:
+        n: Loop size
+    
+    Returns:
+        int: Sum of squares below n
+    """
+    return sum(i * i for i in range(n))
+
+
+def benchmark_scaling(num_items: int = 2000, work: int = 20000,
+                      max_cores: Optional[int] = None) -> List[Dict]:
+    """
+    Measure process-pool speedup over a serial loop for growing core counts.
+    
+    Args:
+        num_items: Number of tasks
+        work: Loop size passed to cpu_bound_task()
+        max_cores: Highest worker count to try (defaults to os.cpu_count())
+    
+    Returns:
+        List[Dict]: Workers, seconds and speedup for each run
+    """
+    items = [work] * num_items
+    start = time.perf_counter()
+    expected = [cpu_bound_task(item) for item in items]
+    serial_time = time.perf_counter() - start
+    
+    rows = [{'workers': 0, 'time': serial_time, 'speedup': 1.0}]
+    workers = 1
+    max_cores = max_cores or os.cpu_count() or 1
+    while workers <= max_cores:
+        start = time.perf_counter()
+        results = parallel_map(cpu_bound_task, items, max_workers=workers, backend='process')
+        elapsed = time.perf_counter() - start
+        assert results == expected
+        rows.append({'workers': workers, 'time': elapsed, 'speedup': serial_time / elapsed})
+        workers *= 2
+    return rows
+
+
 class ThreadSafeCounter:
     """Thread-safe counter using locks."""
     
@@ -154,21 +426,54 @@ class ThreadSafeCounter:
             return self.value
 
 
+def _noop():
+    """Tiny task used to measure dispatch overhead."""
+    return None
+
+
+def benchmark_dispatch(num_tasks: int = 1_000_000, num_threads: int = 4) -> Dict:
+    """
+    Compare per-task dispatch overhead with ThreadPoolExecutor.
+    
+    Args:
+        num_tasks: Number of no-op tasks to submit
+        num_threads: Worker threads in each pool
+    
+    Returns:
+        dict: Total seconds and microseconds per task for both pools
+    """
+    start = time.perf_counter()
+    with SimpleThreadPool(num_threads=num_threads) as pool:
+        for _ in range(num_tasks):
+            pool.submit(_noop)
+        pool.wait_completion()
+    simple_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        for _ in range(num_tasks):
+            executor.submit(_noop)
+    executor_time = time.perf_counter() - start
+    
+    return {
+        'tasks': num_tasks,
+        'simple_pool_s': simple_time,
+        'simple_pool_us_per_task': simple_time / num_tasks * 1e6,
+        'executor_s': executor_time,
+        'executor_us_per_task': executor_time / num_tasks * 1e6
+    }
+
+
 def main():
     """Main function to demonstrate thread pool."""
     print("Thread Pool Demo")
     
     # Simple thread pool
     print("\n1. Simple Thread Pool:")
-    pool = SimpleThreadPool(num_threads=3)
-    pool.start()
-    
-    for i in range(6):
-        pool.submit(process_item, i, 0.1)
-    
-    pool.wait_completion()
-    print(f"  Completed {len(pool.results)} tasks")
-    pool.shutdown()
+    with SimpleThreadPool(num_threads=3) as pool:
+        futures = [pool.submit(process_item, i, 0.1) for i in range(6)]
+        results = [future.result() for future in futures]
+    print(f"  Completed {len(results)} tasks")
     
     # Using ThreadPoolExecutor with ordered results
     print("\n2. ThreadPoolExecutor (Ordered):")
@@ -202,6 +507,19 @@ def main():
         thread.join()
     
     print(f"  Final counter value: {counter.get_value()} (expected: 5000)")
+    
+    if '--benchmark' in sys.argv:
+        print("\n5. Dispatch Overhead (1M tiny tasks):")
+        stats = benchmark_dispatch()
+        print(f"  SimpleThreadPool:   {stats['simple_pool_s']:.2f}s "
+              f"({stats['simple_pool_us_per_task']:.2f} µs/task)")
+        print(f"  ThreadPoolExecutor: {stats['executor_s']:.2f}s "
+              f"({stats['executor_us_per_task']:.2f} µs/task)")
+        
+        print("\n6. Process Pool Scaling (CPU-bound):")
+        for row in benchmark_scaling():
+            label = 'serial' if row['workers'] == 0 else f"{row['workers']} workers"
+            print(f"  {label:>10}: {row['time']:.2f}s (speedup {row['speedup']:.2f}x)")
 
 
 if __name__ == "__main__":
@@ -4,45 +4,77 @@ Cache System Script
 LRU (Least Recently Used) cache implementation.
 """
 
-from typing import Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 from collections import OrderedDict
-import time
+from concurrent.futures import Future
 import functools
+import hashlib
+import heapq
+import inspect
+import itertools
+import os
+import pickle
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+
+# Marks a cache miss, so that None can be cached as a real result
+_MISSING = object()
 
 
 class LRUCache:
-    """Least Recently Used (LRU) cache implementation."""
+    """
+    Thread-safe Least Recently Used (LRU) cache implementation.
+    
+    Entries are evicted when either `capacity` (number of entries) or
+    `maxsize_bytes` (total size as measured by `sizeof`) is exceeded.
+    """
     
-    def __init__(self, capacity: int = 100):
+    def __init__(self, capacity: Optional[int] = 100, maxsize_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
         """
         Initialize LRU cache.
         
         Args:
-            capacity: Maximum number of items in cache
+            capacity: Maximum number of items in cache (None for no limit)
+            maxsize_bytes: Maximum total size of cached values (None for no limit)
+            sizeof: Function returning the size of a value in bytes
         """
         self.capacity = capacity
+        self.maxsize_bytes = maxsize_bytes
+        self.sizeof = sizeof
         self.cache = OrderedDict()
+        self.sizes = {}
+        self.current_bytes = 0
         self.hits = 0
         self.misses = 0
+        self.lock = threading.Lock()
+        self._in_flight = {}
     
-    def get(self, key: Any) -> Optional[Any]:
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
         """
         Get value from cache.
         
         Args:
             key: Cache key
+            default: Returned when the key is not cached
         
         Returns:
-            Cached value or None if not found
+            Cached value or `default` if not found
         """
-        if key in self.cache:
-            self.hits += 1
-            # Move to end (most recently used)
-            self.cache.move_to_end(key)
-            return self.cache[key]
-        else:
-            self.misses += 1
-            return None
+        with self.lock:
+            if key in self.cache:
+                self.hits += 1
+                # Move to end (most recently used)
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            else:
+                self.misses += 1
+                return default
     
     def put(self, key: Any, value: Any):
         """
@@ -52,22 +84,83 @@ class LRUCache:
             key: Cache key
             value: Value to cache
         """
+        size = self.sizeof(value) if self.maxsize_bytes is not None else 0
+        with self.lock:
+            self._store(key, value, size)
+    
+    def _store(self, key: Any, value: Any, size: int):
+        """Insert an entry and evict until both limits hold (lock must be held)."""
         if key in self.cache:
             # Update existing key
-            self.cache.move_to_end(key)
-        else:
-            # Add new key
-            if len(self.cache) >= self.capacity:
-                # Remove least recently used (first item)
-                self.cache.popitem(last=False)
+            self.current_bytes -= self.sizes.pop(key)
+            del self.cache[key]
+        
+        if self.maxsize_bytes is not None and size > self.maxsize_bytes:
+            # Larger than the whole cache, never worth storing
+            return
         
         self.cache[key] = value
+        self.sizes[key] = size
+        self.current_bytes += size
+        
+        while ((self.capacity is not None and len(self.cache) > self.capacity) or
+               (self.maxsize_bytes is not None and self.current_bytes > self.maxsize_bytes)):
+            # Remove least recently used (first item)
+            old_key, _ = self.cache.popitem(last=False)
+            self.current_bytes -= self.sizes.pop(old_key)
+    
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value, computing it once on a miss.
+        
+        Concurrent callers missing on the same key wait for the first
+        caller's result instead of computing it again (no stampede).
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        with self.lock:
+            if key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                return self.cache[key]
+            self.misses += 1
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            value = compute()
+            size = self.sizeof(value) if self.maxsize_bytes is not None else 0
+            with self.lock:
+                self._store(key, value, size)
+                del self._in_flight[key]
+        except BaseException as e:
+            # Waiters must be woken even if sizeof() or storing failed
+            with self.lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(value)
+        return value
     
     def clear(self):
         """Clear the cache."""
-        self.cache.clear()
-        self.hits = 0
-        self.misses = 0
+        with self.lock:
+            self.cache.clear()
+            self.sizes.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
     
     def stats(self) -> dict:
         """
@@ -76,102 +169,486 @@ class LRUCache:
         Returns:
             dict: Statistics including hits, misses, and hit rate
         """
-        total = self.hits + self.misses
-        hit_rate = self.hits / total if total > 0 else 0
+        with self.lock:
+            total = self.hits + self.misses
+            hit_rate = self.hits / total if total > 0 else 0
+            
+            stats = {
+                'capacity': self.capacity,
+                'size': len(self.cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate
+            }
+            if self.maxsize_bytes is not None:
+                stats['bytes'] = self.current_bytes
+                stats['maxsize_bytes'] = self.maxsize_bytes
+            return stats
+
+
+class ShardedLRUCache:
+    """
+    LRU cache split into independently locked shards.
+    
+    Keys are spread over shards by hash, so threads touching different
+    keys rarely contend for the same lock. Limits are divided evenly
+    between shards.
+    """
+    
+    def __init__(self, capacity: Optional[int] = 100, num_shards: int = 16,
+                 maxsize_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        """
+        Initialize sharded LRU cache.
         
-        return {
+        Args:
+            capacity: Maximum number of items across all shards (None for no limit)
+            num_shards: Number of shards (each with its own lock)
+            maxsize_bytes: Maximum total size across all shards (None for no limit)
+            sizeof: Function returning the size of a value in bytes
+        """
+        self.capacity = capacity
+        self.maxsize_bytes = maxsize_bytes
+        shard_capacity = None if capacity is None else max(1, -(-capacity // num_shards))
+        shard_bytes = None if maxsize_bytes is None else max(1, maxsize_bytes // num_shards)
+        self.shards = [LRUCache(shard_capacity, shard_bytes, sizeof) for _ in range(num_shards)]
+    
+    def _shard(self, key: Any) -> LRUCache:
+        """Return the shard responsible for a key."""
+        return self.shards[hash(key) % len(self.shards)]
+    
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
+        """Get value from cache (`default` if not found)."""
+        return self._shard(key).get(key, default)
+    
+    def put(self, key: Any, value: Any):
+        """Put value in cache."""
+        self._shard(key).put(key, value)
+    
+    def get_or_compute(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value, computing it once on a miss."""
+        return self._shard(key).get_or_compute(key, compute)
+    
+    def clear(self):
+        """Clear all shards."""
+        for shard in self.shards:
+            shard.clear()
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics aggregated over all shards.
+        
+        Returns:
+            dict: Statistics including hits, misses, and hit rate
+        """
+        shard_stats = [shard.stats() for shard in self.shards]
+        hits = sum(st['hits'] for st in shard_stats)
+        misses = sum(st['misses'] for st in shard_stats)
+        total = hits + misses
+        
+        stats = {
             'capacity': self.capacity,
-            'size': len(self.cache),
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': hit_rate
+            'size': sum(st['size'] for st in shard_stats),
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total > 0 else 0,
+            'shards': len(self.shards)
         }
+        if self.maxsize_bytes is not None:
+            stats['bytes'] = sum(st['bytes'] for st in shard_stats)
+            stats['maxsize_bytes'] = self.maxsize_bytes
+        return stats
 
 
 class TTLCache:
-    """Cache with Time-To-Live (TTL) expiration."""
+    """
+    Cache with Time-To-Live (TTL) expiration.
     
-    def __init__(self, ttl: float = 60.0):
+    Expiry times are kept in a min-heap next to the entries, so cleanup()
+    only touches entries that have actually expired. An optional reaper
+    thread runs cleanup() in the background, and `maxsize` adds LRU
+    eviction on top of expiration.
+    """
+    
+    def __init__(self, ttl: float = 60.0, maxsize: Optional[int] = None,
+                 reaper_interval: Optional[float] = None):
         """
         Initialize TTL cache.
         
         Args:
-            ttl: Time-to-live in seconds
+            ttl: Default time-to-live in seconds
+            maxsize: Maximum number of entries, evicting least recently used (None for no limit)
+            reaper_interval: Seconds between background cleanups (None disables the reaper)
         """
         self.ttl = ttl
-        self.cache = {}
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self._expiry_heap = []
+        self._counter = itertools.count()
+        self._reaper = None
+        self._stop_reaper = threading.Event()
+        if reaper_interval is not None:
+            self.start_reaper(reaper_interval)
     
-    def get(self, key: Any) -> Optional[Any]:
+    def get(self, key: Any, default: Any = None) -> Optional[Any]:
         """
         Get value from cache if not expired.
         
         Args:
             key: Cache key
+            default: Returned when the key is missing or expired
         
         Returns:
-            Cached value or None if not found/expired
+            Cached value or `default` if not found/expired
         """
-        if key in self.cache:
-            value, expiry = self.cache[key]
-            if time.time() < expiry:
-                return value
-            else:
-                # Expired, remove from cache
-                del self.cache[key]
-        return None
+        with self.lock:
+            if key in self.cache:
+                value, expiry = self.cache[key]
+                if time.monotonic() < expiry:
+                    self.hits += 1
+                    self.cache.move_to_end(key)
+                    return value
+                else:
+                    # Expired, remove from cache
+                    del self.cache[key]
+                    self.expirations += 1
+            self.misses += 1
+            return default
     
-    def put(self, key: Any, value: Any):
+    def put(self, key: Any, value: Any, ttl: Optional[float] = None):
         """
         Put value in cache with expiry time.
         
         Args:
             key: Cache key
             value: Value to cache
+            ttl: Time-to-live for this entry (defaults to the cache's ttl)
         """
-        expiry = time.time() + self.ttl
-        self.cache[key] = (value, expiry)
-    
-    def cleanup(self):
-        """Remove expired entries."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, (_, expiry) in self.cache.items()
-            if current_time >= expiry
-        ]
-        for key in expired_keys:
-            del self.cache[key]
+        expiry = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            self.cache[key] = (value, expiry)
+            heapq.heappush(self._expiry_heap, (expiry, next(self._counter), key))
+            
+            if self.maxsize is not None:
+                while len(self.cache) > self.maxsize:
+                    self.cache.popitem(last=False)
+                    self.evictions += 1
+            
+            # Overwritten and evicted entries leave stale heap items behind
+            if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+                self._rebuild_heap()
+    
+    def _rebuild_heap(self):
+        """Drop stale heap items (lock must be held)."""
+        self._expiry_heap = [(expiry, next(self._counter), key)
+                             for key, (_, expiry) in self.cache.items()]
+        heapq.heapify(self._expiry_heap)
+    
+    def cleanup(self) -> int:
+        """
+        Remove expired entries.
+        
+        Returns:
+            int: Number of entries removed
+        """
+        removed = 0
+        current_time = time.monotonic()
+        with self.lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= current_time:
+                expiry, _, key = heapq.heappop(heap)
+                entry = self.cache.get(key)
+                # Skip heap items for keys that were overwritten or evicted
+                if entry is not None and entry[1] == expiry:
+                    del self.cache[key]
+                    removed += 1
+            self.expirations += removed
+        return removed
+    
+    def start_reaper(self, interval: float = 1.0):
+        """
+        Start a daemon thread that calls cleanup() every `interval` seconds.
+        
+        Args:
+            interval: Seconds between cleanups
+        """
+        if self._reaper is not None:
+            return
+        self._stop_reaper.clear()
+        
+        def reap():
+            while not self._stop_reaper.wait(interval):
+                self.cleanup()
+        
+        self._reaper = threading.Thread(target=reap, name='TTLCache-reaper', daemon=True)
+        self._reaper.start()
+    
+    def stop_reaper(self):
+        """Stop the background reaper thread."""
+        if self._reaper is None:
+            return
+        self._stop_reaper.set()
+        self._reaper.join()
+        self._reaper = None
+    
+    def clear(self):
+        """Clear the cache."""
+        with self.lock:
+            self.cache.clear()
+            self._expiry_heap.clear()
+            self.hits = 0
+            self.misses = 0
+            self.expirations = 0
+            self.evictions = 0
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Statistics including hits, misses, hit rate, expirations and evictions
+        """
+        with self.lock:
+            total = self.hits + self.misses
+            hit_rate = self.hits / total if total > 0 else 0
+            
+            return {
+                'maxsize': self.maxsize,
+                'size': len(self.cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate,
+                'expirations': self.expirations,
+                'evictions': self.evictions
+            }
+
+
+class DiskCache:
+    """
+    Persistent key/value store backed by SQLite.
+    
+    Keys are pickled and hashed with SHA-256, so the same key maps to the
+    same row across process restarts. Values are stored pickled.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) a disk cache.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB)')
+        self.conn.commit()
+    
+    @staticmethod
+    def hash_key(key: Any) -> str:
+        """Return a hash of the key that is stable across processes."""
+        return hashlib.sha256(pickle.dumps(_stable_key(key), protocol=4)).hexdigest()
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Get value from disk.
+        
+        Args:
+            key: Cache key
+            default: Returned when the key is not stored
+        
+        Returns:
+            Stored value or `default` if not found
+        """
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM cache WHERE key = ?',
+                                    (self.hash_key(key),)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return pickle.loads(row[0])
+    
+    def put(self, key: Any, value: Any):
+        """
+        Store value on disk.
+        
+        Args:
+            key: Cache key
+            value: Picklable value to store
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)',
+                              (self.hash_key(key), blob))
+            self.conn.commit()
+    
+    def clear(self):
+        """Remove every stored entry."""
+        with self.lock:
+            self.conn.execute('DELETE FROM cache')
+            self.conn.commit()
+            self.hits = 0
+            self.misses = 0
+    
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+    
+    def stats(self) -> dict:
+        """
+        Get disk cache statistics.
+        
+        Returns:
+            dict: Statistics including stored entries, hits and misses
+        """
+        with self.lock:
+            size = self.conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+            return {'path': self.path, 'size': size, 'hits': self.hits, 'misses': self.misses}
+
+
+def _stable_key(key: Any) -> Any:
+    """
+    Make a key pickle to the same bytes in every process.
+    
+    Sets iterate in an order that depends on per-process hash
+    randomization, so they are replaced by their items sorted by pickled
+    form; tuples and lists are normalized recursively.
+    """
+    if isinstance(key, (set, frozenset)):
+        items = [_stable_key(item) for item in key]
+        items.sort(key=lambda item: pickle.dumps(item, protocol=4))
+        return (type(key).__name__, tuple(items))
+    if isinstance(key, (tuple, list)):
+        return type(key)(_stable_key(item) for item in key)
+    return key
+
+
+def _function_name(func: Callable) -> str:
+    """
+    Qualified name of a function that is the same whether its module runs
+    as a script or is imported (`__main__` is replaced by the file name).
+    """
+    module = func.__module__
+    if module == '__main__':
+        path = getattr(sys.modules['__main__'], '__file__', None)
+        if path:
+            module = os.path.splitext(os.path.basename(path))[0]
+    return f"{module}.{func.__qualname__}"
 
 
-def cached(cache: LRUCache):
+def cached(cache: LRUCache, disk: Optional[DiskCache] = None):
     """
     Decorator to cache function results.
     
+    Results are looked up in the in-memory cache first and then in the
+    optional disk tier; disk hits are promoted to memory. `None` results
+    are cached like any other value, and coroutine functions are supported.
+    
     Args:
         cache: Cache instance to use
+        disk: Optional persistent tier that survives restarts
     
     Returns:
         Decorator function
     """
     def decorator(func):
+        # Qualified name: same-named functions share a disk cache file
+        name = _function_name(func)
+        
+        def lookup(key):
+            result = cache.get(key, _MISSING)
+            if result is _MISSING and disk is not None:
+                result = disk.get(key, _MISSING)
+                if result is not _MISSING:
+                    cache.put(key, result)
+            return result
+        
+        def store(key, result):
+            cache.put(key, result)
+            if disk is not None:
+                disk.put(key, result)
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = (name, args, tuple(sorted(kwargs.items())))
+                result = lookup(key)
+                if result is not _MISSING:
+                    return result
+                
+                result = await func(*args, **kwargs)
+                store(key, result)
+                return result
+            
+            return async_wrapper
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # Create cache key
-            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            key = (name, args, tuple(sorted(kwargs.items())))
             
             # Try to get from cache
-            result = cache.get(key)
-            if result is not None:
+            result = lookup(key)
+            if result is not _MISSING:
                 return result
             
             # Compute and cache result
             result = func(*args, **kwargs)
-            cache.put(key, result)
+            store(key, result)
             return result
         
         return wrapper
     return decorator
 
 
+def benchmark_warm_start(num_keys: int = 2000, delay: float = 0.001) -> Dict:
+    """
+    Compare a cold start with a restart that finds a warm disk tier.
+    
+    The "restart" builds a fresh in-memory LRUCache and reopens the same
+    SQLite file, exactly as a new worker process would.
+    
+    Args:
+        num_keys: Number of distinct calls
+        delay: Simulated compute time per call in seconds
+    
+    Returns:
+        dict: Seconds for the cold run and the warm restart
+    """
+    def slow_square(n: int) -> int:
+        time.sleep(delay)
+        return n * n
+    
+    def run(path: str) -> float:
+        disk = DiskCache(path)
+        func = cached(LRUCache(capacity=num_keys), disk)(slow_square)
+        start = time.perf_counter()
+        for i in range(num_keys):
+            func(i)
+        elapsed = time.perf_counter() - start
+        disk.close()
+        return elapsed
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cache.sqlite')
+        cold = run(path)
+        warm = run(path)
+    
+    return {'keys': num_keys, 'cold_s': cold, 'warm_s': warm, 'speedup': cold / warm}
+
+
 # Example usage
 cache = LRUCache(capacity=3)
 
@@ -184,6 +661,50 @@ def expensive_computation(n: int) -> int:
     return n * n
 
 
+def benchmark_contention(thread_counts: Sequence[int] = (1, 2, 4, 8, 16, 32),
+                         ops_per_thread: int = 20000, num_keys: int = 1000) -> List[Dict]:
+    """
+    Compare a single-lock LRUCache with ShardedLRUCache under contention.
+    
+    Each thread performs a 90/10 mix of get_or_compute() and put() on
+    random keys.
+    
+    Args:
+        thread_counts: Numbers of concurrent threads to test
+        ops_per_thread: Operations performed by each thread
+        num_keys: Size of the key space
+    
+    Returns:
+        List[Dict]: Operations per second for each cache and thread count
+    """
+    def run(cache, num_threads: int) -> float:
+        def work(seed: int):
+            rng = random.Random(seed)
+            for _ in range(ops_per_thread):
+                key = rng.randrange(num_keys)
+                if rng.random() < 0.9:
+                    cache.get_or_compute(key, lambda: key * 2)
+                else:
+                    cache.put(key, key * 2)
+        
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(num_threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return num_threads * ops_per_thread / (time.perf_counter() - start)
+    
+    rows = []
+    for num_threads in thread_counts:
+        rows.append({
+            'threads': num_threads,
+            'lru_ops_per_sec': run(LRUCache(capacity=num_keys // 2), num_threads),
+            'sharded_ops_per_sec': run(ShardedLRUCache(capacity=num_keys // 2), num_threads)
+        })
+    return rows
+
+
 def main():
     """Main function to demonstrate cache system."""
     print("Cache System Demo")
@@ -220,6 +741,14 @@ def main():
     time.sleep(1.1)
     print(f"  After TTL expired: {ttl.get('key1')}")
     
+    reaped = TTLCache(ttl=0.2, maxsize=100, reaper_interval=0.1)
+    for i in range(50):
+        reaped.put(i, i * i)
+    reaped.put('long', 'kept', ttl=10.0)
+    time.sleep(0.4)
+    print(f"  Background reaper: {reaped.stats()}")
+    reaped.stop_reaper()
+    
     # Cached function
     print("\n3. Cached Function:")
     cache.clear()
@@ -248,6 +777,32 @@ def main():
     
     print(f"  Cache size: {small_cache.stats()['size']}")
     print(f"  Cache keys: {[k[1][0] for k in small_cache.cache.keys()]}")
+    
+    # Disk tier
+    print("\n5. Disk Tier:")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cache.sqlite')
+        disk = DiskCache(path)
+        
+        @cached(LRUCache(capacity=10), disk)
+        def lookup_user(user_id: int) -> Optional[str]:
+            print(f"  Looking up user {user_id}...")
+            return None
+        
+        lookup_user(1)
+        lookup_user(1)
+        print(f"  None result cached, disk stats: {disk.stats()['size']} entries")
+        disk.close()
+    
+    if '--benchmark' in sys.argv:
+        stats = benchmark_warm_start()
+        print(f"  Cold start: {stats['cold_s']:.2f}s, "
+              f"restart with disk tier: {stats['warm_s']:.2f}s ({stats['speedup']:.1f}x)")
+        
+        print("\n6. Lock Contention (ops/sec):")
+        for row in benchmark_contention():
+            print(f"  {row['threads']:>2} threads: LRUCache {row['lru_ops_per_sec']:>10.0f}  "
+                  f"ShardedLRUCache {row['sharded_ops_per_sec']:>10.0f}")
 
 
 if __name__ == "__main__":
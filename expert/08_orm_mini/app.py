@@ -4,23 +4,80 @@ Mini ORM Script
 Minimal Object-Relational Mapping implementation.
 """
 
+import operator
+import os
 import sqlite3
-from typing import Any, List, Dict, Optional, Type
-from dataclasses import dataclass, fields
+import sys
+import tempfile
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Type
+from dataclasses import dataclass, field, fields
 
 
 class Database:
     """Simple database connection manager."""
     
-    def __init__(self, db_path: str = ':memory:'):
+    def __init__(self, db_path: str = ':memory:', journal_mode: Optional[str] = None,
+                 synchronous: Optional[str] = None):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to database file or :memory:
+            journal_mode: SQLite journal mode, e.g. 'WAL' (None keeps the default)
+            synchronous: SQLite synchronous level, e.g. 'NORMAL' (None keeps the default)
         """
         self.connection = sqlite3.connect(db_path)
         self.connection.row_factory = sqlite3.Row
+        self._transaction_depth = 0
+        if journal_mode is not None:
+            self.pragma('journal_mode', journal_mode)
+        if synchronous is not None:
+            self.pragma('synchronous', synchronous)
+    
+    def pragma(self, name: str, value: Optional[Any] = None) -> Any:
+        """
+        Read or set an SQLite pragma.
+        
+        Args:
+            name: Pragma name, e.g. 'journal_mode'
+            value: New value (None only reads the current value)
+        
+        Returns:
+            Current value of the pragma
+        """
+        if value is not None:
+            row = self.connection.execute(f"PRAGMA {name} = {value}").fetchone()
+            if row is not None:
+                return row[0]
+        row = self.connection.execute(f"PRAGMA {name}").fetchone()
+        return row[0] if row is not None else None
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block in one transaction, committing on success.
+        
+        Nested blocks join the outer transaction. While a transaction is
+        open, commit() is a no-op so per-row saves are not committed.
+        """
+        if self._transaction_depth == 0 and not self.connection.in_transaction:
+            self.connection.execute("BEGIN")
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.rollback()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.commit()
     
     def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
         """
@@ -35,20 +92,263 @@ class Database:
         """
         return self.connection.execute(query, params)
     
+    def executemany(self, query: str, rows: Iterable[tuple]) -> sqlite3.Cursor:
+        """
+        Execute SQL query once per parameter tuple.
+        
+        Args:
+            query: SQL query
+            rows: Iterable of parameter tuples (consumed lazily)
+        
+        Returns:
+            Cursor
+        """
+        return self.connection.executemany(query, rows)
+    
     def commit(self):
-        """Commit transaction."""
-        self.connection.commit()
+        """Commit transaction (deferred while inside transaction())."""
+        if self._transaction_depth == 0:
+            self.connection.commit()
     
     def close(self):
         """Close database connection."""
         self.connection.close()
 
 
+class Query:
+    """
+    Chainable, lazily evaluated SELECT for a model.
+    
+    Rows are fetched in batches with fetchmany() and turned into model
+    instances one at a time while iterating, so scanning a large table
+    never holds more than one batch in memory.
+    """
+    
+    OPERATORS = {
+        'eq': '=',
+        'ne': '!=',
+        'lt': '<',
+        'lte': '<=',
+        'gt': '>',
+        'gte': '>=',
+        'like': 'LIKE',
+        'in': 'IN'
+    }
+    
+    def __init__(self, model: Type['Model'], batch_size: int = 1000):
+        """
+        Initialize query.
+        
+        Args:
+            model: Model class to query
+            batch_size: Rows fetched per fetchmany() call
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self._conditions = []
+        self._params = []
+        self._order = []
+        self._limit = None
+        self._offset = None
+    
+    def _column(self, name: str) -> str:
+        """Validate a column name so it can be placed in SQL safely."""
+        if name != 'id' and name not in self.model._field_names():
+            raise ValueError(f"Unknown column for {self.model.__name__}: {name}")
+        return name
+    
+    def where(self, clause: Optional[str] = None, *params, **conditions) -> 'Query':
+        """
+        Add WHERE conditions (combined with AND).
+        
+        Keyword conditions use `field=value` for equality or
+        `field__op=value` with op in eq, ne, lt, lte, gt, gte, like, in.
+        A raw SQL clause with `?` placeholders may be given as well.
+        
+        Args:
+            clause: Optional raw SQL condition, e.g. "age > ?"
+            *params: Parameters for the raw clause
+            **conditions: Field conditions
+        
+        Returns:
+            Query: Chainable query
+        """
+        if clause is not None:
+            self._conditions.append(f"({clause})")
+            self._params.extend(params)
+        for key, value in conditions.items():
+            name, _, op = key.partition('__')
+            column = self._column(name)
+            if op and op not in self.OPERATORS:
+                raise ValueError(f"Unknown operator: {op}")
+            sql_op = self.OPERATORS[op or 'eq']
+            if sql_op == 'IN':
+                values = list(value)
+                self._conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                self._params.extend(values)
+            elif value is None and sql_op in ('=', '!='):
+                self._conditions.append(f"{column} IS {'NOT ' if sql_op == '!=' else ''}NULL")
+            else:
+                self._conditions.append(f"{column} {sql_op} ?")
+                self._params.append(value)
+        return self
+    
+    def order_by(self, *columns: str) -> 'Query':
+        """
+        Add ORDER BY columns; prefix a column with '-' for descending.
+        
+        Returns:
+            Query: Chainable query
+        """
+        for column in columns:
+            if column.startswith('-'):
+                self._order.append(f"{self._column(column[1:])} DESC")
+            else:
+                self._order.append(f"{self._column(column)} ASC")
+        return self
+    
+    def limit(self, count: int) -> 'Query':
+        """Limit the number of returned rows."""
+        self._limit = int(count)
+        return self
+    
+    def offset(self, count: int) -> 'Query':
+        """Skip the first `count` rows."""
+        self._offset = int(count)
+        return self
+    
+    def to_sql(self, select: str = '*') -> tuple:
+        """
+        Build the SQL statement.
+        
+        Args:
+            select: Column list to select
+        
+        Returns:
+            tuple: (SQL string, parameter tuple)
+        """
+        query = f"SELECT {select} FROM {self.model.table_name()}"
+        if self._conditions:
+            query += " WHERE " + ' AND '.join(self._conditions)
+        if self._order:
+            query += " ORDER BY " + ', '.join(self._order)
+        if self._limit is not None or self._offset is not None:
+            query += f" LIMIT {self._limit if self._limit is not None else -1}"
+        if self._offset is not None:
+            query += f" OFFSET {self._offset}"
+        return query, tuple(self._params)
+    
+    def __iter__(self) -> Iterator['Model']:
+        """Yield model instances, fetching rows in batches."""
+        if not self.model._db:
+            raise RuntimeError("Database not set")
+        
+        query, params = self.to_sql()
+        cursor = self.model._db.execute(query, params)
+        from_row = self.model._hydrator(cursor.description)
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield from_row(row)
+    
+    def all(self) -> List['Model']:
+        """Return every matching instance as a list."""
+        return list(self)
+    
+    def first(self) -> Optional['Model']:
+        """Return the first matching instance or None."""
+        limit = self._limit
+        self._limit = 1
+        try:
+            return next(iter(self), None)
+        finally:
+            self._limit = limit
+    
+    def count(self) -> int:
+        """Count matching rows without loading them."""
+        if self._limit is None and self._offset is None:
+            query, params = self.to_sql('COUNT(*)')
+        else:
+            # LIMIT/OFFSET apply to the rows, not to the single COUNT row
+            query, params = self.to_sql('id')
+            query = f"SELECT COUNT(*) FROM ({query})"
+        return self.model._db.execute(query, params).fetchone()[0]
+    
+    def explain(self) -> List[str]:
+        """
+        Return SQLite's query plan for this query.
+        
+        Returns:
+            List[str]: Plan steps, e.g. 'SEARCH user USING INDEX idx_user_age (age>?)'
+        """
+        query, params = self.to_sql()
+        cursor = self.model._db.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row['detail'] for row in cursor.fetchall()]
+
+
+class Session:
+    """
+    Identity map for loaded model instances.
+    
+    While a session is active, each (model, id) pair is hydrated at most
+    once: loading the same row again returns the same object, and
+    find_by_id() answers from the map without querying SQLite. Instances
+    are held through weak references, so the map never keeps them alive.
+    """
+    
+    def __init__(self):
+        """Initialize an empty identity map."""
+        self.identity_map = weakref.WeakValueDictionary()
+        self._previous = None
+    
+    def get(self, model: Type['Model'], record_id: int) -> Optional['Model']:
+        """Return the loaded instance for (model, id) or None."""
+        return self.identity_map.get((model, record_id))
+    
+    def add(self, instance: 'Model'):
+        """Register an instance that has an id."""
+        self.identity_map[(type(instance), instance.id)] = instance
+    
+    def __len__(self) -> int:
+        """Number of live instances in the map."""
+        return len(self.identity_map)
+    
+    def __enter__(self) -> 'Session':
+        """Make this the active session for all models."""
+        self._previous = Model._session
+        Model._session = self
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Restore the previously active session."""
+        Model._session = self._previous
+        self._previous = None
+        return False
+
+
 class Model:
-    """Base class for ORM models."""
+    """
+    Base class for ORM models.
+    
+    Subclasses may be declared with `@dataclass(slots=True)` to store
+    fields in `__slots__` instead of a per-instance `__dict__`.
+    """
+    
+    # The row id lives in a slot so it also works for slots dataclasses
+    __slots__ = ('_id', '__weakref__')
     
     _db: Optional[Database] = None
+    _session: Optional[Session] = None
     _table_name: Optional[str] = None
+    # Composite indexes as tuples of column names, e.g. (('user_id', 'title'),)
+    _indexes: tuple = ()
+    
+    @property
+    def id(self) -> Optional[int]:
+        """Row id, or None if the instance was never saved or loaded."""
+        return getattr(self, '_id', None)
     
     @classmethod
     def set_database(cls, db: Database):
@@ -62,6 +362,30 @@ class Model:
             return cls._table_name
         return cls.__name__.lower()
     
+    @classmethod
+    def _field_names(cls) -> tuple:
+        """Return the model's column names, cached per class."""
+        names = cls.__dict__.get('_cached_field_names')
+        if names is None:
+            names = tuple(f.name for f in fields(cls))
+            cls._cached_field_names = names
+        return names
+    
+    @classmethod
+    def _statement(cls, kind: str) -> str:
+        """Return a cached per-class SQL statement ('insert' or 'select_by_id')."""
+        statements = cls.__dict__.get('_cached_statements')
+        if statements is None:
+            names = cls._field_names()
+            columns = ', '.join(names)
+            placeholders = ', '.join('?' for _ in names)
+            statements = {
+                'insert': f"INSERT INTO {cls.table_name()} ({columns}) VALUES ({placeholders})",
+                'select_by_id': f"SELECT * FROM {cls.table_name()} WHERE id = ?"
+            }
+            cls._cached_statements = statements
+        return statements[kind]
+    
     @classmethod
     def create_table(cls):
         """Create table for this model."""
@@ -70,18 +394,59 @@ class Model:
         
         # Get field definitions
         field_defs = []
-        for field in fields(cls):
-            field_type = field.type
+        for model_field in fields(cls):
+            field_type = model_field.type
             sql_type = cls._python_to_sql_type(field_type)
-            field_defs.append(f"{field.name} {sql_type}")
+            field_defs.append(f"{model_field.name} {sql_type}")
         
         # Add id as primary key
         field_defs.insert(0, "id INTEGER PRIMARY KEY AUTOINCREMENT")
         
         query = f"CREATE TABLE IF NOT EXISTS {cls.table_name()} ({', '.join(field_defs)})"
         cls._db.execute(query)
+        
+        for columns, unique in cls._index_definitions():
+            index_name = f"idx_{cls.table_name()}_{'_'.join(columns)}"
+            query = (f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index_name} "
+                     f"ON {cls.table_name()} ({', '.join(columns)})")
+            cls._db.execute(query)
         cls._db.commit()
     
+    @classmethod
+    def _index_definitions(cls) -> List[tuple]:
+        """
+        Collect declared indexes.
+        
+        Single-column indexes come from field metadata
+        (`field(metadata={'index': True})` or `{'unique': True}`),
+        composite ones from the `_indexes` class attribute.
+        
+        Returns:
+            List[tuple]: (column tuple, unique flag) pairs
+        """
+        indexes = []
+        for model_field in fields(cls):
+            if model_field.metadata.get('unique'):
+                indexes.append(((model_field.name,), True))
+            elif model_field.metadata.get('index'):
+                indexes.append(((model_field.name,), False))
+        for columns in cls._indexes:
+            indexes.append((tuple(columns), False))
+        return indexes
+    
+    @classmethod
+    def query(cls, batch_size: int = 1000) -> Query:
+        """
+        Start a lazy query for this model.
+        
+        Args:
+            batch_size: Rows fetched per fetchmany() call
+        
+        Returns:
+            Query: Chainable query
+        """
+        return Query(cls, batch_size)
+    
     @staticmethod
     def _python_to_sql_type(python_type) -> str:
         """Map Python types to SQL types."""
@@ -104,39 +469,54 @@ class Model:
         if not self._db:
             raise RuntimeError("Database not set")
         
-        # Get field names and values
-        field_names = [f.name for f in fields(self)]
-        values = [getattr(self, f.name) for f in fields(self)]
-        
-        placeholders = ', '.join(['?' for _ in field_names])
-        columns = ', '.join(field_names)
-        
-        query = f"INSERT INTO {self.table_name()} ({columns}) VALUES ({placeholders})"
-        cursor = self._db.execute(query, tuple(values))
+        values = tuple(getattr(self, name) for name in self._field_names())
+        cursor = self._db.execute(self._statement('insert'), values)
         self._db.commit()
         
+        self._id = cursor.lastrowid
+        if Model._session is not None:
+            Model._session.add(self)
         return cursor.lastrowid
     
     @classmethod
-    def find_all(cls) -> List['Model']:
+    def bulk_save(cls, instances: Iterable['Model']) -> int:
         """
-        Find all records.
+        Insert many instances with executemany inside one transaction.
+        
+        Instances are consumed lazily, so a generator of millions of rows
+        never has to be held in memory.
+        
+        Args:
+            instances: Iterable of model instances
         
         Returns:
-            List of model instances
+            int: Number of inserted rows
         """
         if not cls._db:
             raise RuntimeError("Database not set")
         
-        query = f"SELECT * FROM {cls.table_name()}"
-        cursor = cls._db.execute(query)
+        names = cls._field_names()
+        count = 0
         
-        results = []
-        for row in cursor.fetchall():
-            instance = cls._from_row(row)
-            results.append(instance)
+        def rows():
+            nonlocal count
+            for instance in instances:
+                count += 1
+                yield tuple(getattr(instance, name) for name in names)
         
-        return results
+        with cls._db.transaction():
+            cls._db.executemany(cls._statement('insert'), rows())
+        return count
+    
+    @classmethod
+    def find_all(cls) -> List['Model']:
+        """
+        Find all records.
+        
+        Returns:
+            List of model instances
+        """
+        return cls.query().all()
     
     @classmethod
     def find_by_id(cls, record_id: int) -> Optional['Model']:
@@ -149,15 +529,19 @@ class Model:
         Returns:
             Model instance or None
         """
+        if Model._session is not None:
+            instance = Model._session.get(cls, record_id)
+            if instance is not None:
+                return instance
+        
         if not cls._db:
             raise RuntimeError("Database not set")
         
-        query = f"SELECT * FROM {cls.table_name()} WHERE id = ?"
-        cursor = cls._db.execute(query, (record_id,))
+        cursor = cls._db.execute(cls._statement('select_by_id'), (record_id,))
         row = cursor.fetchone()
         
         if row:
-            return cls._from_row(row)
+            return cls._hydrator(cursor.description)(row)
         return None
     
     @classmethod
@@ -171,45 +555,188 @@ class Model:
         Returns:
             List of matching instances
         """
-        if not cls._db:
-            raise RuntimeError("Database not set")
-        
-        conditions = ' AND '.join([f"{k} = ?" for k in kwargs.keys()])
-        values = tuple(kwargs.values())
-        
-        query = f"SELECT * FROM {cls.table_name()} WHERE {conditions}"
-        cursor = cls._db.execute(query, values)
-        
-        results = []
-        for row in cursor.fetchall():
-            instance = cls._from_row(row)
-            results.append(instance)
-        
-        return results
+        return cls.query().where(**kwargs).all()
     
     @classmethod
     def _from_row(cls, row: sqlite3.Row) -> 'Model':
         """Create instance from database row."""
-        kwargs = {f.name: row[f.name] for f in fields(cls)}
-        return cls(**kwargs)
+        return cls._hydrator(row.keys())(row)
+    
+    @classmethod
+    def _hydrator(cls, columns) -> Callable[[Any], 'Model']:
+        """
+        Build a function turning rows with the given columns into instances.
+        
+        Column positions are resolved once per (class, column list) and
+        cached, so each row is unpacked positionally into the constructor.
+        The active session is consulted so repeated ids return one object.
+        
+        Args:
+            columns: Column names, or a cursor.description
+        
+        Returns:
+            Callable: row -> model instance
+        """
+        columns = tuple(c[0] if isinstance(c, tuple) else c for c in columns)
+        getters = cls.__dict__.get('_cached_getters')
+        if getters is None:
+            getters = {}
+            cls._cached_getters = getters
+        entry = getters.get(columns)
+        if entry is None:
+            positions = [columns.index(name) for name in cls._field_names()]
+            if len(positions) == 1:
+                position = positions[0]
+                values = lambda row: (row[position],)
+            else:
+                values = operator.itemgetter(*positions)
+            entry = (values, columns.index('id') if 'id' in columns else None)
+            getters[columns] = entry
+        values, id_index = entry
+        session = Model._session
+        
+        def hydrate(row):
+            if id_index is None:
+                return cls(*values(row))
+            record_id = row[id_index]
+            if session is not None:
+                instance = session.get(cls, record_id)
+                if instance is not None:
+                    return instance
+            instance = cls(*values(row))
+            instance._id = record_id
+            if session is not None:
+                session.add(instance)
+            return instance
+        
+        return hydrate
 
 
 @dataclass
 class User(Model):
     """Example User model."""
     name: str
-    email: str
-    age: int
+    email: str = field(metadata={'unique': True})
+    age: int = field(metadata={'index': True})
 
 
 @dataclass
 class Post(Model):
     """Example Post model."""
+    _indexes = (('user_id', 'title'),)
+    
     title: str
     content: str
     user_id: int
 
 
+@dataclass(slots=True)
+class Tag(Model):
+    """Example model storing its fields in __slots__."""
+    label: str
+    weight: float
+
+
+def benchmark_hydration(num_rows: int = 200_000) -> Dict:
+    """
+    Measure hydration rows/sec and memory per instance.
+    
+    Compares the old keyword-argument path (dataclasses.fields() and a
+    kwargs dict per row) with the cached positional path, and a regular
+    dataclass model with a slots one.
+    
+    Args:
+        num_rows: Rows to load
+    
+    Returns:
+        dict: Rows/sec per path and bytes per instance per model
+    """
+    @dataclass
+    class DictTag(Model):
+        label: str
+        weight: float
+        _table_name = 'tag'
+    
+    def kwargs_from_row(row):
+        return DictTag(**{f.name: row[f.name] for f in fields(DictTag)})
+    
+    def load(model, hydrate=None) -> tuple:
+        cursor = Model._db.execute("SELECT * FROM tag")
+        hydrate = hydrate or model._hydrator(cursor.description)
+        rows = cursor.fetchall()
+        tracemalloc.start()
+        start = time.perf_counter()
+        instances = [hydrate(row) for row in rows]
+        elapsed = time.perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Subtract the list holding the instances
+        per_instance = (size - sys.getsizeof(instances)) / len(instances)
+        return num_rows / elapsed, per_instance
+    
+    previous_db = Model._db
+    db = Database(':memory:')
+    Model.set_database(db)
+    try:
+        Tag.create_table()
+        Tag.bulk_save(Tag(label=f"tag{i}", weight=i / 10) for i in range(num_rows))
+        kwargs_rps, dict_bytes = load(DictTag, kwargs_from_row)
+        positional_rps, _ = load(DictTag)
+        slots_rps, slots_bytes = load(Tag)
+    finally:
+        db.close()
+        Model.set_database(previous_db)
+    
+    return {
+        'kwargs_rows_per_sec': kwargs_rps,
+        'positional_rows_per_sec': positional_rps,
+        'slots_rows_per_sec': slots_rps,
+        'dict_bytes_per_instance': dict_bytes,
+        'slots_bytes_per_instance': slots_bytes
+    }
+
+
+def benchmark_ingest(num_rows: int = 1_000_000, num_single_rows: int = 10_000) -> Dict:
+    """
+    Compare rows/sec of per-row save() with bulk_save().
+    
+    Uses a temporary on-disk database in WAL mode with synchronous=NORMAL.
+    save() is measured on a smaller sample because it commits every row.
+    
+    Args:
+        num_rows: Rows inserted with bulk_save()
+        num_single_rows: Rows inserted one at a time with save()
+    
+    Returns:
+        dict: Rows/sec for both paths
+    """
+    previous_db = Model._db
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'bench.db'), journal_mode='WAL', synchronous='NORMAL')
+        Model.set_database(db)
+        try:
+            User.create_table()
+            
+            start = time.perf_counter()
+            for i in range(num_single_rows):
+                User(name=f"user{i}", email=f"single{i}@example.com", age=i % 100).save()
+            single_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            User.bulk_save(User(name=f"user{i}", email=f"bulk{i}@example.com", age=i % 100)
+                           for i in range(num_rows))
+            bulk_time = time.perf_counter() - start
+        finally:
+            db.close()
+            Model.set_database(previous_db)
+    
+    return {
+        'save_rows_per_sec': num_single_rows / single_time,
+        'bulk_rows': num_rows,
+        'bulk_rows_per_sec': num_rows / bulk_time
+    }
+
+
 def main():
     """Main function to demonstrate mini ORM."""
     print("Mini ORM Demo")
@@ -266,8 +793,43 @@ def main():
     for post in user_posts:
         print(f"  - {post.title}: {post.content}")
     
+    # Query builder
+    print("\n8. Lazy query:")
+    query = User.query().where(age__gte=25).order_by('-age').limit(10)
+    for user in query:
+        print(f"  - {user.name}, age {user.age}")
+    print(f"  Plan: {query.explain()}")
+    
+    # Identity map
+    print("\n9. Identity map:")
+    with Session() as session:
+        first = User.find_by_id(1)
+        again = User.find_by_id(1)
+        print(f"  Same object: {first is again}, tracked instances: {len(session)}")
+    
+    # Bulk insert
+    print("\n10. Bulk insert:")
+    inserted = User.bulk_save(User(name=f"Guest{i}", email=f"guest{i}@example.com", age=20 + i)
+                              for i in range(3))
+    print(f"  Inserted {inserted} users in one transaction, total: {len(User.find_all())}")
+    
     # Cleanup
     db.close()
+    
+    if '--benchmark' in sys.argv:
+        print("\n11. Hydration benchmark:")
+        stats = benchmark_hydration()
+        print(f"  kwargs:     {stats['kwargs_rows_per_sec']:>12,.0f} rows/sec")
+        print(f"  positional: {stats['positional_rows_per_sec']:>12,.0f} rows/sec")
+        print(f"  slots:      {stats['slots_rows_per_sec']:>12,.0f} rows/sec")
+        print(f"  Memory per instance: {stats['dict_bytes_per_instance']:.0f} bytes (dict), "
+              f"{stats['slots_bytes_per_instance']:.0f} bytes (slots)")
+        
+        print("\n12. Ingest benchmark:")
+        stats = benchmark_ingest()
+        print(f"  save():      {stats['save_rows_per_sec']:>12,.0f} rows/sec")
+        print(f"  bulk_save(): {stats['bulk_rows_per_sec']:>12,.0f} rows/sec "
+              f"({stats['bulk_rows']:,} rows)")
 
 
 if __name__ == "__main__":
@@ -4,12 +4,119 @@ Test Framework Script
 Simple test framework implementation similar to unittest/pytest.
 """
 
+import argparse
+import ast
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import statistics
 import sys
+import textwrap
+import time
 import traceback
-from typing import Callable, List, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from functools import wraps
 
 
+# Number of past durations kept per test in the result cache
+TIMING_HISTORY = 20
+
+# Default allowed slowdown of a benchmark's median against its baseline
+BENCHMARK_THRESHOLD = 0.25
+
+
+def format_seconds(seconds: float) -> str:
+    """Format a duration with a readable unit (ns, µs, ms or s)."""
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+class BenchmarkResult:
+    """Timing statistics of one benchmark (seconds per call)."""
+    
+    def __init__(self, name: str, timings: List[float], iterations: int,
+                 baseline: Optional[float] = None):
+        """
+        Initialize benchmark result.
+        
+        Args:
+            name: Benchmark name
+            timings: Seconds per call, one value per measured round
+            iterations: Calls per round
+            baseline: Baseline median in seconds, if one is stored
+        """
+        self.name = name
+        self.iterations = iterations
+        self.rounds = len(timings)
+        self.min = min(timings)
+        self.median = statistics.median(timings)
+        if len(timings) > 1:
+            q1, _, q3 = statistics.quantiles(timings, n=4)
+            self.iqr = q3 - q1
+        else:
+            self.iqr = 0.0
+        self.baseline = baseline
+    
+    @property
+    def change(self) -> Optional[float]:
+        """Relative change of the median against the baseline (0.1 = 10% slower)."""
+        if not self.baseline:
+            return None
+        return self.median / self.baseline - 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            'median': self.median,
+            'min': self.min,
+            'iqr': self.iqr,
+            'iterations': self.iterations,
+            'rounds': self.rounds
+        }
+    
+    def __str__(self) -> str:
+        line = (f"{self.name}: min {format_seconds(self.min)}, "
+                f"median {format_seconds(self.median)}, "
+                f"IQR {format_seconds(self.iqr)} "
+                f"({self.rounds} rounds x {self.iterations})")
+        if self.change is not None:
+            line += f", {self.change:+.1%} vs baseline"
+        return line
+
+
+def load_baseline(path: Optional[str]) -> Dict[str, dict]:
+    """Load stored benchmark results (empty if the file does not exist)."""
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_baseline(path: str, benchmarks: Dict[str, BenchmarkResult]):
+    """
+    Store benchmark results as the new baseline.
+    
+    Entries for benchmarks that did not run are kept.
+    
+    Args:
+        path: Baseline file
+        benchmarks: Results of this run
+    """
+    baseline = load_baseline(path)
+    baseline.update({name: result.to_dict() for name, result in benchmarks.items()})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
 class TestResult:
     """Store test execution results."""
     
@@ -20,6 +127,10 @@ class TestResult:
         self.errors = 0
         self.failures = []
         self.error_details = []
+        self.durations: Dict[str, float] = {}
+        self.outcomes: Dict[str, str] = {}
+        self.cached = 0
+        self.benchmarks: Dict[str, BenchmarkResult] = {}
     
     def add_success(self):
         """Record a successful test."""
@@ -35,6 +146,35 @@ class TestResult:
         self.errors += 1
         self.error_details.append((test_name, error, traceback.format_exc()))
     
+    def add_duration(self, test_name: str, seconds: float):
+        """Record how long a test took."""
+        self.durations[test_name] = seconds
+    
+    def add_outcome(self, test_name: str, status: str):
+        """Record the status ('PASS', 'FAIL' or 'ERROR') of a test."""
+        self.outcomes[test_name] = status
+    
+    def add_cached(self):
+        """Record a test skipped because its cached result is still valid."""
+        self.cached += 1
+    
+    def merge(self, other: 'TestResult'):
+        """
+        Add the results of another run (e.g. from a worker process).
+        
+        Args:
+            other: Result to merge into this one
+        """
+        self.passed += other.passed
+        self.failed += other.failed
+        self.errors += other.errors
+        self.failures.extend(other.failures)
+        self.error_details.extend(other.error_details)
+        self.durations.update(other.durations)
+        self.outcomes.update(other.outcomes)
+        self.cached += other.cached
+        self.benchmarks.update(other.benchmarks)
+    
     def total(self) -> int:
         """Get total number of tests."""
         return self.passed + self.failed + self.errors
@@ -102,6 +242,15 @@ class Assert:
 class TestCase:
     """Base class for test cases."""
     
+    # Set by the runner before each test
+    benchmark_baseline: Dict[str, dict] = {}
+    benchmark_threshold: float = BENCHMARK_THRESHOLD
+    
+    def __init__(self):
+        """Initialize per-instance benchmark state (reset by the runner per test)."""
+        self._test_name = type(self).__name__
+        self.benchmark_results: Dict[str, BenchmarkResult] = {}
+    
     def setup(self):
         """Setup before each test."""
         pass
@@ -121,14 +270,322 @@ class TestCase:
     def assert_false(self, value, message: str = ""):
         """Assert false."""
         Assert.false(value, message)
+    
+    def benchmark(self, func: Callable, *args, name: Optional[str] = None,
+                  rounds: int = 15, warmup: int = 3, min_round_time: float = 0.01,
+                  threshold: Optional[float] = None, **kwargs) -> BenchmarkResult:
+        """
+        Measure func(*args, **kwargs) and compare it against the baseline.
+        
+        The number of calls per round is calibrated by doubling until one
+        round takes at least `min_round_time`, so timer resolution does
+        not dominate fast functions. After `warmup` discarded rounds,
+        `rounds` rounds are measured. The test fails when the median is
+        more than `threshold` slower than the stored baseline median.
+        
+        Args:
+            func: Function to measure
+            *args: Positional arguments for func
+            name: Benchmark name (default: the test name)
+            rounds: Measured rounds
+            warmup: Rounds run before measuring
+            min_round_time: Minimum duration of a round in seconds
+            threshold: Allowed relative slowdown (default: benchmark_threshold)
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            BenchmarkResult: Timing statistics
+        """
+        test_name = self._test_name
+        name = f"{test_name}[{name}]" if name else test_name
+        threshold = self.benchmark_threshold if threshold is None else threshold
+        perf_counter_ns = time.perf_counter_ns
+        
+        def timed_round(iterations: int) -> int:
+            start = perf_counter_ns()
+            for _ in range(iterations):
+                func(*args, **kwargs)
+            return perf_counter_ns() - start
+        
+        iterations = 1
+        while timed_round(iterations) < min_round_time * 1e9:
+            iterations *= 2
+        for _ in range(warmup):
+            timed_round(iterations)
+        timings = [timed_round(iterations) / iterations / 1e9 for _ in range(rounds)]
+        
+        stored = self.benchmark_baseline.get(name)
+        result = BenchmarkResult(name, timings, iterations,
+                                 stored['median'] if stored else None)
+        self.benchmark_results[name] = result
+        if result.change is not None and result.change > threshold:
+            raise AssertionError(
+                f"{name} regressed: median {format_seconds(result.median)} vs "
+                f"baseline {format_seconds(result.baseline)} "
+                f"({result.change:+.1%}, limit {threshold:+.0%})"
+            )
+        return result
+
+
+def discover_tests(test_class: type) -> List[str]:
+    """
+    Find test methods of a TestCase class in definition order.
+    
+    Base classes come first; methods overridden in a subclass keep their
+    original position.
+    
+    Args:
+        test_class: TestCase subclass
+    
+    Returns:
+        List[str]: Names of `test_*` methods
+    """
+    names = []
+    for klass in reversed(test_class.__mro__):
+        for name, value in vars(klass).items():
+            if name.startswith('test_') and callable(value) and name not in names:
+                names.append(name)
+    return names
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification like '2/4'.
+    
+    Args:
+        spec: 'index/count' with 1 <= index <= count
+    
+    Returns:
+        tuple: (index, count)
+    """
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{spec}', expected 'i/n'")
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{spec}', index must be between 1 and {count}")
+    return index, count
+
+
+def shard_of(test_name: str, count: int) -> int:
+    """
+    Return the 1-based shard a test belongs to.
+    
+    Uses SHA-256 rather than hash(), which is randomized per process.
+    
+    Args:
+        test_name: Qualified test name, e.g. 'MathTests.test_addition'
+        count: Number of shards
+    
+    Returns:
+        int: Shard index between 1 and count
+    """
+    digest = hashlib.sha256(test_name.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def is_benchmark_test(test_class: type, method_name: str) -> bool:
+    """
+    Check whether a test method calls self.benchmark().
+    
+    Args:
+        test_class: TestCase subclass
+        method_name: Name of test method
+    
+    Returns:
+        bool: True if the method's source contains a `.benchmark(...)` call
+    """
+    try:
+        source = textwrap.dedent(inspect.getsource(getattr(test_class, method_name)))
+        tree = ast.parse(source)
+    except (OSError, TypeError, SyntaxError):
+        return False
+    return any(isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+               and node.func.attr == 'benchmark'
+               for node in ast.walk(tree))
+
+
+def load_durations(path: Optional[str]) -> Dict[str, float]:
+    """Load recorded test durations (empty if the file does not exist)."""
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_durations(path: str, durations: Dict[str, float]):
+    """Merge new test durations into the history file."""
+    history = load_durations(path)
+    history.update(durations)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    """SHA-256 of a file's contents (cached for the life of the process)."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _is_within(path: str, root: str) -> bool:
+    """True if path is root or lies below it (not merely sharing a prefix)."""
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _local_imports(module_path: str, project_root: str) -> Tuple[str, ...]:
+    """
+    Find project files imported by a module, following them transitively.
+    
+    The module itself is included. Only modules inside `project_root` are
+    returned; the standard library and installed packages are assumed not
+    to change between runs.
+    
+    Args:
+        module_path: Source file to scan
+        project_root: Directory that contains the project's own modules
+    
+    Returns:
+        Tuple[str, ...]: Sorted source file paths
+    """
+    found = {module_path}
+    pending = [module_path]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError):
+            continue
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+        for name in names:
+            try:
+                spec = importlib.util.find_spec(name)
+            except (ImportError, ValueError):
+                continue
+            origin = spec.origin if spec else None
+            if (origin and origin.endswith('.py') and origin not in found
+                    and _is_within(os.path.abspath(origin), project_root)):
+                found.add(origin)
+                pending.append(origin)
+    return tuple(sorted(found))
+
+
+def test_fingerprint(test_class: type, method_name: str) -> str:
+    """
+    Hash everything a test depends on.
+    
+    Covers the source of the test method, of the class's setup() and
+    teardown(), of the module defining the test (helpers and constants
+    at module level) and of every project module it imports
+    (transitively). Any change to these re-runs the test.
+    
+    Args:
+        test_class: TestCase subclass
+        method_name: Name of test method
+    
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for name in (method_name, 'setup', 'teardown'):
+        digest.update(inspect.getsource(getattr(test_class, name)).encode('utf-8'))
+    module_path = inspect.getsourcefile(test_class)
+    if module_path:
+        module_path = os.path.abspath(module_path)
+        project_root = os.path.dirname(module_path)
+        for path in _local_imports(module_path, project_root):
+            digest.update(path.encode('utf-8'))
+            digest.update(_file_digest(path).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_cache(path: Optional[str]) -> Dict[str, dict]:
+    """Load cached test outcomes (empty if the file does not exist)."""
+    if not path:
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_cache(path: str, cache: Dict[str, dict], result: TestResult,
+               fingerprints: Dict[str, str]):
+    """
+    Store outcomes of the tests that ran, keeping a timing history per test.
+    
+    Tests that recorded benchmarks are flagged so they are never served
+    from the cache: their timings must be compared with the baseline on
+    every run.
+    
+    Args:
+        path: Cache file
+        cache: Previously loaded cache (updated in place)
+        result: Result of this run
+        fingerprints: Fingerprint of each test that ran
+    """
+    for test_name, status in result.outcomes.items():
+        entry = cache.get(test_name, {})
+        history = entry.get('history', []) + [result.durations.get(test_name, 0.0)]
+        cache[test_name] = {
+            'benchmark': any(name == test_name or name.startswith(test_name + '[')
+                             for name in result.benchmarks),
+            'hash': fingerprints.get(test_name, ''),
+            'status': status,
+            'duration': history[-1],
+            'history': history[-TIMING_HISTORY:]
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def _run_isolated(test_class: type, method_name: str, baseline_path: Optional[str],
+                  threshold: float) -> Tuple[TestResult, str]:
+    """
+    Run one test on a fresh instance and return its result and status.
+    
+    Used as the worker function for parallel runs, so exception objects
+    are replaced by their text to keep the result picklable.
+    """
+    runner = TestRunner(verbose=False, baseline_path=baseline_path, threshold=threshold)
+    status = runner.run_test(test_class(), method_name)
+    runner.result.error_details = [(name, str(error), tb)
+                                   for name, error, tb in runner.result.error_details]
+    return runner.result, status
 
 
 class TestRunner:
     """Test runner to discover and execute tests."""
     
-    def __init__(self):
-        """Initialize test runner."""
+    def __init__(self, verbose: bool = True, baseline_path: Optional[str] = None,
+                 threshold: float = BENCHMARK_THRESHOLD):
+        """
+        Initialize test runner.
+        
+        Args:
+            verbose: Print a line for every test
+            baseline_path: JSON file with baseline benchmark results
+            threshold: Allowed relative slowdown of benchmarks
+        """
         self.result = TestResult()
+        self.verbose = verbose
+        self.baseline_path = baseline_path
+        self.baseline = load_baseline(baseline_path)
+        self.threshold = threshold
     
     def run_test_case(self, test_case: TestCase):
         """
@@ -137,25 +594,28 @@ class TestRunner:
         Args:
             test_case: TestCase instance
         """
-        # Find all test methods
-        test_methods = [
-            method for method in dir(test_case)
-            if method.startswith('test_') and callable(getattr(test_case, method))
-        ]
-        
-        for method_name in test_methods:
+        for method_name in discover_tests(type(test_case)):
             self.run_test(test_case, method_name)
     
-    def run_test(self, test_case: TestCase, method_name: str):
+    def run_test(self, test_case: TestCase, method_name: str) -> str:
         """
         Run a single test method.
         
         Args:
             test_case: TestCase instance
             method_name: Name of test method
+        
+        Returns:
+            str: 'PASS', 'FAIL' or 'ERROR'
         """
         test_name = f"{test_case.__class__.__name__}.{method_name}"
-        print(f"  {test_name} ... ", end="")
+        if self.verbose:
+            print(f"  {test_name} ... ", end="")
+        start = time.perf_counter()
+        test_case._test_name = test_name
+        test_case.benchmark_baseline = self.baseline
+        test_case.benchmark_threshold = self.threshold
+        test_case.benchmark_results = {}
         
         try:
             # Setup
@@ -168,16 +628,142 @@ class TestRunner:
             # Teardown
             test_case.teardown()
             
-            print("PASS")
+            status = "PASS"
             self.result.add_success()
             
         except AssertionError as e:
-            print("FAIL")
+            status = "FAIL"
             self.result.add_failure(test_name, str(e))
             
         except Exception as e:
-            print("ERROR")
+            status = "ERROR"
             self.result.add_error(test_name, e)
+        
+        self.result.benchmarks.update(test_case.benchmark_results)
+        self.result.add_duration(test_name, time.perf_counter() - start)
+        self.result.add_outcome(test_name, status)
+        if self.verbose:
+            print(status)
+        return status
+    
+    @staticmethod
+    def plan(test_classes: List[type], shard: Optional[Tuple[int, int]] = None,
+             durations: Optional[Dict[str, float]] = None) -> List[Tuple[type, str]]:
+        """
+        Decide which tests to run and in which order.
+        
+        Tests are ordered longest first using recorded durations (tests
+        without history use the average). With a shard, a test belongs to
+        the shard picked by a hash of its qualified name, so every shard
+        run agrees on the split even if the durations file changed in
+        between; durations only decide the order inside a shard.
+        
+        Args:
+            test_classes: TestCase subclasses
+            shard: Optional (index, count), 1-based
+            durations: Recorded seconds per test name
+        
+        Returns:
+            List[Tuple[type, str]]: (test class, method name) pairs
+        """
+        durations = durations or {}
+        tests = [(test_class, method_name)
+                 for test_class in test_classes
+                 for method_name in discover_tests(test_class)]
+        if shard is not None:
+            index, count = shard
+            tests = [test for test in tests
+                     if shard_of(f"{test[0].__name__}.{test[1]}", count) == index]
+        default = sum(durations.values()) / len(durations) if durations else 0.0
+        
+        def expected(test) -> float:
+            return durations.get(f"{test[0].__name__}.{test[1]}", default)
+        
+        tests.sort(key=lambda test: (-expected(test), test[0].__name__, test[1]))
+        return tests
+    
+    def run(self, test_classes: List[type], workers: int = 1,
+            shard: Optional[Tuple[int, int]] = None,
+            durations_path: Optional[str] = None,
+            cache_path: Optional[str] = None,
+            failed_first: bool = False) -> TestResult:
+        """
+        Run tests from several classes, optionally sharded and in parallel.
+        
+        With workers > 1, test methods are distributed over a process pool
+        (each on a fresh TestCase instance) and the per-worker results are
+        merged into self.result. Durations are written back to
+        `durations_path` for the next run's ordering.
+        
+        With a cache, a test that passed before and whose fingerprint
+        (see test_fingerprint()) is unchanged is reported as CACHED instead
+        of being run; failed tests and benchmark tests always run again.
+        
+        Benchmark tests (see is_benchmark_test(), or flagged in the cache)
+        never share the machine with other tests: they run one at a time
+        after the worker pool has finished, so their timings are
+        comparable with a baseline recorded the same way.
+        
+        Args:
+            test_classes: TestCase subclasses
+            workers: Number of worker processes
+            shard: Optional (index, count) to run only part of the suite
+            durations_path: JSON file with recorded test durations
+            cache_path: JSON file with cached outcomes for incremental runs
+            failed_first: Run tests that failed last time before the rest
+        
+        Returns:
+            TestResult: Merged result
+        """
+        tests = self.plan(test_classes, shard, load_durations(durations_path))
+        cache = load_cache(cache_path)
+        
+        if failed_first:
+            tests.sort(key=lambda test: cache.get(f"{test[0].__name__}.{test[1]}", {})
+                       .get('status', 'PASS') == 'PASS')
+        
+        fingerprints = {}
+        if cache_path:
+            remaining = []
+            for test_class, method_name in tests:
+                test_name = f"{test_class.__name__}.{method_name}"
+                fingerprints[test_name] = test_fingerprint(test_class, method_name)
+                entry = cache.get(test_name)
+                if (entry and entry.get('status') == 'PASS' and not entry.get('benchmark')
+                        and entry.get('hash') == fingerprints[test_name]):
+                    self.result.add_cached()
+                    if self.verbose:
+                        print(f"  {test_name} ... CACHED")
+                else:
+                    remaining.append((test_class, method_name))
+            tests = remaining
+        
+        if workers <= 1:
+            for test_class, method_name in tests:
+                self.run_test(test_class(), method_name)
+        else:
+            benchmarks = [test for test in tests
+                          if is_benchmark_test(*test)
+                          or cache.get(f"{test[0].__name__}.{test[1]}", {}).get('benchmark')]
+            tests = [test for test in tests if test not in benchmarks]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_run_isolated, test_class, method_name,
+                                           self.baseline_path, self.threshold):
+                           f"{test_class.__name__}.{method_name}"
+                           for test_class, method_name in tests}
+                for future in as_completed(futures):
+                    result, status = future.result()
+                    self.result.merge(result)
+                    if self.verbose:
+                        print(f"  {futures[future]} ... {status}")
+            for test_class, method_name in benchmarks:
+                self.run_test(test_class(), method_name)
+        
+        if durations_path:
+            save_durations(durations_path, self.result.durations)
+        if cache_path:
+            save_cache(cache_path, cache, self.result, fingerprints)
+        return self.result
     
     def print_summary(self):
         """Print test results summary."""
@@ -186,6 +772,13 @@ class TestRunner:
         print(f"Passed: {self.result.passed}")
         print(f"Failed: {self.result.failed}")
         print(f"Errors: {self.result.errors}")
+        if self.result.cached:
+            print(f"Cached: {self.result.cached} (unchanged, not re-run)")
+        
+        if self.result.benchmarks:
+            print("\nBENCHMARKS:")
+            for name in sorted(self.result.benchmarks):
+                print(f"  {self.result.benchmarks[name]}")
         
         if self.result.failures:
             print("\nFAILURES:")
@@ -244,22 +837,75 @@ class StringTests(TestCase):
         self.assert_true("World" in self.test_string)
 
 
+class PerformanceTests(TestCase):
+    """Example benchmark tests."""
+    
+    def setup(self):
+        """Setup test data."""
+        self.data = list(range(1000, 0, -1))
+    
+    def test_sort_speed(self):
+        """Benchmark sorting a reversed list."""
+        result = self.benchmark(sorted, self.data)
+        self.assert_true(result.median > 0)
+    
+    def test_join_speed(self):
+        """Benchmark string building."""
+        words = [str(value) for value in self.data]
+        self.benchmark(" ".join, words, name="join")
+        self.benchmark(lambda: "".join(word + " " for word in words), name="generator")
+
+
 def main():
     """Main function to demonstrate test framework."""
-    print("Test Framework Demo\n")
-    
-    runner = TestRunner()
+    parser = argparse.ArgumentParser(description="Run the example test suite")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of worker processes")
+    parser.add_argument('--shard', type=parse_shard, default=None,
+                        help="run only shard i of n, e.g. 2/4")
+    parser.add_argument('--durations', default=None,
+                        help="JSON file of recorded durations (longest tests run first)")
+    parser.add_argument('--cache', default=None,
+                        help="JSON file of cached outcomes; unchanged passing tests are skipped")
+    parser.add_argument('--failed-first', action='store_true',
+                        help="run tests that failed last time first (needs --cache)")
+    parser.add_argument('--baseline', default=None,
+                        help="JSON file of baseline benchmark results to compare against")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store this run's benchmark results in the baseline file")
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD,
+                        help="allowed benchmark slowdown, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
     
-    # Run test cases
-    print("Running MathTests:")
-    runner.run_test_case(MathTests())
+    print("Test Framework Demo\n")
     
-    print("\nRunning StringTests:")
-    runner.run_test_case(StringTests())
+    # A run that records a new baseline does not compare against the old one
+    runner = TestRunner(baseline_path=None if args.save_baseline else args.baseline,
+                        threshold=args.threshold)
+    
+    if args.workers > 1 or args.shard or args.durations or args.cache:
+        shard_text = f" (shard {args.shard[0]}/{args.shard[1]})" if args.shard else ""
+        print(f"Running tests with {args.workers} worker(s){shard_text}:")
+        runner.run([MathTests, StringTests, PerformanceTests], args.workers, args.shard, args.durations,
+                   args.cache, args.failed_first)
+    else:
+        # Run test cases
+        print("Running MathTests:")
+        runner.run_test_case(MathTests())
+        
+        print("\nRunning StringTests:")
+        runner.run_test_case(StringTests())
+        
+        print("\nRunning PerformanceTests:")
+        runner.run_test_case(PerformanceTests())
     
     # Print summary
     runner.print_summary()
     
+    if args.save_baseline and args.baseline:
+        save_baseline(args.baseline, runner.result.benchmarks)
+        print(f"Baseline saved to {args.baseline}")
+    
     # Exit with appropriate code
     sys.exit(0 if runner.result.is_success() else 1)
 
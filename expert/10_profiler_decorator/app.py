@@ -4,10 +4,179 @@ Profiler Decorator Script
 Performance profiling tool using decorators.
 """
 
-import time
+import asyncio
+import contextvars
 import functools
-from typing import Callable, Dict, List
-import statistics
+import inspect
+import json
+import marshal
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class StreamingStats:
+    """
+    Constant-memory duration statistics for one profiled function.
+    
+    Mean and variance are updated with Welford's algorithm, and durations
+    are counted in a log-linear histogram (HDR-style): values are
+    bucketed by their top `SUB_BUCKET_BITS` significant bits, so
+    percentiles are accurate to about 1% and the histogram has a bounded
+    number of buckets no matter how many calls are recorded.
+    """
+    
+    SUB_BUCKET_BITS = 7
+    
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+        self.mean_ns = 0.0
+        self._m2 = 0.0
+        self.histogram: Dict[int, int] = {}
+    
+    def add(self, duration_ns: int):
+        """
+        Record one duration.
+        
+        Args:
+            duration_ns: Duration in nanoseconds
+        """
+        self.count += 1
+        self.total_ns += duration_ns
+        if self.min_ns is None or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if self.max_ns is None or duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        
+        delta = duration_ns - self.mean_ns
+        self.mean_ns += delta / self.count
+        self._m2 += delta * (duration_ns - self.mean_ns)
+        
+        bucket = self._bucket(duration_ns)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+    
+    @classmethod
+    def _bucket(cls, value: int) -> int:
+        """Map a value to its histogram bucket (monotonic in value)."""
+        shift = max(0, value.bit_length() - cls.SUB_BUCKET_BITS)
+        return (shift << cls.SUB_BUCKET_BITS) | (value >> shift)
+    
+    @classmethod
+    def _bucket_value(cls, bucket: int) -> float:
+        """Return the midpoint of the values mapped to a bucket."""
+        shift = bucket >> cls.SUB_BUCKET_BITS
+        top = bucket & ((1 << cls.SUB_BUCKET_BITS) - 1)
+        return (top << shift) + ((1 << shift) - 1) / 2
+    
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a percentile from the histogram.
+        
+        Args:
+            p: Percentile between 0 and 100
+        
+        Returns:
+            float: Duration in nanoseconds
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                value = self._bucket_value(bucket)
+                return min(max(value, self.min_ns), self.max_ns)
+        return float(self.max_ns)
+    
+    def stdev_ns(self) -> float:
+        """Sample standard deviation in nanoseconds."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class MemoryStats:
+    """Aggregated tracemalloc measurements for one profiled function."""
+    
+    def __init__(self):
+        """Initialize empty memory statistics."""
+        self.count = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.net_total = 0
+        self.sites: Counter = Counter()
+    
+    def add(self, peak: int, net: int, sites: List[Tuple[str, int]]):
+        """
+        Record one call.
+        
+        Args:
+            peak: Peak bytes allocated above the level at call start
+            net: Bytes still allocated when the call returned
+            sites: (file:line, bytes) allocation sites of this call
+        """
+        self.count += 1
+        self.peak_total += peak
+        self.peak_max = max(self.peak_max, peak)
+        self.net_total += net
+        for site, size in sites:
+            self.sites[site] += size
+
+
+class CallNode:
+    """One node of the call tree: a span name reached through a given path."""
+    
+    __slots__ = ('name', 'key', 'parent', 'children', 'count', 'total_ns')
+    
+    def __init__(self, name: str, key: tuple, parent: Optional['CallNode'] = None):
+        """
+        Initialize call tree node.
+        
+        Args:
+            name: Span name
+            key: (filename, line, name) identifying the code, as used by pstats
+            parent: Calling node (None for the root)
+        """
+        self.name = name
+        self.key = key
+        self.parent = parent
+        self.children: Dict[str, 'CallNode'] = {}
+        self.count = 0
+        self.total_ns = 0
+    
+    @property
+    def self_ns(self) -> int:
+        """Time spent in this span excluding profiled children."""
+        # Concurrent children (asyncio tasks, threads) can exceed the parent's time
+        return max(0, self.total_ns - sum(child.total_ns for child in self.children.values()))
+    
+    def path(self) -> List[str]:
+        """Span names from the outermost span down to this one."""
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return names[::-1]
+    
+    def walk(self):
+        """Yield this node and all descendants, depth first."""
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
+# Innermost open span of the current thread or asyncio task
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
 
 
 class ProfilerStats:
@@ -15,8 +184,85 @@ class ProfilerStats:
     
     def __init__(self):
         """Initialize profiler stats."""
-        self.calls: Dict[str, List[float]] = {}
-        self.memory_usage: Dict[str, List[int]] = {}
+        self.calls: Dict[str, StreamingStats] = {}
+        self.memory_usage: Dict[str, MemoryStats] = {}
+        self.enabled = True
+        self.lock = threading.Lock()
+        self.root = CallNode('<root>', ('~', 0, '<root>'))
+        self.trace_events: Optional[deque] = None
+    
+    def start_trace(self, max_events: int = 100_000):
+        """
+        Start keeping timestamped span events for export_chrome_trace().
+        
+        Args:
+            max_events: Most recent events to keep
+        """
+        self.trace_events = deque(maxlen=max_events)
+    
+    def stop_trace(self):
+        """Stop recording span events (recorded events are discarded)."""
+        self.trace_events = None
+    
+    def enter_span(self, name: str, key: Optional[tuple] = None) -> tuple:
+        """
+        Open a span nested under the current one.
+        
+        The current span is stored in a ContextVar, so nesting follows
+        the caller across threads and asyncio tasks.
+        
+        Args:
+            name: Span name
+            key: (filename, line, name) of the code, for pstats export
+        
+        Returns:
+            tuple: Handle to pass to exit_span()
+        """
+        parent = _current_span.get() or self.root
+        with self.lock:
+            node = parent.children.get(name)
+            if node is None:
+                node = parent.children[name] = CallNode(name, key or ('~', 0, name), parent)
+        token = _current_span.set(node)
+        return node, token, time.perf_counter_ns()
+    
+    def exit_span(self, handle: tuple) -> int:
+        """
+        Close a span and record its duration.
+        
+        Args:
+            handle: Value returned by enter_span()
+        
+        Returns:
+            int: Duration in nanoseconds
+        """
+        node, token, start_ns = handle
+        duration = time.perf_counter_ns() - start_ns
+        _current_span.reset(token)
+        with self.lock:
+            node.count += 1
+            node.total_ns += duration
+            stats = self.calls.get(node.name)
+            if stats is None:
+                stats = self.calls[node.name] = StreamingStats()
+            stats.add(duration)
+            if self.trace_events is not None:
+                self.trace_events.append((node.name, start_ns, duration, threading.get_ident()))
+        return duration
+    
+    def add_call_ns(self, func_name: str, duration_ns: int):
+        """
+        Record function call duration.
+        
+        Args:
+            func_name: Function name
+            duration_ns: Execution time in nanoseconds
+        """
+        with self.lock:
+            stats = self.calls.get(func_name)
+            if stats is None:
+                stats = self.calls[func_name] = StreamingStats()
+            stats.add(duration_ns)
     
     def add_call(self, func_name: str, duration: float):
         """
@@ -26,9 +272,48 @@ class ProfilerStats:
             func_name: Function name
             duration: Execution time in seconds
         """
-        if func_name not in self.calls:
-            self.calls[func_name] = []
-        self.calls[func_name].append(duration)
+        self.add_call_ns(func_name, int(duration * 1e9))
+    
+    def add_memory(self, func_name: str, peak: int, net: int, sites: List[Tuple[str, int]]):
+        """
+        Record memory usage of one call.
+        
+        Args:
+            func_name: Function name
+            peak: Peak bytes allocated during the call
+            net: Bytes still allocated after the call
+            sites: (file:line, bytes) allocation sites of the call
+        """
+        with self.lock:
+            stats = self.memory_usage.get(func_name)
+            if stats is None:
+                stats = self.memory_usage[func_name] = MemoryStats()
+            stats.add(peak, net, sites)
+    
+    def get_memory_stats(self, func_name: str, top: int = 5) -> Dict:
+        """
+        Get memory statistics for a function.
+        
+        Args:
+            func_name: Function name
+            top: Number of allocation sites to include
+        
+        Returns:
+            dict: Peak/net bytes per call and the top allocation sites
+        """
+        with self.lock:
+            if func_name not in self.memory_usage:
+                return {}
+            
+            stats = self.memory_usage[func_name]
+            return {
+                'count': stats.count,
+                'peak_avg': stats.peak_total / stats.count,
+                'peak_max': stats.peak_max,
+                'net_avg': stats.net_total / stats.count,
+                'net_total': stats.net_total,
+                'top_sites': stats.sites.most_common(top)
+            }
     
     def get_stats(self, func_name: str) -> Dict:
         """
@@ -38,22 +323,133 @@ class ProfilerStats:
             func_name: Function name
         
         Returns:
-            dict: Statistics including count, total, average, min, max
+            dict: Statistics in seconds including count, total, average,
+                median, min, max, stdev, p99 and p999
+        """
+        with self.lock:
+            if func_name not in self.calls:
+                return {}
+            
+            stats = self.calls[func_name]
+            return {
+                'count': stats.count,
+                'total': stats.total_ns / 1e9,
+                'average': stats.mean_ns / 1e9,
+                'median': stats.percentile(50) / 1e9,
+                'min': stats.min_ns / 1e9,
+                'max': stats.max_ns / 1e9,
+                'stdev': stats.stdev_ns() / 1e9,
+                'p99': stats.percentile(99) / 1e9,
+                'p999': stats.percentile(99.9) / 1e9
+            }
+    
+    def reset(self):
+        """Discard all recorded statistics."""
+        with self.lock:
+            self.calls.clear()
+            self.memory_usage.clear()
+            self.root = CallNode('<root>', ('~', 0, '<root>'))
+            if self.trace_events is not None:
+                self.trace_events.clear()
+    
+    def print_call_tree(self, min_fraction: float = 0.0):
         """
-        if func_name not in self.calls:
-            return {}
+        Print the nested span tree with call counts and total times.
         
-        durations = self.calls[func_name]
+        Args:
+            min_fraction: Hide spans below this share of the total time
+        """
+        total = sum(child.total_ns for child in self.root.children.values()) or 1
+        
+        def show(node: CallNode, depth: int):
+            for child in sorted(node.children.values(), key=lambda c: -c.total_ns):
+                if child.total_ns / total < min_fraction:
+                    continue
+                print(f"  {'  ' * depth}{child.name}: {child.count} calls, "
+                      f"{child.total_ns / 1e9:.6f}s")
+                show(child, depth + 1)
+        
+        show(self.root, 0)
+    
+    def export_flamegraph(self, path: str):
+        """
+        Write the call tree in collapsed-stack format.
+        
+        Each line is `outer;inner;leaf <self time in µs>`, as read by
+        flamegraph.pl, speedscope and inferno.
+        
+        Args:
+            path: Output file
+        """
+        with self.lock, open(path, 'w', encoding='utf-8') as f:
+            for node in self.root.walk():
+                if node is self.root:
+                    continue
+                self_us = node.self_ns // 1000
+                if self_us > 0:
+                    f.write(f"{';'.join(node.path())} {self_us}\n")
+    
+    def export_pstats(self, path: str):
+        """
+        Write the call tree as a file loadable with pstats.Stats(path).
         
-        return {
-            'count': len(durations),
-            'total': sum(durations),
-            'average': statistics.mean(durations),
-            'median': statistics.median(durations),
-            'min': min(durations),
-            'max': max(durations),
-            'stdev': statistics.stdev(durations) if len(durations) > 1 else 0
+        Spans from ProfileContext appear as `~:0(name)` like builtins.
+        Time of recursive calls is only counted at the outermost call.
+        
+        Args:
+            path: Output file
+        """
+        stats = {}
+        with self.lock:
+            for node in self.root.walk():
+                if node is self.root:
+                    continue
+                recursive = False
+                ancestor = node.parent
+                while ancestor is not None:
+                    if ancestor.key == node.key:
+                        recursive = True
+                        break
+                    ancestor = ancestor.parent
+                
+                self_s = node.self_ns / 1e9
+                total_s = 0.0 if recursive else node.total_ns / 1e9
+                primitive = 0 if recursive else node.count
+                cc, nc, tt, ct, callers = stats.get(node.key, (0, 0, 0.0, 0.0, {}))
+                stats[node.key] = (cc + primitive, nc + node.count, tt + self_s, ct + total_s,
+                                   callers)
+                
+                if node.parent is not self.root:
+                    c_cc, c_nc, c_tt, c_ct = callers.get(node.parent.key, (0, 0, 0.0, 0.0))
+                    callers[node.parent.key] = (c_cc + primitive, c_nc + node.count,
+                                                c_tt + self_s, c_ct + node.total_ns / 1e9)
+        
+        with open(path, 'wb') as f:
+            marshal.dump(stats, f)
+    
+    def export_chrome_trace(self, path: str):
+        """
+        Write recorded span events as Chrome Trace Event JSON.
+        
+        Load the file in chrome://tracing or Perfetto. Events are only
+        available after start_trace() was called.
+        
+        Args:
+            path: Output file
+        """
+        with self.lock:
+            events = list(self.trace_events or ())
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [
+                {'name': name, 'ph': 'X', 'ts': start_ns / 1000, 'dur': duration_ns / 1000,
+                 'pid': pid, 'tid': tid}
+                for name, start_ns, duration_ns, tid in events
+            ],
+            'displayTimeUnit': 'ns'
         }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f)
     
     def print_report(self):
         """Print profiling report."""
@@ -72,6 +468,19 @@ class ProfilerStats:
             print(f"  Max:     {stats['max']:.6f}s")
             if stats['stdev'] > 0:
                 print(f"  StdDev:  {stats['stdev']:.6f}s")
+            print(f"  p99:     {stats['p99']:.6f}s")
+            print(f"  p99.9:   {stats['p999']:.6f}s")
+            
+            memory = self.get_memory_stats(func_name)
+            if memory:
+                print(f"  Memory peak: {memory['peak_avg'] / 1024:.1f} KiB avg, "
+                      f"{memory['peak_max'] / 1024:.1f} KiB max")
+                print(f"  Memory net:  {memory['net_avg'] / 1024:.1f} KiB avg, "
+                      f"{memory['net_total'] / 1024:.1f} KiB total")
+                if memory['top_sites']:
+                    print("  Top allocation sites:")
+                    for site, size in memory['top_sites']:
+                        print(f"    {size / 1024:>10.1f} KiB  {site}")
         
         print("\n" + "=" * 80)
 
@@ -80,31 +489,120 @@ class ProfilerStats:
 profiler = ProfilerStats()
 
 
-def profile(func: Callable = None, *, name: str = None):
+def _allocation_sites(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot,
+                      limit: int = 20) -> List[Tuple[str, int]]:
+    """Return the lines whose allocations grew the most between two snapshots."""
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    diff = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), 'lineno')
+    sites = []
+    for stat in diff[:limit]:
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append((f"{frame.filename}:{frame.lineno}", stat.size_diff))
+    return sites
+
+
+def profile(func: Callable = None, *, name: str = None, memory: bool = False):
     """
     Decorator to profile function execution.
     
+    With memory=True each call also records its peak and net allocations
+    and the lines holding the most new memory when it returns, using
+    tracemalloc (started on demand). This takes a heap snapshot per
+    call, so it is meant for finding hot spots rather than for always-on
+    use. tracemalloc is process-wide, so concurrent or nested
+    memory-profiled calls share their measurements.
+    
     Args:
         func: Function to profile
         name: Optional custom name for the function
+        memory: Also record memory usage via tracemalloc
     
     Returns:
         Decorated function
     """
     def decorator(f: Callable) -> Callable:
         func_name = name or f.__name__
+        code = f.__code__
+        key = (code.co_filename, code.co_firstlineno, func_name)
         
         @functools.wraps(f)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            if not profiler.enabled:
+                return f(*args, **kwargs)
+            span = profiler.enter_span(func_name, key)
+            
+            try:
+                result = f(*args, **kwargs)
+                return result
+            finally:
+                profiler.exit_span(span)
+        
+        @functools.wraps(f)
+        async def async_wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return await f(*args, **kwargs)
+            span = profiler.enter_span(func_name, key)
+            
+            try:
+                result = await f(*args, **kwargs)
+                return result
+            finally:
+                profiler.exit_span(span)
+        
+        def start_memory():
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            start_memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            return started, before, start_memory
+        
+        def finish_memory(state):
+            started, before, start_memory = state
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            profiler.add_memory(func_name, peak - start_memory, current - start_memory,
+                                _allocation_sites(before, after))
+        
+        @functools.wraps(f)
+        def memory_wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return f(*args, **kwargs)
+            state = start_memory()
+            span = profiler.enter_span(func_name, key)
             
             try:
                 result = f(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start_time
-                profiler.add_call(func_name, duration)
+                profiler.exit_span(span)
+                finish_memory(state)
+        
+        @functools.wraps(f)
+        async def async_memory_wrapper(*args, **kwargs):
+            # tracemalloc is process-wide: other tasks running while this
+            # one awaits are counted too
+            if not profiler.enabled:
+                return await f(*args, **kwargs)
+            state = start_memory()
+            span = profiler.enter_span(func_name, key)
+            
+            try:
+                result = await f(*args, **kwargs)
+                return result
+            finally:
+                profiler.exit_span(span)
+                finish_memory(state)
         
+        if inspect.iscoroutinefunction(f):
+            return async_memory_wrapper if memory else async_wrapper
+        if memory:
+            return memory_wrapper
         return wrapper
     
     # Allow use as @profile or @profile()
@@ -124,24 +622,31 @@ def profile_verbose(func: Callable) -> Callable:
     Returns:
         Decorated function
     """
+    code = func.__code__
+    key = (code.co_filename, code.co_firstlineno, func.__name__)
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
         print(f"[PROFILE] Starting {func.__name__}")
+        span = profiler.enter_span(func.__name__, key)
         
-        result = func(*args, **kwargs)
-        
-        duration = time.time() - start_time
-        print(f"[PROFILE] {func.__name__} completed in {duration:.6f}s")
-        
-        profiler.add_call(func.__name__, duration)
-        return result
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = profiler.exit_span(span)
+            print(f"[PROFILE] {func.__name__} completed in {duration / 1e9:.6f}s")
     
     return wrapper
 
 
 class ProfileContext:
-    """Context manager for profiling code blocks."""
+    """
+    Context manager for profiling code blocks.
+    
+    Blocks nest: a block opened inside another block or a profiled
+    function is recorded as its child in the call tree. Works with both
+    `with` and `async with`.
+    """
     
     def __init__(self, name: str):
         """
@@ -151,18 +656,135 @@ class ProfileContext:
             name: Name for this profile section
         """
         self.name = name
-        self.start_time = None
+        self._span = None
     
     def __enter__(self):
         """Start profiling."""
-        self.start_time = time.time()
+        self._span = profiler.enter_span(self.name)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Stop profiling and record time."""
-        duration = time.time() - self.start_time
-        profiler.add_call(self.name, duration)
+        profiler.exit_span(self._span)
+        self._span = None
+        return False
+    
+    async def __aenter__(self):
+        """Start profiling in an async with block."""
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Stop profiling at the end of an async with block."""
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+class SamplingProfiler:
+    """
+    Statistical stack sampler that can be started and stopped at runtime.
+    
+    A background thread wakes every `interval` seconds, reads the current
+    frame of every other thread via sys._current_frames() and counts the
+    call stacks it sees. Overhead depends on the interval, not on how
+    often the profiled code calls functions, and no code has to be
+    decorated. A thread is used instead of a signal timer so that every
+    thread is sampled and it works on all platforms.
+    """
+    
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        """
+        Initialize the sampler.
+        
+        Args:
+            interval: Seconds between samples
+            max_depth: Maximum number of frames recorded per stack
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        """True while the sampler thread is active."""
+        return self._thread is not None
+    
+    def _sample(self):
+        """Record the stack of every thread except the sampler itself."""
+        own_id = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+    
+    def _run(self):
+        """Sampler thread loop."""
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def start(self):
+        """Start sampling (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop sampling; collected samples are kept."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+    
+    def __enter__(self):
+        """Start sampling in a with block."""
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop sampling at the end of the block."""
+        self.stop()
         return False
+    
+    def export_flamegraph(self, path: str):
+        """
+        Write the collected samples in collapsed-stack format.
+        
+        Args:
+            path: Output file (one `outer;inner;leaf <samples>` line per stack)
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.items():
+                f.write(f"{';'.join(stack)} {count}\n")
+    
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int, int]]:
+        """
+        Summarise samples per function.
+        
+        Args:
+            limit: Number of functions to return
+        
+        Returns:
+            List[Tuple[str, int, int]]: (function, self samples, total samples),
+                sorted by self samples
+        """
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.samples.items():
+            if not stack:
+                continue
+            self_counts[stack[-1]] += count
+            for func in set(stack):
+                total_counts[func] += count
+        return [(func, count, total_counts[func])
+                for func, count in self_counts.most_common(limit)]
 
 
 # Example functions to profile
@@ -182,6 +804,12 @@ def slow_function(delay: float = 0.1):
     return "done"
 
 
+@profile(memory=True)
+def build_table(rows: int) -> List[dict]:
+    """Allocation-heavy function for memory profiling."""
+    return [{'id': i, 'name': f"row{i}"} for i in range(rows)]
+
+
 @profile_verbose
 def verbose_function(x: int) -> int:
     """Function with verbose profiling."""
@@ -211,9 +839,22 @@ def main():
     
     # Profile using context manager
     print("\n3. Context manager profiling:")
+    profiler.start_trace()
     with ProfileContext("manual_block"):
         time.sleep(0.05)
-        result = sum(range(1000))
+        with ProfileContext("inner_sum"):
+            result = sum(range(1000))
+    
+    async def fetch(item: int):
+        async with ProfileContext("fetch"):
+            await asyncio.sleep(0.01 * item)
+    
+    async def gather_all():
+        with ProfileContext("async_batch"):
+            await asyncio.gather(*(fetch(i) for i in range(3)))
+    
+    asyncio.run(gather_all())
+    profiler.print_call_tree()
     
     # Profile recursive function
     print("\n4. Profiling recursive function:")
@@ -244,8 +885,33 @@ def main():
     print(f"  Unprofiled (1000 calls): {unprofiled_time:.6f}s")
     print(f"  Overhead: {(profiled_time - unprofiled_time) * 1000:.3f}µs per call")
     
+    # Memory profiling
+    print("\n6. Memory profiling:")
+    for _ in range(3):
+        build_table(5000)
+    memory = profiler.get_memory_stats('build_table')
+    print(f"  build_table: peak {memory['peak_max'] / 1024:.0f} KiB, "
+          f"net {memory['net_avg'] / 1024:.0f} KiB per call")
+    
+    # Statistical sampling
+    print("\n7. Sampling profiler:")
+    with SamplingProfiler(interval=0.001) as sampler:
+        profiler.enabled = False
+        fibonacci(27)
+        profiler.enabled = True
+    for func, self_samples, total_samples in sampler.top_functions(3):
+        print(f"  {self_samples:>5} self / {total_samples:>5} total  {func.split(' (')[0]}")
+    
     # Print profiling report
     profiler.print_report()
+    
+    # Export for external viewers
+    with tempfile.TemporaryDirectory(prefix='profile_') as export_dir:
+        profiler.export_flamegraph(os.path.join(export_dir, 'profile.folded'))
+        profiler.export_pstats(os.path.join(export_dir, 'profile.pstats'))
+        profiler.export_chrome_trace(os.path.join(export_dir, 'trace.json'))
+        print(f"\nExported flamegraph, pstats and Chrome trace to {export_dir}: "
+              f"{', '.join(sorted(os.listdir(export_dir)))}")
 
 
 if __name__ == "__main__":